@@ -1,100 +1,242 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-import re
+import bisect, argparse
 from lib import *
+from service import WordService
+from models import Sense
+from tracing import tracer
 
+# 匯入本模組不會建立視窗或連線資料庫，介面只在直接執行時建立(見檔案底部)
 db = "word_traslation.db"
+service = WordService(db)  # 查詢、儲存、列出、修改、刪除(快取：記憶體 → 資料庫 → 網路)
+tasks = BackgroundTasks()   # 爬蟲與資料庫工作在背景執行，避免視窗凍結
 
+# ----------------------歷史搜尋紀錄-------------------------
+HISTORY_SIZE = 15
+recent_words = RecentWords(HISTORY_SIZE)  # 與 history_box 同步(由舊到新)，完整紀錄存於資料庫 History 資料表
+
+
+class RowPool:
+    """
+    查詢結果的元件池。
+
+    每筆解釋或片語使用一組固定的 Label(卡片：欄位名稱 + 內容 + 分隔線)，切換單字時只就地更新文字，
+    多出來的卡片以 grid_remove 隱藏留待下次使用。第一個畫面以外的卡片在之後的事件迴圈中分批繪製，
+    讓每次更新都不超過一個畫格。
+    """
+    FIRST_SCREEN = 8  # 立即繪製的卡片數
+    CHUNK = 10        # 之後每批繪製的卡片數
+
+    def __init__(self, frame, field_names, first_row=1, **options):
+        """
+        :param frame: 放置卡片的框架。
+        :param field_names: 每張卡片的欄位名稱。
+        :param first_row: 第一張卡片所在的 grid 列(上方保留給標題)。
+        :param options: 套用到所有 Label 的共同設定(例如 background)。
+        """
+        self.frame = frame
+        self.field_names = field_names
+        self.first_row = first_row
+        self.options = options
+        self.cards = []    # 每張卡片為 (內容 Label 列表, 所有元件列表)
+        self.visible = 0   # cards[:visible] 目前顯示中
+        self.records = []
+        self._pending = None
+
+
+    def show(self, records):
+        """
+        顯示多筆資料，每筆為與 field_names 對應的內容列表。
+
+        :param records: 內容列表的列表。
+        """
+        self.cancel()
+        self.records = records
+        first = min(len(records), RowPool.FIRST_SCREEN)
+        self._fill(0, first)
+
+        # 其餘卡片先隱藏，避免短暫顯示上一個單字的內容
+        for index in range(first, self.visible):
+            for widget in self.cards[index][1]:
+                widget.grid_remove()
+        self.visible = first
+
+        if first < len(records):
+            self._pending = self.frame.after(1, self._fill_next)
+
+
+    def clear(self):
+        """隱藏所有卡片。"""
+        self.show([])
+
+
+    def cancel(self):
+        """停止尚未完成的分批繪製。"""
+        if self._pending is not None:
+            self.frame.after_cancel(self._pending)
+            self._pending = None
+
+
+    def _fill_next(self):
+        start = self.visible
+        end = min(len(self.records), start + RowPool.CHUNK)
+        self._fill(start, end)
+        self._pending = self.frame.after(1, self._fill_next) if end < len(self.records) else None
+
+
+    def _fill(self, start, end):
+        for index in range(start, end):
+            values, widgets = self._card(index)
+            for label, value in zip(values, self.records[index]):
+                if label.cget('text') != value:
+                    label.config(text=value)
+            if index >= self.visible:
+                for widget in widgets:
+                    widget.grid()
+        self.visible = max(self.visible, end)
+
+
+    def _card(self, index):
+        # 取得第 index 張卡片，不存在時建立
+        while len(self.cards) <= index:
+            row = self.first_row + len(self.cards) * (len(self.field_names) + 1)
+            values = []
+            widgets = []
+            for offset, name in enumerate(self.field_names):
+                name_label = tk.Label(self.frame, text=f"{name}:", font=("Arial", 12, "bold"), relief='groove', **self.options)
+                name_label.grid(row=row + offset, column=0, sticky="e", padx=10, pady=10)
+                value_label = tk.Label(self.frame, text="", font=("Arial", 12), wraplength=400, **self.options)
+                value_label.grid(row=row + offset, column=1, sticky="w", padx=10, pady=5)
+                values.append(value_label)
+                widgets += [name_label, value_label]
+            separator = tk.Label(self.frame, text="-" * 100, font=("Arial", 12, "italic"), **self.options)
+            separator.grid(row=row + len(self.field_names), column=0, columnspan=2, pady=10)
+            widgets.append(separator)
+            for widget in widgets:
+                widget.grid_remove()
+            self.cards.append((values, widgets))
+        return self.cards[index]
+
+
+
+
+def show_word_details(word):
+    """顯示 Word 資料在兩個 Canvas 中，解釋(senses)在 canvas_1，片語(phrases)在 canvas_2"""
+    with tracer.span('render'):
+        word_title.config(text=f"查詢字：{word.english_word}")
+        sense_pool.show([(sense.word_class, sense.description, sense.word_translation, sense.example.sentence, sense.example.translation)
+                         for sense in word.senses])
+
+        phrase_title.grid()
+        phrase_pool.show([(phrase.phrase, phrase.description, 'N/A', phrase.example.sentence, phrase.example.translation)
+                          for phrase in word.phrases])
+
+        # 捲回頂端；滾動範圍由框架的 <Configure> 事件自動更新
+        canvas_1.yview_moveto(0)
+        canvas_2.yview_moveto(0)
+
+
+def clear_word_details():
+    """清空查詢結果(元件保留以便重複使用)"""
+    word_title.config(text="")
+    phrase_title.grid_remove()
+    sense_pool.clear()
+    phrase_pool.clear()
 
-def show_word_details(word_data):
-    """顯示 word_data 資料在兩個 Canvas 中，block 在 canvas_1，phrase 在 canvas_2"""
-    # 清空 canvas_1 和 canvas_2 的內容
-    for widget in block_frame.winfo_children():
-        widget.destroy()
-    for widget in phrase_frame.winfo_children():
-        widget.destroy()
-
-    # 資料庫新增操作
-    current_word = WordDatas.search_data(db, list(word_data)[0])
-    if current_word  == None:
-        result = WordDatas.insert_word(db, word_data)
-        if result[0] == "Error":
-            messagebox.showerror(result[0], result[1])
-
-    # 顯示 block 資料
-    block_row = 0
-    for key, value in word_data.items():
-        tk.Label(block_frame, text=f"查詢字：{key}", font=("Arial", 18, "bold")).grid(row=block_row, column=0, columnspan=5, pady=10)
-        block_row += 1
-        for block_key, block_value in value.items():
-            if re.findall(r'^block', block_key):  # 找出 block 資料
-                for label, field in [("詞類", "word_class"), ("描述", "description"), ("翻譯", "word_translation"),("例句", "example_sentence"), ("翻譯例句", "example_sentence_translation")]:
-                    tk.Label(block_frame, text=f"{label}:", font=("Arial", 12, "bold"),relief='groove').grid(row=block_row, column=0,sticky="e", padx=10, pady=10)
-                    tk.Label(block_frame, text=block_value.get(field, "N/A"), font=("Arial", 12),wraplength=400).grid(row=block_row, column=1, sticky="w", padx=10,pady=5)
-                    block_row += 1
-                tk.Label(block_frame, text="-" * 100, font=("Arial", 12, "italic")).grid(row=block_row, column=0,columnspan=2, pady=10)
-                block_row += 1
-
-    # 顯示 phrase 資料
-    phrase_row = 0
-    tk.Label(phrase_frame, text="延伸學習", font=("Arial", 18, "bold"), background='#e6f2ff').grid(row=phrase_row, column=0, columnspan=5, pady=10)
-    phrase_row += 1
-    for key, value in word_data.items():
-        for phrase_key, phrase_value in value.items():
-            if re.findall(r'^phrase', phrase_key):  # 找出 phrase 資料
-                for label, field in [("片語", "phrase"), ("描述", "description"), ("翻譯", "word_translation"),("例句", "example_sentence"), ("翻譯例句", "example_sentence_translation")]:
-                    tk.Label(phrase_frame, text=f"{label}:", font=("Arial", 12, "bold"),relief='groove', background='#e6f2ff').grid(row=phrase_row, column=0,sticky="e", padx=10, pady=10)
-                    tk.Label(phrase_frame, text=phrase_value.get(field, "N/A"), font=("Arial", 12),wraplength=400, background='#e6f2ff').grid(row=phrase_row, column=1, sticky="w", padx=10,pady=5)
-                    phrase_row += 1
-                tk.Label(phrase_frame, text="-" * 100, font=("Arial", 12, "italic"), background='#e6f2ff').grid(row=phrase_row, column=0,columnspan=2, pady=10)
-                phrase_row += 1
-
-
-    # 強制更新滾動區域，並且重新設定滾動範圍
-    canvas_1.update_idletasks()
-    canvas_2.update_idletasks()
-
-    # 使用 after 延遲執行更新，確保資料顯示穩定
-    root.after(100, lambda: update_scrollregion())
-
-
-def update_scrollregion():
+
+def update_scrollregion(canvas):
     """更新 Canvas 滾動範圍"""
-    canvas_1.configure(scrollregion=canvas_1.bbox("all"))
-    canvas_2.configure(scrollregion=canvas_2.bbox("all"))
-    canvas_1.itemconfig(block_window_id, width=block_frame.winfo_width())
-    canvas_2.itemconfig(phrase_window_id, width=phrase_frame.winfo_width())
+    canvas.configure(scrollregion=canvas.bbox("all"))
 
 
-def search_translation(word=None):
-    """查詢使用者輸入的翻譯文字"""
+def search_translation(word=None, force=False):
+    """查詢使用者輸入的翻譯文字，force 為 True 時略過拼字檢查"""
     if word is None:
         word = input_entry.get().strip().lower()
+    if not word:
+        return
 
     # 清空舊有結果
-    for widget in block_frame.winfo_children():
-        widget.destroy()
-    for widget in phrase_frame.winfo_children():
-        widget.destroy()
+    clear_word_details()
 
-    # 開始查詢
-    crawler = DataCrawl(word)
-    data = crawler.crawl()
+    # 開始查詢(先查快取與資料庫，查無資料才爬取並存入資料庫)；
+    # 在背景執行，查詢新單字時舊查詢的結果會被丟棄
+    set_lookup_status(f"查詢中：{word}", busy=True)
+    inserted = []  # 這次查詢實際存入資料庫的新單字，查詢完成後才讀取
+    tasks.submit(service.lookup_word, word, False, force, inserted.append, channel="lookup",
+                 on_done=lambda data: show_lookup_result(word, data, inserted),
+                 on_error=lambda error: show_lookup_error(word, error))
 
-    if isinstance(data, list) and data[0] == "Error":  # 當資料為錯誤時
-        messagebox.showerror("查詢錯誤", f"ఠ_ఠ? 沒有你要找的單字 ： '{word}'")
+
+def cancel_lookup():
+    """取消進行中的查詢"""
+    tasks.cancel("lookup")
+    set_lookup_status("已取消查詢", busy=False)
+
+
+def set_lookup_status(text, busy):
+    """更新查詢狀態列與進度條"""
+    status_label.config(text=text)
+    if busy:
+        lookup_progress.start(10)
+        cancel_button.config(state='normal')
     else:
-        # 限制歷史紀錄
-        if word not in history_word:
-            if len(history_word) >= 15:
-                history_word.pop(0)
-            history_word.append(word)
+        lookup_progress.stop()
+        cancel_button.config(state='disabled')
+
+
+def show_lookup_error(word, error):
+    """查詢過程發生例外(例如連線逾時)"""
+    set_lookup_status("", busy=False)
+    messagebox.showerror("查詢錯誤", f"ఠ_ఠ? 查詢 '{word}' 時發生錯誤：{error}")
 
-        history_box.delete(0, tk.END)
-        for word in history_word:
-            history_box.insert(tk.END, word)
+
+def show_lookup_result(word, data, inserted=()):
+    """顯示背景查詢的結果，inserted 為這次查詢存入資料庫的新單字"""
+    set_lookup_status("", busy=False)
+
+    if isinstance(data, list) and data[0] == "Suggest":  # 可能拼錯，確認後仍可連網查詢
+        if messagebox.askyesno("拼字建議", f"{data[1]}\n\n仍要線上查詢 '{word}' 嗎？"):
+            search_translation(word, force=True)
+    elif isinstance(data, list) and data[0] == "Error":  # 當資料為錯誤時
+        messagebox.showerror("查詢錯誤", data[1])  # 啟用拼字建議時訊息附有相近的單字
+    else:
+        # 歷史紀錄只更新變動的列；次數與時間在背景寫入資料庫
+        add_history(word)
+        tasks.submit(service.record_history, word)
 
         show_word_details(data)
+        for headword in inserted:
+            apply_word_insert(headword)
+
+
+def add_history(word):
+    """將單字移到歷史清單尾端，只刪除並新增必要的列"""
+    removed, added = recent_words.touch(word)
+    if removed is not None:
+        history_box.delete(removed)
+    if added:
+        history_box.insert(tk.END, word)
+        history_box.see(tk.END)
+
+
+def load_history(words):
+    """啟動時載入最近的查詢紀錄(words 由新到舊)"""
+    # 載入完成前已查詢的單字保留在最新的位置
+    recent_words.load([*reversed(words), *recent_words])
+    history_box.delete(0, tk.END)
+    history_box.insert(tk.END, *recent_words)
+
+
+def toggle_tracing(event=None):
+    """切換查詢流程計時(Ctrl+T)，停用時於終端機印出各階段的延遲統計"""
+    if tracer.enabled:
+        tracer.disable()
+        print(tracer.report())
+        set_lookup_status("已停用計時", busy=False)
+    else:
+        tracer.enable()
+        set_lookup_status("已啟用計時", busy=False)
 
 
 def on_history_select(event):
@@ -116,201 +258,237 @@ def _on_mouse_wheel(canvas, event):
     canvas.yview_scroll(scroll_units, "units")
 
 
-
-# 創建主視窗
-root = tk.Tk()
-root.title("翻譯小工具")
-screen_height = root.winfo_screenheight()
-screen_width = root.winfo_screenwidth()
-root.geometry(f"1200x{screen_height - 120}")
-root.configure(bg="#ffffff")
-
-
-# ----------------------歷史搜尋紀錄-------------------------
-history_word = []
-
-
-# -------------------修改ttk默認樣式-------------------------
-style = ttk.Style()
-style.configure("TNotebook.Tab", font=("Arial", 12), padding=[10, 5], background="#f0f0f0", foreground="#000000")
-style.map("TNotebook.Tab", background=[("selected", "#ffa07a")], foreground=[("selected", "#ff0000")])
-
-
-# -------------------創建 Notebook(活頁籤)--------------------
-notebook = ttk.Notebook(root)
-notebook.pack(fill="both", expand=True, pady=(10,10), padx=(10,10))
-
-
-# ---------------------------查詢頁面---------------------------
-query_page = ttk.Frame(notebook)
-notebook.add(query_page, text="查詢頁面")
-
-
-# --------------------------輸入區域的框架---------------------
-input_frame = tk.Frame(query_page, bg="#f7b84e", pady=10)
-input_frame.grid(row=0, column=0, sticky="nswe", padx=10, pady=5)
-
-input_contain = tk.Frame(input_frame, pady=10, bg="#f7b84e")
-input_contain.pack(expand=True)
-input_label = tk.Label(input_contain, text="翻譯文字", bg="#f7b84e", font=("Arial", 14), relief='groove')
-input_label.grid(row=0, column=0, padx=(10, 5), pady=(10,5), sticky="w")
-input_entry = tk.Entry(input_contain, font=("Arial", 14))
-input_entry.grid(row=0, column=1, padx=(10, 5), pady=(10,5), sticky="e")
-query_button = tk.Button(input_contain, text="查詢", font=("Arial", 12), bg="#e0e0e0", relief="flat", width=8, command=search_translation)
-query_button.grid(row=0, column=2, padx=(10, 5), pady=(10,5), sticky="nse")
-
-
-# --------------------------歷史搜尋紀錄區---------------------
-history_frame = tk.Frame(query_page, bg="#f7b84e", pady=10)
-history_frame.grid(row=0, column=1, sticky="nsew", padx=10, pady=5)
-
-history_contain = tk.Frame(history_frame, pady=10, bg="#f7b84e")
-history_contain.pack(expand=True)
-history_label = tk.Label(history_contain, text="歷史搜尋紀錄", bg="#f7b84e", font=("Arial", 14), relief='groove')
-history_label.grid(row=0, column=0, padx=(10, 5), pady=(10,5), sticky="we")
-history_box = tk.Listbox(history_contain, font=("Arial", 12), bg="#ffffff", fg="#000000", height=6, borderwidth=2, relief="groove")
-history_box.grid(row=0, column=1, padx=(10, 5), pady=(10,5), sticky="we")
-history_scrollbar = tk.Scrollbar(history_contain, orient="vertical", command=history_box.yview)
-history_scrollbar.grid(row=0, column=2, pady=(10,5), sticky="ns")
-history_box.config(yscrollcommand=history_scrollbar.set)
-
-# 清單選擇
-history_box.bind('<<ListboxSelect>>', on_history_select)
-
-
-# ----------------- 顯示區域 - Canvas ------------------------
-canvas_frame = tk.Frame(query_page, bg="#f7b84e")
-canvas_frame.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=10, pady=5)
-# block
-canvas_1 = tk.Canvas(canvas_frame, bg="#ffffff", borderwidth=2, relief="groove")
-canvas_1.grid(row=0, column=0, padx=5, pady=10, sticky="nsew")
-scrollbar_1 = tk.Scrollbar(canvas_frame, orient="vertical", command=canvas_1.yview)
-scrollbar_1.grid(row=0, column=1, sticky="ns")
-canvas_1.configure(yscrollcommand=scrollbar_1.set)
-# block設定
-block_frame = tk.Frame(canvas_1, bg="#ffffff")
-block_window_id = canvas_1.create_window((0, 0), window=block_frame, anchor='nw')
-# phrase
-canvas_2 = tk.Canvas(canvas_frame, bg="#e6f2ff", borderwidth=2, relief="groove")
-canvas_2.grid(row=0, column=2, padx=5, pady=10, sticky="nsew")
-scrollbar_2 = tk.Scrollbar(canvas_frame, orient="vertical", command=canvas_2.yview)
-scrollbar_2.grid(row=0, column=3, sticky="ns")
-canvas_2.configure(yscrollcommand=scrollbar_2.set)
-# phrase設定
-phrase_frame = tk.Frame(canvas_2, bg="#e6f2ff")
-phrase_window_id = canvas_2.create_window((0, 0), window=phrase_frame, anchor='nw')
-
-# 綁定滾動事件
 def bind_canvas_scroll(canvas):
     """綁定 Canvas 滾動事件"""
     canvas.bind("<Enter>", lambda _: root.bind_all("<MouseWheel>", lambda e: _on_mouse_wheel(canvas, e)))
     canvas.bind("<Leave>", lambda _: root.unbind_all("<MouseWheel>"))
 
-bind_canvas_scroll(canvas_1)
-bind_canvas_scroll(canvas_2)
-
-
-
-# ----------------------------配置權重----------------------------
-query_page.rowconfigure(1, weight=1)  # Canvas 框架垂直權重
-query_page.columnconfigure(1, weight=1)  # history_frame 水平權重
-query_page.columnconfigure(0, weight=1)  # input_frame 水平權重
 
-canvas_frame.columnconfigure(0, weight=1)  # block canvas 框架權重
-canvas_frame.columnconfigure(2, weight=1)  # phrase canvas 框架權重
-canvas_frame.rowconfigure(0, weight=1)    # canvas frame 垂直權重
+# ---------------------------已學習單字頁籤---------------------------
+WORDS_PER_PAGE = 60  # 每頁顯示的單字數量
+WORD_COLUMNS = 4     # 每列顯示的單字數量
 
+# 目前頁面狀態：anchor 為上一頁最後一個單字(None 表示第一頁)，history 為先前頁面的 anchor
+words_state = {'loaded': False, 'anchor': None, 'history': [], 'words': [], 'has_next': False, 'total': 0}
+word_widgets = {}   # 單字 -> 單字容器
+letter_groups = {}  # 首字母 -> (標題, 單字框架)
 
 
-# ---------------------------已學習單字頁籤---------------------------
 def on_tab_change(event):
     """當頁籤切換時執行動作"""
     selected_tab = event.widget.tab(event.widget.index("current"))["text"]
-    if selected_tab == "已學習單字":
-        refresh_words_page()
+    if selected_tab == "已學習單字" and not words_state['loaded']:
+        # 只在第一次切換時載入，之後的新增、修改、刪除以增量方式更新
+        load_words_page(None)
 
 
 def refresh_words_page():
-    """刷新已學習單字頁籤內容"""
+    """重新載入目前頁面(例如其他程式匯入了單字)"""
+    load_words_page(words_state['anchor'])
+
+
+def load_words_page(anchor):
+    """以 keyset 分頁在背景載入 anchor 之後的一頁單字"""
+    words_state['loaded'] = True
+    tasks.submit(fetch_words_page, anchor, channel="words_page", on_done=lambda page: render_words_page(anchor, *page))
+
+
+def fetch_words_page(anchor):
+    """背景執行：讀取一頁單字與單字總數"""
+    return service.list_words(after=anchor, limit=WORDS_PER_PAGE + 1), service.count()
+
+
+def render_words_page(anchor, words, total):
+    """顯示載入完成的一頁單字"""
+    words_state.update(anchor=anchor, has_next=len(words) > WORDS_PER_PAGE, words=words[:WORDS_PER_PAGE], total=total)
+
+    # 只清除目前頁面的元件
     for widget in content_frame.winfo_children():
-        widget.destroy()  # 清空原有內容
+        widget.destroy()
+    word_widgets.clear()
+    letter_groups.clear()
 
-    # 從資料庫重新獲取資料
-    result = WordDatas.select_all(db)
+    for word in words_state['words']:
+        create_word_widget(word)
+    for letter in list(letter_groups):
+        layout_letter_group(letter)
 
-    for key, value in result.items():
-        # 標題
-        title_area = tk.Label(content_frame, text=f'{key.upper()}', font=("Arial", 20, "bold"), bg="#333d51", fg="#ffffff", anchor="center", relief="groove")
-        title_area.pack(fill="x", padx=5, pady=(15, 0))
+    update_words_navigation()
+    word_contain.yview_moveto(0)
 
-        # 單字框架
-        frame = tk.Frame(content_frame, bg="#cbd0d8", bd=2, relief="groove")
-        frame.pack(fill="x", padx=5, pady=(0,15))
-
-        # 渲染單字與按鈕
-        rows, columns = 0, 0
-        for individual_value in value:
-            # 容器
-            individual_contain = tk.Frame(frame, bg="#d3ac2b")
-            individual_contain.grid(row=rows, column=columns + 1, padx=5, pady=5)
-
-            # 單字顯示
-            individual_entry = tk.Entry(individual_contain, bg="#d3ac2b", font=("Arial", 18), state='normal', width=15)
-            individual_entry.insert(0, individual_value)
-            individual_entry.config(state='readonly', justify='center')
-            individual_entry.pack(side='top', padx=(5, 5), pady=(5, 5))
-
-            # 觸發方法
-            def on_button_click_search(entry_widget=individual_entry):
-                """處理按鈕點擊事件，顯示 Entry 內的文字"""
-                # 獲取 Entry 中的文字
-                text = entry_widget.get()
-                result = WordDatas.search_data(db, text)
-                show_info_window(result)
-
-            def on_button_click_update(entry_widget=individual_entry):
-                """處理按鈕點擊事件，更新 Entry 內的文字"""
-                # 獲取 Entry 中的文字
-                text = entry_widget.get()
-                result = WordDatas.search_data(db, text)
-                revise_info_window(result)
-
-            def on_button_click_remove(entry_widget=individual_entry):
-                """處理按鈕點擊事件，刪除 Entry 內的文字"""
-                # 獲取 Entry 中的文字
-                text = entry_widget.get()
-                # 呼叫確認刪除視窗
-                ensure_answer = remove_info_window(text)
-                if ensure_answer:
-                    # 資料庫刪除操作
-                    result = WordDatas.delete_word(db, text)
-                    if result[0] == "Error":
-                        messagebox.showerror(result[0], result[1])
-                    else:
-                        messagebox.showinfo(result[0], result[1])
-                    refresh_words_page()
-                else:
-                    messagebox.showinfo("取消操作", "刪除已取消")
-
-
-            # 修改與刪除按鈕
-            inner_button1 = tk.Button(individual_contain, text="查看", bg="#00ffff", font=("Arial", 12), width=6, command=lambda e=individual_entry: on_button_click_search(e))
-            inner_button1.pack(side="left", padx=(5,5))
-            inner_button2 = tk.Button(individual_contain, text="修改", bg="#a9a9a9", font=("Arial", 12), width=6, command=lambda e=individual_entry: on_button_click_update(e))
-            inner_button2.pack(side="left", padx=(5,5))
-            inner_button3 = tk.Button(individual_contain, text="刪除", bg="#ff0000", font=("Arial", 12), width=6, command=lambda e=individual_entry: on_button_click_remove(e))
-            inner_button3.pack(side="left", padx=(5,5))
-
-            columns += 1
-            if columns >= 4:
-                rows += 1
-                columns = 0
 
-    # 更新滾動區域
+def next_words_page():
+    """下一頁"""
+    if words_state['has_next'] and words_state['words']:
+        words_state['history'].append(words_state['anchor'])
+        load_words_page(words_state['words'][-1])
+
+
+def previous_words_page():
+    """上一頁"""
+    if words_state['history']:
+        load_words_page(words_state['history'].pop())
+
+
+def update_words_navigation():
+    """更新分頁按鈕與滾動區域"""
+    prev_button.config(state='normal' if words_state['history'] else 'disabled')
+    next_button.config(state='normal' if words_state['has_next'] else 'disabled')
+    page_label.config(text=f"第 {len(words_state['history']) + 1} 頁，共 {words_state['total']} 個單字")
+
     content_frame.update_idletasks()
     word_contain.config(scrollregion=word_contain.bbox("all"))
 
 
+def create_word_widget(word):
+    """建立單字容器，放入對應首字母的框架"""
+    letter = word[0].lower()
+    if letter not in letter_groups:
+        # 標題
+        title_area = tk.Label(content_frame, text=f'{letter.upper()}', font=("Arial", 20, "bold"), bg="#333d51", fg="#ffffff", anchor="center", relief="groove")
+        # 單字框架
+        frame = tk.Frame(content_frame, bg="#cbd0d8", bd=2, relief="groove")
+
+        # 依字母順序插入到下一個首字母之前
+        following = [key for key in letter_groups if key > letter]
+        if following:
+            before = letter_groups[min(following)][0]
+            title_area.pack(fill="x", padx=5, pady=(15, 0), before=before)
+            frame.pack(fill="x", padx=5, pady=(0,15), before=before)
+        else:
+            title_area.pack(fill="x", padx=5, pady=(15, 0))
+            frame.pack(fill="x", padx=5, pady=(0,15))
+        letter_groups[letter] = (title_area, frame)
+
+    # 容器
+    individual_contain = tk.Frame(letter_groups[letter][1], bg="#d3ac2b")
+
+    # 單字顯示
+    individual_entry = tk.Entry(individual_contain, bg="#d3ac2b", font=("Arial", 18), state='normal', width=15)
+    individual_entry.insert(0, word)
+    individual_entry.config(state='readonly', justify='center')
+    individual_entry.pack(side='top', padx=(5, 5), pady=(5, 5))
+
+    # 修改與刪除按鈕
+    inner_button1 = tk.Button(individual_contain, text="查看", bg="#00ffff", font=("Arial", 12), width=6, command=lambda w=word: on_button_click_search(w))
+    inner_button1.pack(side="left", padx=(5,5))
+    inner_button2 = tk.Button(individual_contain, text="修改", bg="#a9a9a9", font=("Arial", 12), width=6, command=lambda w=word: on_button_click_update(w))
+    inner_button2.pack(side="left", padx=(5,5))
+    inner_button3 = tk.Button(individual_contain, text="刪除", bg="#ff0000", font=("Arial", 12), width=6, command=lambda w=word: on_button_click_remove(w))
+    inner_button3.pack(side="left", padx=(5,5))
+
+    word_widgets[word] = individual_contain
+
+
+def layout_letter_group(letter):
+    """重新排列單一首字母框架內的單字，框架為空時移除"""
+    title_area, frame = letter_groups[letter]
+    words = [word for word in words_state['words'] if word[0].lower() == letter]
+    if not words:
+        title_area.destroy()
+        frame.destroy()
+        del letter_groups[letter]
+        return
+
+    for index, word in enumerate(words):
+        word_widgets[word].grid(row=index // WORD_COLUMNS, column=index % WORD_COLUMNS + 1, padx=5, pady=5)
+
+
+def apply_word_insert(word):
+    """新單字存入資料庫後，若落在目前頁面範圍內則只加入該單字"""
+    if not words_state['loaded'] or word in word_widgets:
+        return
+    words = words_state['words']
+    if words_state['anchor'] is not None and word <= words_state['anchor']:
+        return
+    if words and word > words[-1] and words_state['has_next']:
+        return
+
+    bisect.insort(words, word)
+    words_state['total'] += 1
+    create_word_widget(word)
+    layout_letter_group(word[0].lower())
+
+    # 超出每頁數量時，最後一個單字移到下一頁
+    if len(words) > WORDS_PER_PAGE:
+        dropped = words.pop()
+        word_widgets.pop(dropped).destroy()
+        layout_letter_group(dropped[0].lower())
+        words_state['has_next'] = True
+
+    update_words_navigation()
+
+
+def apply_word_delete(word):
+    """單字刪除後只移除該單字，並從下一頁補上一個單字"""
+    if word not in word_widgets:
+        return
+    words = words_state['words']
+    words.remove(word)
+    words_state['total'] -= 1
+    word_widgets.pop(word).destroy()
+    layout_letter_group(word[0].lower())
+
+    update_words_navigation()
+    fill_words_page()
+
+
+def fill_words_page():
+    """在背景讀取下一頁開頭的單字，補滿目前頁面"""
+    words = words_state['words']
+    if not words_state['has_next'] or not words or len(words) >= WORDS_PER_PAGE:
+        return
+    anchor = words[-1]
+    tasks.submit(service.list_words, anchor, WORDS_PER_PAGE - len(words) + 1, channel="words_fill",
+                 on_done=lambda following: apply_words_fill(anchor, following))
+
+
+def apply_words_fill(anchor, following):
+    """將背景讀取的單字補到目前頁面尾端"""
+    words = words_state['words']
+    if not words or words[-1] != anchor:
+        # 讀取期間頁面又有變動(換頁、新增或刪除)，以新的最後一個單字重新讀取
+        fill_words_page()
+        return
+
+    missing = WORDS_PER_PAGE - len(words)
+    for word in following[:missing]:
+        words.append(word)
+        create_word_widget(word)
+    for letter in {word[0].lower() for word in following[:missing]}:
+        layout_letter_group(letter)
+    words_state['has_next'] = len(following) > missing
+    update_words_navigation()
+
+
+def on_button_click_search(text):
+    """處理按鈕點擊事件，顯示單字內容"""
+    tasks.submit(service.get_word, text, on_done=show_info_window)
+
+
+def on_button_click_update(text):
+    """處理按鈕點擊事件，修改單字內容"""
+    tasks.submit(service.get_word, text, on_done=revise_info_window)
+
+
+def on_button_click_remove(text):
+    """處理按鈕點擊事件，刪除單字"""
+    # 呼叫確認刪除視窗
+    ensure_answer = remove_info_window(text)
+    if ensure_answer:
+        # 資料庫刪除操作
+        def on_deleted(result):
+            if result[0] == "Error":
+                messagebox.showerror(result[0], result[1])
+            else:
+                messagebox.showinfo(result[0], result[1])
+                apply_word_delete(text)
+
+        tasks.submit(service.delete, text, on_done=on_deleted)
+    else:
+        messagebox.showinfo("取消操作", "刪除已取消")
+
+
 def remove_info_window(text):
     """顯示確認刪除的視窗"""
     info_window = tk.Toplevel()
@@ -340,7 +518,7 @@ def remove_info_window(text):
     return result.get()
 
 
-def show_info_window(result):
+def show_info_window(word):
     """顯示帶有 Label 和 Entry 的自定義提示框"""
     # 創建一個新的 Toplevel 視窗作為提示框
     info_window = tk.Toplevel()
@@ -357,51 +535,45 @@ def show_info_window(result):
     show_info_frame = tk.Frame(show_info_canvas, bd=5, relief='raised')
     show_info_canvas.create_window((0, 0), window=show_info_frame, anchor="nw")
 
-    # 轉出字典
-    description_data = eval(result['description'])
-
-    # 顯示資料
-    for block, data in description_data.items():
-        if isinstance(data, dict):
-            # 文字翻譯
-            if re.findall(r'^block', block):
-                word_class = data.get('word_class', '未知分類')
-                color = "#191970"
-                # 文字標籤
-                tk.Label(show_info_frame, text=f"分類: {word_class}", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
-            else:
-                phrase = data.get('phrase')
-                color = '#ff0000'
-                tk.Label(show_info_frame, text=f"片語: {phrase}", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
-
-            # 描述
-            tk.Label(show_info_frame, text="描述:", font=("Arial", 12, 'bold'), wraplength=350, fg="white", bg=color, anchor='w', bd=5, relief='raised').pack(fill="x")
-            description_entry = tk.Text(show_info_frame, font=("Arial", 12), height=4, bg="white", wrap="word", bd=0)
-            description_entry.insert("1.0", data.get('description', 'N/A'))
-            description_entry.config(state=tk.DISABLED)
-            description_entry.pack(fill='x')
-
-            # 翻譯
-            if re.findall(r'^block', block):
-                tk.Label(show_info_frame, text="翻譯:", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
-                translation_entry = tk.Text(show_info_frame, font=("Arial", 12), height=4, width=20, bg="white", wrap="word", bd=0)
-                translation_entry.insert("1.0", data.get('word_translation', 'N/A'))
-                translation_entry.config(state=tk.DISABLED)
-                translation_entry.pack(fill="x")
-
-            # 範例句子
-            tk.Label(show_info_frame, text="範例句子:", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
-            example_entry = tk.Text(show_info_frame, font=("Arial", 12), height=4, width=20, bg="white", wrap="word", bd=0)
-            example_entry.insert("1.0", data.get('example_sentence', 'N/A'))
-            example_entry.config(state=tk.DISABLED)
-            example_entry.pack(fill="x")
-
-            # 翻譯句子
-            tk.Label(show_info_frame, text="翻譯句子:", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
-            example_translation_entry = tk.Text(show_info_frame, font=("Arial", 12), height=4, width=20, bg="white", wrap="word", bd=0)
-            example_translation_entry.insert("1.0", data.get('example_sentence_translation', 'N/A'))
-            example_translation_entry.config(state=tk.DISABLED)
-            example_translation_entry.pack(pady=(0, 15), fill="x")
+    # 顯示資料(解釋在前、片語在後)
+    for record in [*word.senses, *word.phrases]:
+        is_sense = isinstance(record, Sense)
+        if is_sense:
+            color = "#191970"
+            # 文字標籤
+            tk.Label(show_info_frame, text=f"分類: {record.word_class}", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
+        else:
+            color = '#ff0000'
+            tk.Label(show_info_frame, text=f"片語: {record.phrase}", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
+
+        # 描述
+        tk.Label(show_info_frame, text="描述:", font=("Arial", 12, 'bold'), wraplength=350, fg="white", bg=color, anchor='w', bd=5, relief='raised').pack(fill="x")
+        description_entry = tk.Text(show_info_frame, font=("Arial", 12), height=4, bg="white", wrap="word", bd=0)
+        description_entry.insert("1.0", record.description)
+        description_entry.config(state=tk.DISABLED)
+        description_entry.pack(fill='x')
+
+        # 翻譯
+        if is_sense:
+            tk.Label(show_info_frame, text="翻譯:", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
+            translation_entry = tk.Text(show_info_frame, font=("Arial", 12), height=4, width=20, bg="white", wrap="word", bd=0)
+            translation_entry.insert("1.0", record.word_translation)
+            translation_entry.config(state=tk.DISABLED)
+            translation_entry.pack(fill="x")
+
+        # 範例句子
+        tk.Label(show_info_frame, text="範例句子:", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
+        example_entry = tk.Text(show_info_frame, font=("Arial", 12), height=4, width=20, bg="white", wrap="word", bd=0)
+        example_entry.insert("1.0", record.example.sentence)
+        example_entry.config(state=tk.DISABLED)
+        example_entry.pack(fill="x")
+
+        # 翻譯句子
+        tk.Label(show_info_frame, text="翻譯句子:", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
+        example_translation_entry = tk.Text(show_info_frame, font=("Arial", 12), height=4, width=20, bg="white", wrap="word", bd=0)
+        example_translation_entry.insert("1.0", record.example.translation)
+        example_translation_entry.config(state=tk.DISABLED)
+        example_translation_entry.pack(pady=(0, 15), fill="x")
 
 
     # 更新滾動區域
@@ -427,7 +599,7 @@ def show_info_window(result):
 
 
 
-def revise_info_window(result):
+def revise_info_window(word):
     """創建可修改文字的視窗"""
     # 創建新的 Toplevel 視窗
     info_window = tk.Toplevel()
@@ -443,72 +615,63 @@ def revise_info_window(result):
     revise_info_frame = tk.Frame(revise_info_canvas, bd=5, relief='raised')
     revise_info_canvas.create_window((0, 0), window=revise_info_frame, anchor="nw")
 
-    # 轉出字典
-    description_data = eval(result['description'])
-
-
     # 儲存所有段落框架的字典
-    entry_mapping = {}  # 用於記錄每個小部件和資料字段的映射
-    updated_datas = {}
-    updated_datas['english_word'] = result['english_word']
-
-    for block, data in description_data.items():
-        if isinstance(data, dict):
-            if re.findall(r'^block', block):
-                word_class = data.get('word_class', '未知分類')
-                color = "#191970"
-                # 文字標籤
-                tk.Label(revise_info_frame, text=f"分類: {word_class}", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
-            else:
-                phrase = data.get('phrase')
-                color = '#ff0000'
-                tk.Label(revise_info_frame, text=f"片語: {phrase}", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
-
-            # 描述
-            tk.Label(revise_info_frame, text="描述:", font=("Arial", 12, 'bold'), fg="white", bg=color, anchor='w', bd=5, relief='raised').pack(fill="x")
-            description_entry = tk.Text(revise_info_frame, font=("Arial", 12), height=4, bg="white", wrap="word", bd=0)
-            description_entry.insert("1.0", data.get('description', 'N/A'))
-            description_entry.pack(fill='x')
-            entry_mapping[description_entry] = {'block': block, 'field': 'description'}
-
-            # 翻譯
-            if re.findall(r'^block', block):
-                tk.Label(revise_info_frame, text="翻譯:", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
-                translation_entry = tk.Text(revise_info_frame, font=("Arial", 12), height=4, bg="white", wrap="word", bd=0)
-                translation_entry.insert("1.0", data.get('word_translation', 'N/A'))
-                translation_entry.pack(fill="x")
-                entry_mapping[translation_entry] = {'block': block, 'field': 'word_translation'}
-
-            # 範例句子
-            tk.Label(revise_info_frame, text="範例句子:", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
-            example_entry = tk.Text(revise_info_frame, font=("Arial", 12), height=4, bg="white", wrap="word", bd=0)
-            example_entry.insert("1.0", data.get('example_sentence', 'N/A'))
-            example_entry.pack(fill="x")
-            entry_mapping[example_entry] = {'block': block, 'field': 'example_sentence'}
-
-            # 翻譯句子
-            tk.Label(revise_info_frame, text="翻譯句子:", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
-            example_translation_entry = tk.Text(revise_info_frame, font=("Arial", 12), height=4, bg="white", wrap="word", bd=0)
-            example_translation_entry.insert("1.0", data.get('example_sentence_translation', 'N/A'))
-            example_translation_entry.pack(pady=(0, 15), fill="x")
-            entry_mapping[example_translation_entry] = {'block': block, 'field': 'example_sentence_translation'}
+    entry_mapping = {}  # 用於記錄每個小部件對應的 (資料物件, 屬性名稱)
+
+    for record in [*word.senses, *word.phrases]:
+        is_sense = isinstance(record, Sense)
+        if is_sense:
+            color = "#191970"
+            # 文字標籤
+            tk.Label(revise_info_frame, text=f"分類: {record.word_class}", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
+        else:
+            color = '#ff0000'
+            tk.Label(revise_info_frame, text=f"片語: {record.phrase}", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
+
+        # 描述
+        tk.Label(revise_info_frame, text="描述:", font=("Arial", 12, 'bold'), fg="white", bg=color, anchor='w', bd=5, relief='raised').pack(fill="x")
+        description_entry = tk.Text(revise_info_frame, font=("Arial", 12), height=4, bg="white", wrap="word", bd=0)
+        description_entry.insert("1.0", record.description)
+        description_entry.pack(fill='x')
+        entry_mapping[description_entry] = (record, 'description')
+
+        # 翻譯
+        if is_sense:
+            tk.Label(revise_info_frame, text="翻譯:", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
+            translation_entry = tk.Text(revise_info_frame, font=("Arial", 12), height=4, bg="white", wrap="word", bd=0)
+            translation_entry.insert("1.0", record.word_translation)
+            translation_entry.pack(fill="x")
+            entry_mapping[translation_entry] = (record, 'word_translation')
+
+        # 範例句子
+        tk.Label(revise_info_frame, text="範例句子:", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
+        example_entry = tk.Text(revise_info_frame, font=("Arial", 12), height=4, bg="white", wrap="word", bd=0)
+        example_entry.insert("1.0", record.example.sentence)
+        example_entry.pack(fill="x")
+        entry_mapping[example_entry] = (record.example, 'sentence')
+
+        # 翻譯句子
+        tk.Label(revise_info_frame, text="翻譯句子:", font=("Arial", 12, 'bold'), anchor="w", fg="white", bg=color, bd=5, relief='raised').pack(fill="x")
+        example_translation_entry = tk.Text(revise_info_frame, font=("Arial", 12), height=4, bg="white", wrap="word", bd=0)
+        example_translation_entry.insert("1.0", record.example.translation)
+        example_translation_entry.pack(pady=(0, 15), fill="x")
+        entry_mapping[example_translation_entry] = (record.example, 'translation')
 
 
     # 儲存按鈕，更新文字
     def save_changes():
-        updated_data = {block: data.copy() for block, data in description_data.items()}
-        for widget, mapping in entry_mapping.items():
-            block = mapping['block']
-            field = mapping['field']
-            updated_data[block][field] = widget.get("1.0", "end-1c").strip()
-        updated_datas['description'] = updated_data
-        db_result = WordDatas.update_word(db, updated_datas)
-        if db_result[0] == "Success":
-            messagebox.showinfo(db_result[0], db_result[1])
-        else :
-            messagebox.showerror(db_result[0], db_result[1])
-        info_window.destroy()  # 關閉視窗
-        refresh_words_page()  # 更新頁面
+        for widget, (target, attribute) in entry_mapping.items():
+            setattr(target, attribute, widget.get("1.0", "end-1c").strip())
+        updated_datas = {'english_word': word.english_word, 'description': word.to_details()}
+        info_window.destroy()  # 關閉視窗(單字列表不變，不需重新整理頁面)
+
+        def on_saved(db_result):
+            if db_result[0] == "Success":
+                messagebox.showinfo(db_result[0], db_result[1])
+            else :
+                messagebox.showerror(db_result[0], db_result[1])
+
+        tasks.submit(service.update, updated_datas, on_done=on_saved)
 
 
 
@@ -533,45 +696,326 @@ def revise_info_window(result):
     # 使用 after 延遲更新大小
     info_window.after(100, update_window_size)
     # 設定抬頭
-    info_window.title(f" {result['english_word']} 的修改頁面")
-
-
-
-words_page = ttk.Frame(notebook)
-notebook.add(words_page, text="已學習單字")
+    info_window.title(f" {word.english_word} 的修改頁面")
 
-word_contain = tk.Canvas(words_page, bg="#a9a9a9")
-word_contain.grid(row=0, column=0, padx=10, pady=5, sticky="nsew")
-word_scrollbar = tk.Scrollbar(words_page, orient="vertical", command=word_contain.yview)
-word_scrollbar.grid(row=0, column=1, pady=5, sticky="ns")
-word_contain.config(yscrollcommand=word_scrollbar.set)
 
-# 創建一個框架來放置所有內容
-content_frame = tk.Frame(word_contain)
-word_window_id = word_contain.create_window((0, 0), window=content_frame, anchor="nw")
 
 # 動態調整 content_frame 寬度
 def adjust_content_frame_width(event):
     canvas_width = event.width
     word_contain.itemconfig(word_window_id, width=canvas_width)
 
-word_contain.bind("<Configure>", adjust_content_frame_width)
 
-# 綁定滾動事件
-bind_canvas_scroll(word_contain)
 
-words_page.grid_rowconfigure(0, weight=1)
-words_page.grid_columnconfigure(0, weight=1)
+# ---------------------------全文搜尋頁籤---------------------------
+def run_full_text_search(event=None):
+    """以輸入文字全文檢索已學習的單字、片語、翻譯與例句"""
+    query = search_entry.get().strip()
+    if not query:
+        tasks.cancel("full_text_search")
+        show_full_text_results([])
+        return
+
+    # 連續輸入時只顯示最後一次查詢的結果
+    tasks.submit(service.search, query, 50, channel="full_text_search", on_done=show_full_text_results)
+
+
+def show_full_text_results(results):
+    """顯示全文檢索結果"""
+    search_results.clear()
+    search_box.delete(0, tk.END)
+    search_results.extend(results)
+    for item in search_results:
+        title = item['phrase'] if item['kind'] == 'phrase' else item['english_word']
+        translation = item['word_translation'] or ''
+        search_box.insert(tk.END, f"{item['english_word']:<15} {title} ─ {item['description'] or ''} {translation}")
+
+
+def on_search_result_select(event):
+    """選擇搜尋結果時，切換到查詢頁面顯示該單字"""
+    selected_index = search_box.curselection()
+    if selected_index:
+        notebook.select(query_page)
+        search_translation(search_results[selected_index[0]]['english_word'])
+
 
-# 綁定頁籤切換事件
-notebook.bind("<<NotebookTabChanged>>", on_tab_change)
+search_results = []  # 目前顯示的全文檢索結果
 
 
 
 # --------------------資料庫初始化---------------------------
-result = WordDatas.init_db(db)
-if result != None:
-    messagebox.showerror(result[0], result[1])
+def set_database_ready(ready):
+    """資料庫初始化(可能包含結構遷移)完成前停用查詢輸入與其他頁籤"""
+    state = 'normal' if ready else 'disabled'
+    input_entry.config(state=state)
+    query_button.config(state=state)
+    notebook.tab(words_page, state=state)
+    notebook.tab(search_page, state=state)
+
+
+def on_database_ready(result):
+    """資料庫初始化完成：啟用介面，並在背景載入歷史紀錄與常用單字"""
+    set_lookup_status("", busy=False)
+    set_database_ready(True)
+    if result != None:
+        messagebox.showerror(result[0], result[1])
+
+    # 載入歷史紀錄，並將最常查詢的單字預先載入記憶體快取
+    tasks.submit(service.recent_history, HISTORY_SIZE, on_done=load_history)
+    tasks.submit(service.pin_frequent)
+    if args.spelling or args.word_list:
+        tasks.submit(service.enable_spelling, args.word_list, args.spelling_distance)
+
+
+def show_database_error(error):
+    """資料庫初始化發生例外(例如檔案無法開啟)"""
+    set_lookup_status("", busy=False)
+    messagebox.showerror("Error", f"ఠ_ఠ? 建立資料庫時發生錯誤：{error}")
+
+
+
+# --------------------背景工作結果輪詢---------------------------
+def poll_background_tasks():
+    """在 UI 執行緒執行背景工作的回呼"""
+    tasks.poll()
+    root.after(50, poll_background_tasks)
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="翻譯小工具")
+    parser.add_argument('--db', default=db, help="資料庫檔案路徑")
+    parser.add_argument('--crawl-log', default="crawl_log.jsonl", help="爬蟲輸出紀錄(JSONL)路徑，空字串表示不記錄")
+    parser.add_argument('--exit-after-startup', action='store_true',
+                        help="視窗第一次閒置(完成繪製)後即結束，供啟動效能測試使用")
+    parser.add_argument('--prefetch', action='store_true', help="查詢後於背景預先爬取片語與例句中的相關單字")
+    parser.add_argument('--prefetch-budget', type=int, default=30, help="每小時最多預取的請求數")
+    parser.add_argument('--spelling', action='store_true',
+                        help="啟用拼字建議，查無單字時提示相近的單字(索引常駐記憶體，10 萬字約 220MB)")
+    parser.add_argument('--word-list', help="拼字建議使用的單字清單(每行一個單字，隱含 --spelling)，可能拼錯的字先提示相近的單字，確認後仍可線上查詢")
+    parser.add_argument('--spelling-distance', type=int, default=2, choices=(1, 2),
+                        help="拼字建議的最大編輯距離，1 可將索引記憶體降為約三分之一")
+    parser.add_argument('--trace', nargs='?', const="trace.jsonl", metavar='FILE',
+                        help="啟用查詢流程計時，結束時將紀錄匯出至 FILE(預設 trace.jsonl)；執行中可按 Ctrl+T 切換")
+    args = parser.parse_args()
+    if args.trace:
+        tracer.enable()
+    if args.db != db:
+        db = args.db
+        service = WordService(db)
+    if args.crawl_log:
+        DataCrawl.crawl_log = CrawlLog(args.crawl_log)
+    if args.prefetch:
+        service.prefetcher = Prefetcher(service.cache, max_requests=args.prefetch_budget)
+
+    # 創建主視窗
+    root = tk.Tk()
+    root.title("翻譯小工具")
+    screen_height = root.winfo_screenheight()
+    screen_width = root.winfo_screenwidth()
+    root.geometry(f"1200x{screen_height - 120}")
+    root.configure(bg="#ffffff")
+
+
+    # -------------------修改ttk默認樣式-------------------------
+    style = ttk.Style()
+    style.configure("TNotebook.Tab", font=("Arial", 12), padding=[10, 5], background="#f0f0f0", foreground="#000000")
+    style.map("TNotebook.Tab", background=[("selected", "#ffa07a")], foreground=[("selected", "#ff0000")])
+
+
+    # -------------------創建 Notebook(活頁籤)--------------------
+    notebook = ttk.Notebook(root)
+    notebook.pack(fill="both", expand=True, pady=(10,10), padx=(10,10))
+
+
+    # ---------------------------查詢頁面---------------------------
+    query_page = ttk.Frame(notebook)
+    notebook.add(query_page, text="查詢頁面")
+
+
+    # --------------------------輸入區域的框架---------------------
+    input_frame = tk.Frame(query_page, bg="#f7b84e", pady=10)
+    input_frame.grid(row=0, column=0, sticky="nswe", padx=10, pady=5)
+
+    input_contain = tk.Frame(input_frame, pady=10, bg="#f7b84e")
+    input_contain.pack(expand=True)
+    input_label = tk.Label(input_contain, text="翻譯文字", bg="#f7b84e", font=("Arial", 14), relief='groove')
+    input_label.grid(row=0, column=0, padx=(10, 5), pady=(10,5), sticky="w")
+    input_entry = tk.Entry(input_contain, font=("Arial", 14))
+    input_entry.grid(row=0, column=1, padx=(10, 5), pady=(10,5), sticky="e")
+    query_button = tk.Button(input_contain, text="查詢", font=("Arial", 12), bg="#e0e0e0", relief="flat", width=8, command=search_translation)
+    query_button.grid(row=0, column=2, padx=(10, 5), pady=(10,5), sticky="nse")
+    input_entry.bind("<Return>", lambda _: search_translation())
+    root.bind_all("<Control-t>", toggle_tracing)
+
+    # 查詢進度與取消
+    lookup_progress = ttk.Progressbar(input_contain, mode="indeterminate", length=150)
+    lookup_progress.grid(row=1, column=0, columnspan=2, padx=(10, 5), pady=(5,5), sticky="we")
+    cancel_button = tk.Button(input_contain, text="取消", font=("Arial", 12), bg="#e0e0e0", relief="flat", width=8, command=cancel_lookup, state='disabled')
+    cancel_button.grid(row=1, column=2, padx=(10, 5), pady=(5,5), sticky="nse")
+    status_label = tk.Label(input_contain, text="", bg="#f7b84e", font=("Arial", 12))
+    status_label.grid(row=2, column=0, columnspan=3, padx=(10, 5), sticky="w")
+
+
+    # --------------------------歷史搜尋紀錄區---------------------
+    history_frame = tk.Frame(query_page, bg="#f7b84e", pady=10)
+    history_frame.grid(row=0, column=1, sticky="nsew", padx=10, pady=5)
+
+    history_contain = tk.Frame(history_frame, pady=10, bg="#f7b84e")
+    history_contain.pack(expand=True)
+    history_label = tk.Label(history_contain, text="歷史搜尋紀錄", bg="#f7b84e", font=("Arial", 14), relief='groove')
+    history_label.grid(row=0, column=0, padx=(10, 5), pady=(10,5), sticky="we")
+    history_box = tk.Listbox(history_contain, font=("Arial", 12), bg="#ffffff", fg="#000000", height=6, borderwidth=2, relief="groove")
+    history_box.grid(row=0, column=1, padx=(10, 5), pady=(10,5), sticky="we")
+    history_scrollbar = tk.Scrollbar(history_contain, orient="vertical", command=history_box.yview)
+    history_scrollbar.grid(row=0, column=2, pady=(10,5), sticky="ns")
+    history_box.config(yscrollcommand=history_scrollbar.set)
+
+    # 清單選擇
+    history_box.bind('<<ListboxSelect>>', on_history_select)
+
+
+    # ----------------- 顯示區域 - Canvas ------------------------
+    canvas_frame = tk.Frame(query_page, bg="#f7b84e")
+    canvas_frame.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=10, pady=5)
+    # block
+    canvas_1 = tk.Canvas(canvas_frame, bg="#ffffff", borderwidth=2, relief="groove")
+    canvas_1.grid(row=0, column=0, padx=5, pady=10, sticky="nsew")
+    scrollbar_1 = tk.Scrollbar(canvas_frame, orient="vertical", command=canvas_1.yview)
+    scrollbar_1.grid(row=0, column=1, sticky="ns")
+    canvas_1.configure(yscrollcommand=scrollbar_1.set)
+    # block設定
+    block_frame = tk.Frame(canvas_1, bg="#ffffff")
+    block_window_id = canvas_1.create_window((0, 0), window=block_frame, anchor='nw')
+    # phrase
+    canvas_2 = tk.Canvas(canvas_frame, bg="#e6f2ff", borderwidth=2, relief="groove")
+    canvas_2.grid(row=0, column=2, padx=5, pady=10, sticky="nsew")
+    scrollbar_2 = tk.Scrollbar(canvas_frame, orient="vertical", command=canvas_2.yview)
+    scrollbar_2.grid(row=0, column=3, sticky="ns")
+    canvas_2.configure(yscrollcommand=scrollbar_2.set)
+    # phrase設定
+    phrase_frame = tk.Frame(canvas_2, bg="#e6f2ff")
+    phrase_window_id = canvas_2.create_window((0, 0), window=phrase_frame, anchor='nw')
+
+    # 查詢結果的標題與重複使用的元件池
+    word_title = tk.Label(block_frame, text="", font=("Arial", 18, "bold"))
+    word_title.grid(row=0, column=0, columnspan=5, pady=10)
+    sense_pool = RowPool(block_frame, ["詞類", "描述", "翻譯", "例句", "翻譯例句"])
+    phrase_title = tk.Label(phrase_frame, text="延伸學習", font=("Arial", 18, "bold"), background='#e6f2ff')
+    phrase_title.grid(row=0, column=0, columnspan=5, pady=10)
+    phrase_title.grid_remove()
+    phrase_pool = RowPool(phrase_frame, ["片語", "描述", "翻譯", "例句", "翻譯例句"], background='#e6f2ff')
+
+    # 內容大小改變時才更新滾動範圍，不需強制重新排版
+    block_frame.bind("<Configure>", lambda _: update_scrollregion(canvas_1))
+    phrase_frame.bind("<Configure>", lambda _: update_scrollregion(canvas_2))
+
+    # 綁定滾動事件
+    bind_canvas_scroll(canvas_1)
+    bind_canvas_scroll(canvas_2)
+
+
+
+
+
+
+    # ----------------------------配置權重----------------------------
+    query_page.rowconfigure(1, weight=1)  # Canvas 框架垂直權重
+    query_page.columnconfigure(1, weight=1)  # history_frame 水平權重
+    query_page.columnconfigure(0, weight=1)  # input_frame 水平權重
+
+    canvas_frame.columnconfigure(0, weight=1)  # block canvas 框架權重
+    canvas_frame.columnconfigure(2, weight=1)  # phrase canvas 框架權重
+    canvas_frame.rowconfigure(0, weight=1)    # canvas frame 垂直權重
+
+
+
+    # ---------------------------已學習單字頁籤---------------------------
+    words_page = ttk.Frame(notebook)
+    notebook.add(words_page, text="已學習單字")
+
+    word_contain = tk.Canvas(words_page, bg="#a9a9a9")
+    word_contain.grid(row=0, column=0, padx=10, pady=5, sticky="nsew")
+    word_scrollbar = tk.Scrollbar(words_page, orient="vertical", command=word_contain.yview)
+    word_scrollbar.grid(row=0, column=1, pady=5, sticky="ns")
+    word_contain.config(yscrollcommand=word_scrollbar.set)
+
+    # 創建一個框架來放置所有內容
+    content_frame = tk.Frame(word_contain)
+    word_window_id = word_contain.create_window((0, 0), window=content_frame, anchor="nw")
+
+    word_contain.bind("<Configure>", adjust_content_frame_width)
+
+    # 綁定滾動事件
+    bind_canvas_scroll(word_contain)
+
+    # 分頁按鈕
+    words_navigation = tk.Frame(words_page, bg="#a9a9a9")
+    words_navigation.grid(row=1, column=0, columnspan=2, padx=10, pady=(0, 5), sticky="ew")
+    prev_button = tk.Button(words_navigation, text="上一頁", font=("Arial", 12), width=8, command=previous_words_page, state='disabled')
+    prev_button.pack(side="left", padx=5, pady=5)
+    page_label = tk.Label(words_navigation, text="", font=("Arial", 12), bg="#a9a9a9")
+    page_label.pack(side="left", expand=True)
+    tk.Button(words_navigation, text="重新整理", font=("Arial", 12), width=8, command=refresh_words_page).pack(side="right", padx=5, pady=5)
+    next_button = tk.Button(words_navigation, text="下一頁", font=("Arial", 12), width=8, command=next_words_page, state='disabled')
+    next_button.pack(side="right", padx=5, pady=5)
+
+    words_page.grid_rowconfigure(0, weight=1)
+    words_page.grid_columnconfigure(0, weight=1)
+
+    # 綁定頁籤切換事件
+    notebook.bind("<<NotebookTabChanged>>", on_tab_change)
+
+
+
+    # ---------------------------全文搜尋頁籤---------------------------
+    search_page = ttk.Frame(notebook)
+    notebook.add(search_page, text="全文搜尋")
+
+    search_contain = tk.Frame(search_page, bg="#f7b84e", pady=10)
+    search_contain.grid(row=0, column=0, columnspan=2, sticky="nswe", padx=10, pady=5)
+    tk.Label(search_contain, text="搜尋內容", bg="#f7b84e", font=("Arial", 14), relief='groove').pack(side="left", padx=(10, 5))
+    search_entry = tk.Entry(search_contain, font=("Arial", 14))
+    search_entry.pack(side="left", fill="x", expand=True, padx=(10, 10))
+    # 索引查詢僅需數毫秒，輸入時即時搜尋
+    search_entry.bind("<KeyRelease>", run_full_text_search)
+
+    search_box = tk.Listbox(search_page, font=("Arial", 12), bg="#ffffff", fg="#000000", borderwidth=2, relief="groove")
+    search_box.grid(row=1, column=0, sticky="nsew", padx=(10, 0), pady=5)
+    search_scrollbar = tk.Scrollbar(search_page, orient="vertical", command=search_box.yview)
+    search_scrollbar.grid(row=1, column=1, sticky="ns", padx=(0, 10), pady=5)
+    search_box.config(yscrollcommand=search_scrollbar.set)
+    search_box.bind('<<ListboxSelect>>', on_search_result_select)
+
+    search_page.grid_rowconfigure(1, weight=1)
+    search_page.grid_columnconfigure(0, weight=1)
+
+
+
+    # --------------------資料庫初始化---------------------------
+    # 舊版資料庫的遷移可能需要數秒，在背景執行，完成後才啟用查詢
+    set_database_ready(False)
+    set_lookup_status("資料庫初始化中…", busy=True)
+    cancel_button.config(state='disabled')
+    tasks.submit(service.init, on_done=on_database_ready, on_error=show_database_error)
+
+
+    # --------------------背景工作結果輪詢---------------------------
+    poll_background_tasks()
+
+    if args.exit_after_startup:
+        root.after_idle(root.destroy)
+
 
+    root.mainloop()
 
-root.mainloop()
+    # 等待執行中的背景工作結束後，再關閉長期保留的資料庫連線
+    tasks.shutdown(wait=True)
+    if args.trace:
+        print(tracer.report())
+        tracer.export(args.trace)
+    if service.prefetcher is not None:
+        service.prefetcher.close()
+    db_connections.close_all()
+    if DataCrawl.crawl_log is not None:
+        DataCrawl.crawl_log.close()
@@ -0,0 +1,113 @@
+"""
+單字資料模型(models.py)與巢狀字典的記憶體與走訪速度比較。
+
+    - 記憶體：以 tracemalloc 量測保留 N 個單字所需的記憶體
+    - 走訪：模擬 show_word_details 取出每個欄位，比較以 re.findall 篩選鍵(舊版)與走訪具型別的列表
+    - 轉換：Word.from_details 與 Word.to_details 的成本
+
+使用方式：
+    python benchmarks/bench_models.py
+    python benchmarks/bench_models.py 20000      # 自訂單字數量
+"""
+import os, re, sys, time, tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Word
+
+
+def make_details(index: int, senses: int = 8, phrases: int = 4) -> dict:
+    """產生與 DataCrawl.parse 結構相同的區塊字典。"""
+    details = {}
+    for i in range(1, senses + 1):
+        details[f'block{i}'] = {
+            'word_class': 'verb',
+            'description': f'meaning {i} of word {index}',
+            'word_translation': f'解釋{i}',
+            'example_sentence': f'An example of word {index} number {i}.',
+            'example_sentence_translation': f'第{i}個例句。',
+        }
+    for i in range(1, phrases + 1):
+        details[f'phrase{i}'] = {
+            'phrase': f'word {index} phrase {i}',
+            'description': f'phrase meaning {i}',
+            'example_sentence': 'N/A',
+            'example_sentence_translation': 'N/A',
+        }
+    return details
+
+
+def render_dict(word_data: dict) -> int:
+    """舊版 show_word_details 的走訪方式(不建立元件)。"""
+    count = 0
+    for key, value in word_data.items():
+        for block_key, block_value in value.items():
+            if re.findall(r'^block', block_key):
+                for field in ["word_class", "description", "word_translation", "example_sentence", "example_sentence_translation"]:
+                    count += len(block_value.get(field, "N/A"))
+    for key, value in word_data.items():
+        for phrase_key, phrase_value in value.items():
+            if re.findall(r'^phrase', phrase_key):
+                for field in ["phrase", "description", "word_translation", "example_sentence", "example_sentence_translation"]:
+                    count += len(phrase_value.get(field, "N/A"))
+    return count
+
+
+def render_model(word: Word) -> int:
+    """目前 show_word_details 的走訪方式(不建立元件)。"""
+    count = 0
+    for sense in word.senses:
+        for value in (sense.word_class, sense.description, sense.word_translation, sense.example.sentence, sense.example.translation):
+            count += len(value)
+    for phrase in word.phrases:
+        for value in (phrase.phrase, phrase.description, 'N/A', phrase.example.sentence, phrase.example.translation):
+            count += len(value)
+    return count
+
+
+def measure_memory(build) -> int:
+    """回傳 build() 建立的物件所保留的位元組數。"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def measure_time(func, items, repeat: int = 5) -> float:
+    """回傳每個項目的平均微秒數(取最佳一輪)。"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e6
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 5000
+
+    # 文字內容兩種格式共用同一份，只比較結構本身的成本
+    raw = [(f'word{index}', make_details(index)) for index in range(count)]
+    dict_bytes = measure_memory(lambda: [{word: {key: dict(value) for key, value in details.items()}} for word, details in raw])
+    model_bytes = measure_memory(lambda: [Word.from_details(word, details) for word, details in raw])
+    print(f"{'記憶體(每個單字)':<20}dict {dict_bytes / count:8.0f} B   Word {model_bytes / count:8.0f} B   "
+          f"(-{(1 - model_bytes / dict_bytes) * 100:.0f}%)")
+
+    dicts = [{word: details} for word, details in raw]
+    models = [Word.from_details(word, details) for word, details in raw]
+    assert all(render_dict(d) == render_model(m) for d, m in zip(dicts[:100], models[:100]))
+    legacy = measure_time(render_dict, dicts)
+    current = measure_time(render_model, models)
+    print(f"{'走訪(每個單字)':<20}dict {legacy:8.2f} µs   Word {current:8.2f} µs   ({legacy / current:.1f}x)")
+
+    print(f"{'Word.from_details':<20}{measure_time(lambda item: Word.from_details(*item), raw):8.2f} µs")
+    print(f"{'Word.to_details':<20}{measure_time(Word.to_details, models):8.2f} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
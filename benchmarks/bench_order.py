@@ -0,0 +1,72 @@
+"""
+解釋/片語排序的微基準測試。
+
+比較舊版氣泡排序(O(n²))與目前的 DataCrawl.order_phrases(穩定分割，O(n))。
+測試資料模擬 "set"、"run" 這類多個詞條交錯出現解釋與片語的大型單字。
+
+使用方式：
+    python benchmarks/bench_order.py
+    python benchmarks/bench_order.py 100 500 2000    # 自訂區塊數量
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib import DataCrawl
+
+
+def legacy_bubble_sort_phrases(dictionary: dict, parent_key: str):
+    """舊版 DataCrawl.bubble_sort_phrases，僅供比較。"""
+    keys = list(dictionary[parent_key].keys())
+    for i in range(len(keys)):
+        for j in range(len(keys) - i - 1):
+            if keys[j].startswith('phrase') and not keys[j + 1].startswith('phrase'):
+                keys[j], keys[j + 1] = keys[j + 1], keys[j]
+    dictionary[parent_key] = {key: dictionary[parent_key][key] for key in keys}
+    return dictionary
+
+
+def make_entry(size: int, entries: int = 4) -> dict:
+    """產生 size 個區塊的單字，分成多個詞條，每個詞條先解釋後片語(與頁面順序相同)。"""
+    blocks = {}
+    block_index = phrase_index = 1
+    per_entry = max(size // entries, 1)
+    for _ in range(entries):
+        for _ in range(per_entry * 2 // 3):
+            blocks[f'block{block_index}'] = {'description': f'sense {block_index}'}
+            block_index += 1
+        for _ in range(per_entry - per_entry * 2 // 3):
+            blocks[f'phrase{phrase_index}'] = {'phrase': f'phrase {phrase_index}'}
+            phrase_index += 1
+    return {'run': blocks}
+
+
+def measure(func, size: int, repeat: int = 5) -> float:
+    """回傳單次排序的毫秒數(取最佳一輪)。"""
+    best = float('inf')
+    for _ in range(repeat):
+        word = make_entry(size)
+        start = time.perf_counter()
+        func(word, 'run')
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(size) for size in argv] or [50, 200, 500, 1000]
+
+    # 兩種做法的結果必須一致
+    for size in sizes:
+        assert list(legacy_bubble_sort_phrases(make_entry(size), 'run')['run']) == \
+               list(DataCrawl.order_phrases(make_entry(size), 'run')['run'])
+
+    print(f"{'區塊數':<8}{'氣泡排序':>12}{'穩定分割':>12}{'倍數':>8}")
+    for size in sizes:
+        legacy = measure(legacy_bubble_sort_phrases, size)
+        current = measure(DataCrawl.order_phrases, size)
+        print(f"{size:<8}{legacy:9.3f} ms{current:9.3f} ms{legacy / current:7.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+DataCrawl 解析速度基準測試(不連網)。
+
+比較舊版解析流程(完整 html.parser 樹 + 重複 find / find_parent)與目前的 DataCrawl.parse。
+
+使用方式：
+    python benchmarks/bench_parse.py                 # 使用模擬頁面
+    python benchmarks/bench_parse.py saved_pages/    # 使用存下的 *.html 頁面
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from lib import DataCrawl
+from corpus import load_pages, synthetic_pages
+
+
+def legacy_parse(html: str) -> dict:
+    """舊版 DataCrawl.crawl 的解析流程，僅供比較。"""
+    soup = BeautifulSoup(html, 'html.parser')
+    blocks = {}
+    if soup.find_all('div', class_='pr entry-body__el'):
+        headword = soup.find('span', class_='hw dhw').text if soup.find('span', class_='hw dhw') else None
+        block_index = 1
+        phrase_index = 1
+        for block in soup.find_all('div', class_='pr entry-body__el'):
+            word_class = block.find('span', class_='pos dpos')
+            for sub_block in block.find_all('div', class_='def-block ddef_block'):
+                parent_block = sub_block.find_parent('div', class_=DataCrawl.PHRASE_CLASSES)
+                if parent_block:
+                    phrase_title = parent_block.find('span', class_='phrase-title dphrase-title')
+                    blocks[f'phrase{phrase_index}'] = {
+                        'phrase': phrase_title.text if phrase_title else 'N/A',
+                        'description': DataCrawl._text(sub_block, 'div', 'def ddef_d db'),
+                        'example_sentence': DataCrawl._text(sub_block, 'span', 'eg deg'),
+                        'example_sentence_translation': DataCrawl._text(sub_block, 'span', 'trans dtrans dtrans-se hdb break-cj'),
+                    }
+                    phrase_index += 1
+                else:
+                    blocks[f'block{block_index}'] = {
+                        'word_class': word_class.text if word_class else 'N/A',
+                        'description': DataCrawl._text(sub_block, 'div', 'def ddef_d db'),
+                        'word_translation': DataCrawl._text(sub_block, 'span', 'dtrans'),
+                        'example_sentence': DataCrawl._text(sub_block, 'span', 'eg deg'),
+                        'example_sentence_translation': DataCrawl._text(sub_block, 'span', 'trans dtrans dtrans-se hdb break-cj'),
+                    }
+                    block_index += 1
+        return {headword: blocks}
+    return {}
+
+
+def measure(func, pages, repeat: int = 3) -> float:
+    """回傳每個頁面的平均解析毫秒數(取最佳一輪)。"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages.values():
+            func(html)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages) * 1000
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    pages = load_pages(argv[0]) if argv else synthetic_pages()
+    if not pages:
+        print("ఠ_ఠ? 找不到任何 *.html 頁面", file=sys.stderr)
+        return 1
+
+    legacy = measure(legacy_parse, pages)
+    print(f"{'legacy (html.parser)':<28}{legacy:8.2f} ms/頁")
+    for parser in ['html.parser', 'lxml']:
+        try:
+            current = measure(lambda html: DataCrawl('bench', parser=parser).parse(html), pages)
+        except Exception as error:  # 未安裝的解析器
+            print(f"{'DataCrawl.parse (' + parser + ')':<28}略過：{error}")
+            continue
+        print(f"{'DataCrawl.parse (' + parser + ')':<28}{current:8.2f} ms/頁  (-{(1 - current / legacy) * 100:.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
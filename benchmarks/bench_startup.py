@@ -0,0 +1,67 @@
+"""
+冷啟動時間基準測試。
+
+每個項目以新的 Python 行程執行數次，回傳從啟動行程到結束的牆鐘時間(毫秒)：
+    - 直譯器本身(python -c pass)，作為基準
+    - 匯入服務層(service.py)，不需顯示環境
+    - 匯入服務層並載入爬蟲相依套件(requests、bs4)，即延遲匯入前的成本
+    - 命令列工具(bulk_import.py --help；python -m cli export，含建立資料庫)
+    - 視窗程式(app.py --exit-after-startup)，建立所有元件並完成第一次繪製後結束；沒有顯示環境時略過
+
+使用方式：
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 20
+"""
+import argparse, os, statistics, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def targets(db: str):
+    """(名稱, 指令) 的列表。"""
+    python = sys.executable
+    return [
+        ("python -c pass", [python, "-c", "pass"]),
+        ("import service", [python, "-c", "import service"]),
+        ("import service + requests/bs4", [python, "-c", "import service, requests, bs4"]),
+        ("bulk_import.py --help", [python, os.path.join(ROOT, "bulk_import.py"), "--help"]),
+        ("python -m cli export", [python, "-m", "cli", "--db", db, "export"]),
+        ("app.py (GUI)", [python, os.path.join(ROOT, "app.py"), "--exit-after-startup", "--db", db]),
+    ]
+
+
+def measure(command, repeat: int, cwd: str):
+    """回傳每次執行的毫秒數列表，執行失敗時返回 (None, 錯誤訊息)。"""
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        if completed.returncode != 0:
+            return None, completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"exit {completed.returncode}"
+        times.append(elapsed)
+    return times, None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="冷啟動時間基準測試")
+    parser.add_argument('--repeat', type=int, default=10, help="每個項目執行的次數")
+    args = parser.parse_args(argv)
+
+    # 在暫存目錄執行，視窗程式使用暫存資料庫，不影響正式資料
+    workdir = tempfile.mkdtemp()
+    db = os.path.join(workdir, "startup.db")
+
+    print(f"{'項目':<34}{'中位數':>10}{'最佳':>10}")
+    for name, command in targets(db):
+        times, error = measure(command, args.repeat, workdir)
+        if times is None:
+            print(f"{name:<34}略過：{error}")
+            continue
+        print(f"{name:<34}{statistics.median(times):8.1f} ms{min(times):8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+基準測試用的字典頁面語料。
+
+可讀取實際存下的劍橋字典頁面(*.html)，或產生結構相同的模擬頁面，讓基準測試不需連網也能重現。
+"""
+import glob, os
+from typing import Dict
+
+
+# 頁面中與詞條無關的部分(導覽列、廣告、腳本)，用來模擬真實頁面的大小
+_PAGE_NOISE = "".join(
+    f'<div class="hfl-s lt2b lmt-10 lmb-25 lp-s_r-20"><a href="/zht/browse/{i}">link {i}</a>'
+    f'<script>var ad{i} = {{"slot": {i}, "sizes": [[300, 250]]}};</script></div>'
+    for i in range(400)
+)
+
+
+def make_page(word: str, senses: int = 10, phrases: int = 5) -> str:
+    """
+    產生模擬的劍橋字典頁面。
+
+    :param word: 單字。
+    :param senses: 單字解釋數量。
+    :param phrases: 片語數量。
+    :return: HTML 字串。
+    """
+    sense_html = "".join(
+        '<div class="def-block ddef_block">'
+        f'<div class="def ddef_d db">meaning {i} of {word}</div>'
+        f'<span class="trans dtrans dtrans-se break-cj">解釋{i}</span>'
+        f'<span class="eg deg">An example of {word} number {i}.</span>'
+        f'<span class="trans dtrans dtrans-se hdb break-cj">{word} 的第{i}個例句。</span>'
+        '</div>'
+        for i in range(senses)
+    )
+    phrase_html = "".join(
+        '<div class="pr phrase-block dphrase-block lmb-25">'
+        f'<span class="phrase-title dphrase-title">{word} phrase {i}</span>'
+        '<div class="def-block ddef_block">'
+        f'<div class="def ddef_d db">phrase meaning {i}</div>'
+        f'<span class="eg deg">They used {word} phrase {i}.</span>'
+        f'<span class="trans dtrans dtrans-se hdb break-cj">片語例句{i}。</span>'
+        '</div></div>'
+        for i in range(phrases)
+    )
+    entry = (
+        '<div class="pr entry-body__el"><div class="pos-header dpos-h">'
+        f'<span class="hw dhw">{word}</span><span class="pos dpos">verb</span></div>'
+        f'{sense_html}{phrase_html}</div>'
+    )
+    return f"<html><head><title>{word}</title></head><body>{_PAGE_NOISE}{entry}{_PAGE_NOISE}</body></html>"
+
+
+def load_pages(directory: str) -> Dict[str, str]:
+    """
+    讀取目錄下存下的頁面，檔名(不含副檔名)為單字。
+
+    :param directory: 頁面目錄。
+    :return: {單字: HTML 字串}。
+    """
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    return pages
+
+
+def synthetic_pages(count: int = 20, senses: int = 10, phrases: int = 5) -> Dict[str, str]:
+    """
+    產生多個模擬頁面。
+
+    :param count: 頁面數量。
+    :return: {單字: HTML 字串}。
+    """
+    return {f"word{i}": make_page(f"word{i}", senses, phrases) for i in range(count)}
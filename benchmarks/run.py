@@ -0,0 +1,261 @@
+"""
+基準測試套件：以固定的資料、不連網的方式量測主要路徑，並與記錄下來的基準值比較。
+
+項目(數值皆為每次操作的毫秒數，取多輪的中位數)：
+    parse/crawl            DataCrawl.crawl 解析語料頁面，網路以假的 Session 取代
+    order/1000             DataCrawl.bubble_sort_phrases 整理 1000 個區塊的單字
+    words/<N>/insert       WordDatas.insert_word，資料表已有 N 個單字(N 預設為 1k、10k、100k)
+    words/<N>/search       WordDatas.search_data
+    words/<N>/update       WordDatas.update_word
+    words/<N>/delete       WordDatas.delete_word
+    words/<N>/select_all   WordDatas.select_all
+    article/insert         ArticleData.insert_article，附 5 MB 圖片
+    article/search         ArticleData.search_article(不含圖片)
+    article/search_picture ArticleData.search_article(include_picture=True)
+    article/delete         ArticleData.delete_article
+    decode/json            show_info_window 使用的 description 解碼(WordDatas.load_description)
+    decode/repr            同上，尚未升級的舊版 repr 資料
+
+使用方式：
+    python benchmarks/run.py --save                   # 執行並寫入 benchmarks/baselines.json
+    python benchmarks/run.py                          # 執行並與基準值比較
+    python benchmarks/run.py --check --threshold 0.5  # 任一項目比基準值慢 50% 以上時以狀態碼 1 結束
+    python benchmarks/run.py --sizes 1000 10000 --filter words
+    python benchmarks/run.py --pages saved_pages/     # 使用存下的 *.html 頁面
+
+baselines.json 記錄參考機器上的基準值(環境見檔案中的 meta)；基準值與機器有關，
+在其他機器上請先以 --save 重新記錄(例如在修改前的版本)，再以 --check 比較。
+不到 1 毫秒的項目容易受雜訊影響，變慢的幅度同時超過比例門檻與 --noise-floor 才算退步。
+超過門檻的項目會再量測一次，兩次都變慢才算退步；報告與儲存的是重新量測的中位數。
+"""
+import argparse, json, os, platform, random, shutil, sqlite3, statistics, sys, tempfile, time
+from typing import Dict, Optional
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib import ArticleData, DataCrawl, WordDatas, db_connections
+from corpus import load_pages, synthetic_pages
+from bench_models import make_details
+from bench_order import make_entry
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+OPERATIONS = 1000       # 每輪資料庫操作的次數
+ARTICLE_OPERATIONS = 5  # 每輪文章操作的次數
+
+
+class FakeResponse:
+    """與 requests.Response 相同介面的最小回應物件。"""
+    status_code = 200
+    headers = {}
+
+    def __init__(self, text: str):
+        self.text = text
+        self.content = text.encode('utf-8')
+
+
+class FakeSession:
+    """依網址最後一段回傳語料頁面，取代網路。"""
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, headers=None, timeout=None):
+        return FakeResponse(self.pages[url.rsplit('/', 1)[-1]])
+
+
+def median_of(func, repeat: int, operations: int = 1) -> float:
+    """執行 func 多輪，回傳各輪每次操作毫秒數的中位數。"""
+    samples = []
+    for round_index in range(repeat):
+        start = time.perf_counter()
+        func(round_index)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) / operations * 1000
+
+
+def size_label(size: int) -> str:
+    return f"{size // 1000}k" if size % 1000 == 0 else str(size)
+
+
+def bench_parse(pages, repeat: int):
+    session = FakeSession(pages)
+
+    def run(_):
+        for word in pages:
+            DataCrawl(word, session=session).crawl()
+
+    yield "parse/crawl", median_of(run, repeat, len(pages))
+
+
+def bench_order(repeat: int):
+    # 每輪 200 個區塊(約 30 毫秒)，避免過短的量測受排程雜訊影響
+    entries = [[make_entry(1000) for _ in range(200)] for _ in range(repeat)]
+    yield "order/1000", median_of(lambda index: [DataCrawl.bubble_sort_phrases(entry, 'run') for entry in entries[index]],
+                                  repeat, 200)
+
+
+def bench_words(size: int, repeat: int, workdir: str):
+    db = os.path.join(workdir, f"words_{size}.db")
+    WordDatas.init_db(db)
+    details = make_details(0)
+    WordDatas.bulk_insert(db, ((f"word{index:06d}", details) for index in range(size)))
+
+    rng = random.Random(size)
+    existing = [f"word{rng.randrange(size):06d}" for _ in range(OPERATIONS)]
+    timings = {name: [] for name in ('insert', 'search', 'update', 'delete', 'select_all')}
+
+    def timed(name, func):
+        start = time.perf_counter()
+        func()
+        timings[name].append((time.perf_counter() - start) / (1 if name == 'select_all' else OPERATIONS) * 1000)
+
+    for round_index in range(repeat):
+        new_words = [f"new{round_index}_{index}" for index in range(OPERATIONS)]
+        timed('insert', lambda: [WordDatas.insert_word(db, {word: details}) for word in new_words])
+        timed('search', lambda: [WordDatas.search_data(db, word) for word in existing])
+        timed('update', lambda: [WordDatas.update_word(db, {'english_word': word, 'description': details})
+                                 for word in new_words])
+        timed('delete', lambda: [WordDatas.delete_word(db, word) for word in new_words])
+        timed('select_all', lambda: WordDatas.select_all(db))
+
+    db_connections.close(db)
+    for name, values in timings.items():
+        yield f"words/{size_label(size)}/{name}", statistics.median(values)
+
+
+def bench_article(repeat: int, workdir: str, picture_size: int = 5 * 1024 * 1024):
+    db = os.path.join(workdir, "article.db")
+    ArticleData.initialize_database(db)
+    picture = random.Random(0).randbytes(picture_size)
+    timings = {name: [] for name in ('insert', 'search', 'search_picture', 'delete')}
+
+    def timed(name, func):
+        start = time.perf_counter()
+        results = [func(source) for source in sources]
+        timings[name].append((time.perf_counter() - start) / ARTICLE_OPERATIONS * 1000)
+        return results
+
+    for round_index in range(repeat):
+        sources = [f"article{round_index}_{index}" for index in range(ARTICLE_OPERATIONS)]
+        # 每篇圖片內容不同，避免以雜湊去除重複後跳過寫入
+        articles = {source: {'article_source': source, 'article_content': "content " * 2000,
+                             'content_translation': "翻譯" * 2000,
+                             'content_picture': picture[:-16] + (round_index * ARTICLE_OPERATIONS + index).to_bytes(16, 'big')}
+                    for index, source in enumerate(sources)}
+        timed('insert', lambda source: ArticleData.insert_article(db, articles[source]))
+        timed('search', lambda source: ArticleData.search_article(db, source))
+        found = timed('search_picture', lambda source: ArticleData.search_article(db, source, include_picture=True))
+        assert all(len(article['content_picture']) == picture_size for article in found)
+        timed('delete', lambda source: ArticleData.delete_article(db, source))
+
+    db_connections.close(db)
+    for name, values in timings.items():
+        yield f"article/{name}", statistics.median(values)
+
+
+def bench_decode(repeat: int, count: int = 2000):
+    json_descriptions = [WordDatas.dump_description(make_details(index)) for index in range(count)]
+    repr_descriptions = [repr(make_details(index)) for index in range(count)]
+    yield "decode/json", median_of(lambda _: [WordDatas.load_description(text) for text in json_descriptions], repeat, count)
+    yield "decode/repr", median_of(lambda _: [WordDatas.load_description(text) for text in repr_descriptions], repeat, count)
+
+
+def run_all(args):
+    """依序執行所有符合 --filter 的項目，產生 (名稱, 毫秒)。"""
+    workdir = tempfile.mkdtemp(prefix="bench_")
+    pages = load_pages(args.pages) if args.pages else synthetic_pages()
+    groups = [("parse", lambda: bench_parse(pages, args.repeat)),
+              ("order", lambda: bench_order(args.repeat)),
+              *((f"words/{size_label(size)}", lambda size=size: bench_words(size, args.repeat, workdir)) for size in args.sizes),
+              ("article", lambda: bench_article(args.repeat, workdir)),
+              ("decode", lambda: bench_decode(args.repeat))]
+    try:
+        for prefix, bench in groups:
+            if args.filter and not any(prefix.startswith(name) or name.startswith(prefix) for name in args.filter):
+                continue
+            for name, value in bench():
+                if not args.filter or any(name.startswith(item) for item in args.filter):
+                    yield name, value
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def load_baselines(path: str) -> Dict[str, float]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('results', {})
+
+
+def save_baselines(path: str, results: Dict[str, float]) -> None:
+    # 只覆蓋本次執行的項目，保留其他項目的基準值
+    baselines = load_baselines(path)
+    baselines.update(results)
+    meta = {'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(), 'recorded_at': time.strftime('%Y-%m-%d')}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': dict(sorted(baselines.items()))}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def report(name: str, value: float, baseline: Optional[float], args) -> bool:
+    """印出一個項目與基準值的比較，返回是否視為變慢。"""
+    if baseline is None:
+        print(f"{name:<28}{value:9.4f} ms{'—':>12}")
+        return False
+    change = value / baseline - 1
+    regressed = change > args.threshold and value - baseline > args.noise_floor
+    print(f"{name:<28}{value:9.4f} ms{baseline:9.4f} ms{change * 100:+8.0f}%{'  ← 變慢' if regressed else ''}")
+    return regressed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="基準測試套件")
+    parser.add_argument('--repeat', type=int, default=7, help="每個項目執行的輪數")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help="WordDatas 測試的資料筆數")
+    parser.add_argument('--filter', nargs='+', help="只執行名稱以此開頭的項目，例如 words/1k article")
+    parser.add_argument('--pages', help="存下的 *.html 頁面目錄，未提供時使用模擬頁面")
+    parser.add_argument('--baselines', default=BASELINES, help="基準值檔案路徑")
+    parser.add_argument('--save', action='store_true', help="將結果寫入基準值檔案")
+    parser.add_argument('--check', action='store_true', help="有項目變慢超過門檻時以狀態碼 1 結束")
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help="允許變慢的比例(0.5 表示 50%%)；單核心或共用的虛擬機器上，執行間的差異可達 30%%")
+    parser.add_argument('--noise-floor', type=float, default=0.1,
+                        help="允許變慢的絕對毫秒數，避免極短的項目因雜訊被判定為退步")
+    args = parser.parse_args(argv)
+
+    baselines = load_baselines(args.baselines)
+    if not baselines and not args.save:
+        print(f"ఠ_ఠ? 尚未記錄基準值({args.baselines})，請先在這台機器上以 --save 記錄", file=sys.stderr)
+
+    results, regressions = {}, []
+    print(f"{'項目':<28}{'目前':>12}{'基準':>12}{'變化':>9}")
+    for name, value in run_all(args):
+        results[name] = value
+        if report(name, value, baselines.get(name), args):
+            regressions.append(name)
+
+    if regressions:
+        # 變慢的項目再量測一次，以新的中位數判斷，排除背景負載造成的單次偏差；
+        # 不取兩次中較快的一次，以免結果偏向通過
+        print("重新量測變慢的項目…")
+        retry = argparse.Namespace(**{**vars(args), 'filter': regressions})
+        confirmed = []
+        for name, value in run_all(retry):
+            if name not in regressions:
+                continue
+            results[name] = value
+            if report(name, results[name], baselines.get(name), args):
+                confirmed.append(name)
+        regressions = confirmed
+
+    if args.save:
+        save_baselines(args.baselines, results)
+        print(f"٩(⚙ᴗ⚙)۶ 已寫入基準值：{args.baselines}")
+    if args.check and regressions:
+        print(f"ఠ_ఠ? {len(regressions)} 個項目比基準值慢 {args.threshold * 100:.0f}% 以上：{', '.join(regressions)}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+單字批次匯入工具。
+
+支援以下輸入：
+    - 舊版 DataCrawl.crawl 產生的 output.json(縮排 JSON 物件串接)或 JSONL 檔
+    - CrawlLog 爬蟲輸出紀錄(含輪替與 gzip 壓縮檔)
+    - 每行一個單字的單字清單，同時爬取後寫入
+    - 離線快照存放區，不連網重新解析後寫入
+
+使用方式：
+    python bulk_import.py output.json
+    python bulk_import.py --crawl-log crawl_log.jsonl
+    python bulk_import.py --words words.txt --snapshots snapshots/
+    python bulk_import.py --replay snapshots/
+"""
+import argparse, json, sys
+from typing import Iterator, Tuple, Optional
+from lib import WordDatas, BatchCrawler, SnapshotStore, CrawlLog
+
+
+def iter_crawl_output(path: str, buffer_size: int = 1 << 16) -> Iterator[Tuple[str, dict]]:
+    """
+    串流讀取爬蟲輸出檔，逐筆產生 (單字, 區塊字典)。
+
+    同時支援每行一筆的 JSONL 與 output.json 的多行縮排格式；
+    CrawlLog 格式({"word", "crawled_at", "description"})的紀錄也可讀取。
+
+    :param path: 輸出檔路徑。
+    :param buffer_size: 每次讀取的字元數。
+    :return: (單字, 區塊字典) 的迭代器。
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    with open(path, 'r', encoding='utf-8') as f:
+        eof = False
+        while True:
+            buffer = buffer.lstrip()
+            if not buffer:
+                if eof:
+                    return
+                buffer = f.read(buffer_size)
+                eof = not buffer
+                continue
+
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                # 物件尚未讀完整，繼續讀取
+                if eof:
+                    raise
+                more = f.read(buffer_size)
+                eof = not more
+                buffer += more
+                continue
+
+            buffer = buffer[end:]
+            if isinstance(obj.get('description'), dict) and 'word' in obj:
+                yield obj['word'], obj['description']
+                continue
+            for word, details in obj.items():
+                yield word, details
+
+
+def iter_word_list(path: str) -> Iterator[str]:
+    """
+    逐行讀取單字清單，略過空行與 # 開頭的註解。
+
+    :param path: 單字清單路徑，傳入 "-" 時讀取標準輸入。
+    :return: 單字的迭代器。
+    """
+    f = sys.stdin if path == "-" else open(path, 'r', encoding='utf-8')
+    try:
+        for line in f:
+            word = line.strip().lower()
+            if word and not word.startswith('#'):
+                yield word
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def crawl_words(words, max_workers: int = 8, rate_limit: float = 5.0,
+                snapshot_store: Optional[SnapshotStore] = None) -> Iterator[Tuple[str, dict]]:
+    """
+    同時爬取多個單字，產生 (單字, 區塊字典)，查無資料的單字輸出至標準錯誤。
+
+    :param words: 單字的可迭代物件。
+    :param max_workers: 同時進行的請求數上限。
+    :param rate_limit: 每秒最多請求數。
+    :param snapshot_store: 離線快照存放區，提供時保存下載的頁面。
+    :return: (單字, 區塊字典) 的迭代器。
+    """
+    crawler = BatchCrawler(max_workers=max_workers, rate_limit=rate_limit, snapshot_store=snapshot_store)
+    yield from _successful(crawler.crawl(words))
+
+
+def replay_snapshots(snapshot_store: SnapshotStore) -> Iterator[Tuple[str, dict]]:
+    """
+    不連網重新解析離線快照，產生 (單字, 區塊字典)。
+
+    :param snapshot_store: 離線快照存放區。
+    :return: (單字, 區塊字典) 的迭代器。
+    """
+    yield from _successful(snapshot_store.replay())
+
+
+def _successful(results) -> Iterator[Tuple[str, dict]]:
+    # 略過失敗的查詢並輸出訊息至標準錯誤
+    for _, data in results:
+        if isinstance(data, list):
+            print(data[1], file=sys.stderr)
+            continue
+        yield from data.items()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="批次匯入單字到 Word 資料表")
+    parser.add_argument('source', help="output.json / JSONL 檔案；搭配 --words 時為單字清單(- 為標準輸入)；"
+                                       "搭配 --replay 時為快照目錄；搭配 --crawl-log 時為爬蟲輸出紀錄")
+    parser.add_argument('--words', action='store_true', help="來源為單字清單，爬取後匯入")
+    parser.add_argument('--replay', action='store_true', help="來源為離線快照目錄，不連網重新解析後匯入")
+    parser.add_argument('--crawl-log', action='store_true', help="來源為 CrawlLog 紀錄檔，連同輪替檔由舊到新匯入")
+    parser.add_argument('--snapshots', help="--words 模式保存頁面的離線快照目錄")
+    parser.add_argument('--db', default="word_traslation.db", help="資料庫路徑")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="每個交易寫入的筆數")
+    parser.add_argument('--workers', type=int, default=8, help="--words 模式同時爬取的數量")
+    parser.add_argument('--rate', type=float, default=5.0, help="--words 模式每秒最多請求數")
+    args = parser.parse_args(argv)
+
+    result = WordDatas.init_db(args.db)
+    if result is not None:
+        print(result[1], file=sys.stderr)
+        return 1
+
+    if args.replay:
+        items = replay_snapshots(SnapshotStore(args.source))
+    elif args.crawl_log:
+        items = CrawlLog.read(args.source)
+    elif args.words:
+        snapshot_store = SnapshotStore(args.snapshots) if args.snapshots else None
+        items = crawl_words(iter_word_list(args.source), args.workers, args.rate, snapshot_store)
+    else:
+        items = iter_crawl_output(args.source)
+
+    result = WordDatas.bulk_insert(args.db, items, chunk_size=args.chunk_size)
+    print(result[1], file=sys.stderr if result[0] == "Error" else sys.stdout)
+    return 0 if result[0] == "Success" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
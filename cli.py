@@ -0,0 +1,267 @@
+"""
+單字查詢命令列工具，結果以每行一筆 JSON(NDJSON)輸出至標準輸出，方便接在 shell 管線或排程工作中使用。
+
+子指令：
+    lookup   查詢一個或多個單字(記憶體 → 資料庫 → 網路)，查到的新單字存入資料庫
+    batch    從檔案或標準輸入讀取單字清單，資料庫已有的直接輸出，其餘同時爬取並分批寫入資料庫
+    export   依字母順序匯出整個 Word 資料表
+    analyze  分析文章(檔案、標準輸入或已存入的文章)中的單字，列出未收錄的單字，加上 --crawl 時批次爬取
+
+加上 --offline 時只使用本機資料庫，不連網。
+
+使用方式：
+    python -m cli lookup apple
+    python -m cli batch words.txt --workers 8 --rate 5 > result.ndjson
+    cat words.txt | python -m cli --offline batch -
+    python -m cli export > words.ndjson
+    python -m cli analyze article.txt --crawl --min-count 2
+"""
+import argparse, json, queue, sys, threading
+from typing import Dict, Iterable, Iterator, List, Union
+from lib import ArticleAnalyzer, ArticleData, BatchCrawler, CrawlLog, DataCrawl
+from service import WordService
+from bulk_import import iter_word_list
+from tracing import tracer
+
+
+def to_records(query: str, data: Union[Dict[str, dict], List[str]]) -> Iterator[dict]:
+    """
+    將查詢結果轉成輸出用的字典。
+
+    :param query: 使用者查詢的單字。
+    :param data: WordService.lookup 或 BatchCrawler.crawl 的結果。
+    :return: 成功時每個單字一筆 {query, english_word, description}，失敗時一筆 {query, error}。
+    """
+    if isinstance(data, list):
+        yield {'query': query, 'error': data[1]}
+        return
+    for word, details in data.items():
+        yield {'query': query, 'english_word': word, 'description': details}
+
+
+def lookup_words(service: WordService, words: Iterable[str], offline: bool = False,
+                 force: bool = False) -> Iterator[dict]:
+    """
+    依序查詢單字。
+
+    :param service: 單字服務。
+    :param words: 單字的可迭代物件。
+    :param offline: 為 True 時不連網。
+    :param force: 為 True 時略過拼字檢查。
+    :return: 輸出字典的迭代器；連線錯誤或上游錯誤狀態輸出為該單字的 error，不中斷其他單字。
+    """
+    from requests import RequestException
+
+    for word in words:
+        try:
+            data = service.lookup(word, offline=offline, force=force)
+        except RequestException as error:
+            data = ["Error", f"ఠ_ఠ? 查詢 '{word}' 時發生錯誤：{error}"]
+        yield from to_records(word, data)
+
+
+def batch_lookup(service: WordService, words: Iterable[str], offline: bool = False,
+                 max_workers: int = 8, rate_limit: float = 5.0) -> Iterator[dict]:
+    """
+    批次查詢單字：資料庫已有的立即輸出，其餘交給 BatchCrawler 同時爬取並寫入資料庫。
+
+    讀取輸入與爬蟲各在一個背景執行緒執行，資料庫命中與爬取結果都在取得後立即輸出，
+    不必等到下一個輸入單字；輸出順序為完成順序，與輸入順序不一定相同。
+
+    :param service: 單字服務。
+    :param words: 單字的可迭代物件，可為產生器(例如標準輸入)。
+    :param offline: 為 True 時不連網，資料庫沒有的單字輸出錯誤。
+    :param max_workers: 同時進行的請求數上限。
+    :param rate_limit: 每秒最多請求數。
+    :return: 輸出字典的迭代器。
+    """
+    if offline:
+        yield from lookup_words(service, words, offline=True)
+        return
+
+    pending = queue.Queue()  # 資料庫沒有、等待爬取的單字，None 表示輸入結束
+    results = queue.Queue()  # 輸出字典，例外物件表示執行緒失敗，None 表示一個執行緒結束
+
+    def read():
+        try:
+            for word in words:
+                data = service.lookup(word, offline=True)
+                if isinstance(data, dict):
+                    for record in to_records(word, data):
+                        results.put(record)
+                else:
+                    pending.put(word)
+        except Exception as error:
+            results.put(error)
+        finally:
+            pending.put(None)
+            results.put(None)
+
+    def misses():
+        # 等待新單字時定期產生 IDLE，讓爬蟲先輸出已完成的結果
+        while True:
+            try:
+                word = pending.get(timeout=0.05)
+            except queue.Empty:
+                yield BatchCrawler.IDLE
+                continue
+            if word is None:
+                return
+            yield word
+
+    def crawl():
+        try:
+            crawler = BatchCrawler(db=service.db, max_workers=max_workers, rate_limit=rate_limit)
+            for word, data in crawler.crawl(misses()):
+                for record in to_records(word, data):
+                    results.put(record)
+        except Exception as error:
+            results.put(error)
+        finally:
+            results.put(None)
+
+    threading.Thread(target=read, name="batch-read", daemon=True).start()
+    threading.Thread(target=crawl, name="batch-crawl", daemon=True).start()
+    running = 2
+    while running:
+        item = results.get()
+        if item is None:
+            running -= 1
+        elif isinstance(item, Exception):
+            raise item
+        else:
+            yield item
+
+
+def export_words(service: WordService) -> Iterator[dict]:
+    """
+    匯出整個 Word 資料表。
+
+    :param service: 單字服務。
+    :return: 輸出字典的迭代器。
+    """
+    return service.export()
+
+
+def analyze_article(service: WordService, text: str, source: str, crawl: bool = False, min_count: int = 1,
+                    max_workers: int = 8, rate_limit: float = 5.0) -> Iterator[dict]:
+    """
+    分析文章單字，先輸出一筆統計，加上 crawl 時接著輸出未收錄單字的爬取結果。
+
+    :param service: 單字服務。
+    :param text: 文章內容。
+    :param source: 文章來源名稱，寫在統計紀錄中。
+    :param crawl: 是否批次爬取未收錄的單字。
+    :param min_count: 出現次數少於此值的單字不爬取。
+    :param max_workers: 同時進行的請求數上限。
+    :param rate_limit: 每秒最多請求數。
+    :return: 輸出字典的迭代器。
+    """
+    analyzer = ArticleAnalyzer(service.db)
+    result = analyzer.analyze(text)
+    yield {'source': source, 'tokens': result['tokens'], 'distinct': result['distinct'],
+           'known': len(result['known']), 'forms': result['forms'], 'unknown': result['unknown']}
+    if crawl:
+        for word, data in analyzer.crawl_unknown(result, min_count, max_workers=max_workers, rate_limit=rate_limit):
+            yield from to_records(word, data)
+
+
+def write_records(records: Iterable[dict], out=None) -> int:
+    """
+    以 NDJSON 格式輸出。
+
+    :param records: 輸出字典的可迭代物件。
+    :param out: 輸出檔案物件，預設為標準輸出。
+    :return: 失敗(含 error 欄位)的筆數。
+    """
+    out = out or sys.stdout
+    errors = 0
+    for record in records:
+        if 'error' in record:
+            errors += 1
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    out.flush()
+    return errors
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="單字查詢命令列工具(NDJSON 輸出)")
+    parser.add_argument('--db', default="word_traslation.db", help="資料庫路徑")
+    parser.add_argument('--offline', action='store_true', help="只使用本機資料庫，不連網")
+    parser.add_argument('--crawl-log', help="將爬取結果另外寫入此 JSONL 紀錄檔(可輪替壓縮)")
+    parser.add_argument('--word-list', help="啟用拼字建議並使用此單字清單，可能拼錯的字不連網即輸出建議")
+    parser.add_argument('--force', action='store_true', help="略過拼字檢查，單字清單沒有收錄的字仍連網查詢")
+    parser.add_argument('--trace', action='store_true', help="計時查詢流程的各個階段，結束時將統計印至標準錯誤")
+    parser.add_argument('--trace-file', help="搭配 --trace，將每次查詢的計時紀錄匯出至此 JSONL 檔")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    lookup_parser = commands.add_parser('lookup', help="查詢一個或多個單字")
+    lookup_parser.add_argument('words', nargs='+', help="要查詢的單字")
+
+    batch_parser = commands.add_parser('batch', help="批次查詢單字清單")
+    batch_parser.add_argument('source', nargs='?', default='-', help="每行一個單字的檔案，- 或省略為標準輸入")
+    batch_parser.add_argument('--workers', type=int, default=8, help="同時爬取的數量")
+    batch_parser.add_argument('--rate', type=float, default=5.0, help="每秒最多請求數")
+
+    commands.add_parser('export', help="匯出 Word 資料表")
+
+    analyze_parser = commands.add_parser('analyze', help="分析文章中的單字")
+    analyze_parser.add_argument('source', nargs='?', default='-', help="文章檔案，- 或省略為標準輸入")
+    analyze_parser.add_argument('--article', action='store_true', help="source 為已存入資料庫的文章來源")
+    analyze_parser.add_argument('--crawl', action='store_true', help="批次爬取未收錄的單字並存入資料庫")
+    analyze_parser.add_argument('--min-count', type=int, default=1, help="出現次數少於此值的單字不爬取")
+    analyze_parser.add_argument('--workers', type=int, default=8, help="同時爬取的數量")
+    analyze_parser.add_argument('--rate', type=float, default=5.0, help="每秒最多請求數")
+    args = parser.parse_args(argv)
+
+    service = WordService(args.db)
+    if args.trace:
+        tracer.enable()
+    if args.crawl_log:
+        DataCrawl.crawl_log = CrawlLog(args.crawl_log)
+    result = service.init()
+    if result is not None:
+        print(result[1], file=sys.stderr)
+        return 1
+
+    if args.word_list:
+        service.enable_spelling(args.word_list)
+
+    if args.command == 'lookup':
+        records = lookup_words(service, [word.strip().lower() for word in args.words], args.offline, args.force)
+    elif args.command == 'batch':
+        records = batch_lookup(service, iter_word_list(args.source), args.offline, args.workers, args.rate)
+    elif args.command == 'analyze':
+        if args.article:
+            article = ArticleData.search_article(args.db, args.source)
+            if not isinstance(article, dict):
+                print(f"ఠ_ఠ? 找不到文章 {args.source}", file=sys.stderr)
+                return 1
+            text = article['article_content']
+        elif args.source == '-':
+            text = sys.stdin.read()
+        else:
+            with open(args.source, 'r', encoding='utf-8') as f:
+                text = f.read()
+        records = analyze_article(service, text, args.source, args.crawl and not args.offline,
+                                  args.min_count, args.workers, args.rate)
+    else:
+        records = export_words(service)
+
+    try:
+        errors = write_records(records)
+    except BrokenPipeError:
+        # 下游程式(例如 head)提前結束
+        return 0
+    finally:
+        if DataCrawl.crawl_log is not None:
+            DataCrawl.crawl_log.close()
+        if args.trace:
+            print(tracer.report(), file=sys.stderr)
+            if args.trace_file:
+                tracer.export(args.trace_file)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
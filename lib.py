@@ -1,6 +1,100 @@
-import os, sqlite3, requests, json
-from typing import List, Union, Optional, Dict
-from bs4 import BeautifulSoup
+import os, re, sqlite3, json, time, threading, ast, hashlib, gzip, queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from importlib.util import find_spec
+from urllib.parse import urlparse
+from typing import List, Union, Optional, Dict, Iterable, Tuple, Callable
+from tracing import tracer
+
+# requests 與 bs4 載入成本高，只在實際爬取或解析時才匯入，
+# 單純的資料庫操作(批次工作、服務層)不需負擔這些相依套件
+_DEFAULT_PARSER = 'lxml' if find_spec('lxml') else 'html.parser'  # 有安裝 lxml 時改用 C 實作的解析器
+
+
+
+class ConnectionManager:
+    """
+    ConnectionManager 類別負責管理長期保留的 SQLite 連線。
+
+    每個執行緒對每個資料庫各持有一條連線，第一次取用時建立並套用 PRAGMA 設定，
+    之後重複使用，省去每次操作開關連線的成本。
+    """
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL;",        # 讀寫互不阻塞
+        "PRAGMA synchronous = NORMAL;",      # WAL 模式下兼顧安全與寫入速度
+        "PRAGMA cache_size = -16000;",       # 約 16MB 頁面快取
+        "PRAGMA mmap_size = 134217728;",     # 128MB 記憶體映射讀取
+        "PRAGMA busy_timeout = 5000;",       # 鎖定時最多等待 5 秒
+        "PRAGMA foreign_keys = ON;",         # 刪除單字時連帶刪除解釋與例句
+    )
+
+    def __init__(self):
+        self._connections = {}  # (執行緒 ID, 資料庫路徑) -> 連線
+        self._lock = threading.Lock()
+
+
+    def get(self, db: str) -> sqlite3.Connection:
+        """
+        取得目前執行緒對指定資料庫的連線，不存在時建立。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :return: 已設定 row_factory 與 PRAGMA 的連線。
+        """
+        key = (threading.get_ident(), db)
+        conn = self._connections.get(key)
+        if conn is not None:
+            return conn
+
+        conn = sqlite3.connect(db, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+
+        with self._lock:
+            self._prune()
+            self._connections[key] = conn
+        return conn
+
+
+    def close(self, db: Optional[str] = None) -> None:
+        """
+        關閉目前執行緒的連線。
+
+        :param db: 指定要關閉的資料庫，未指定時關閉目前執行緒的全部連線。
+        """
+        ident = threading.get_ident()
+        with self._lock:
+            for key in [key for key in self._connections if key[0] == ident and db in (None, key[1])]:
+                self._connections.pop(key).close()
+
+
+    def close_all(self) -> None:
+        """
+        關閉所有執行緒的連線，供程式結束時呼叫。
+        """
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+
+
+    def _prune(self) -> None:
+        # 關閉已結束執行緒遺留的連線
+        alive = {thread.ident for thread in threading.enumerate()}
+        for key in [key for key in self._connections if key[0] not in alive]:
+            self._connections.pop(key).close()
+
+
+# 全域共用的連線管理器
+db_connections = ConnectionManager()
+
+
+# 中日韓文字範圍；全文檢索時逐字切開，讓中文翻譯可用任意連續字詞查詢
+_CJK_RANGES = ((0x3400, 0x4dbf), (0x4e00, 0x9fff), (0xf900, 0xfaff))
+_CJK = "".join(f'{chr(start)}-{chr(end)}' for start, end in _CJK_RANGES)
+_CJK_CHAR_RE = re.compile(f'[{_CJK}]')
+_cjk_spacing = {}  # 字碼 -> 前後加空白的字，第一次使用時建立
+_SEARCH_TOKEN_RE = re.compile(f'[{_CJK}]+|[^\\s\\W{_CJK}]+')
 
 
 
@@ -9,30 +103,256 @@ class WordDatas:
     WordDatas 類別負責操作單字資料表的 CRUD 操作。
     """
 
+    SCHEMA_VERSION = 3  # 記錄於 PRAGMA user_version
+    MAX_VARIABLES = 900  # 每個語句的參數數量上限，低於 SQLite 3.32 之前的 999
+    spelling_indexes = {}  # 資料庫路徑 -> SpellingIndex，新增與刪除單字時同步更新
+
     @staticmethod
     def init_db(db: str) -> List[str]:
         """
-        初始化資料庫，建立必要的資料表。
+        初始化資料庫，建立必要的資料表，並將舊版資料庫升級到目前的結構。
+
+        資料表：
+            - Word：單字與 JSON 格式的完整內容(description)
+            - Sense：每個單字解釋與片語一列，供查詢使用
+            - Example：每個解釋的例句與例句翻譯
+            - SenseSearch：Sense / Example 的 FTS5 全文檢索索引
+            - WordAlias：變化形查詢字(例如 running)對應的字首單字
 
         :param db: 資料庫檔案的路徑，型態為字串(str)。
         :return: 狀態和訊息的列表，表示初始化結果。
         """
-        if not os.path.exists(db):
-            try:
-                conn = sqlite3.connect(db)
-                cur = conn.cursor()
-                cur.execute('''CREATE TABLE IF NOT EXISTS Word (
+        try:
+            conn = db_connections.get(db)
+            with conn:
+                conn.execute('''CREATE TABLE IF NOT EXISTS Word (
                                 ID INTEGER PRIMARY KEY AUTOINCREMENT,
                                 english_word TEXT NOT NULL UNIQUE,
-                                description TEXT NOT NULL
+                                description TEXT NOT NULL,
+                                crawled_at REAL,
+                                edited INTEGER NOT NULL DEFAULT 0
+                              );''')
+                conn.execute('''CREATE TABLE IF NOT EXISTS Sense (
+                                word_id INTEGER NOT NULL REFERENCES Word(ID) ON DELETE CASCADE,
+                                sense_key TEXT NOT NULL,
+                                position INTEGER NOT NULL,
+                                kind TEXT NOT NULL,
+                                word_class TEXT,
+                                phrase TEXT,
+                                description TEXT,
+                                word_translation TEXT,
+                                PRIMARY KEY (word_id, sense_key)
+                              );''')
+                conn.execute('''CREATE TABLE IF NOT EXISTS Example (
+                                word_id INTEGER NOT NULL,
+                                sense_key TEXT NOT NULL,
+                                sentence TEXT,
+                                translation TEXT,
+                                PRIMARY KEY (word_id, sense_key),
+                                FOREIGN KEY (word_id, sense_key) REFERENCES Sense(word_id, sense_key) ON DELETE CASCADE
+                              );''')
+                conn.execute('''CREATE TABLE IF NOT EXISTS WordAlias (
+                                query TEXT PRIMARY KEY,
+                                word_id INTEGER NOT NULL REFERENCES Word(ID) ON DELETE CASCADE
+                              );''')
+                conn.execute('''CREATE INDEX IF NOT EXISTS idx_sense_phrase ON Sense(phrase) WHERE phrase IS NOT NULL;''')
+                conn.execute('''CREATE INDEX IF NOT EXISTS idx_sense_word_class ON Sense(word_class);''')
+                # rowid 與 Sense 的 rowid 相同；中文欄位寫入前已逐字切開
+                conn.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS SenseSearch USING fts5(
+                                english_word, phrase, description, word_translation,
+                                example_sentence, example_sentence_translation,
+                                tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
                               );''')
-                conn.commit()
 
-            except sqlite3.Error as error:
-                return ["Error", f"ఠ_ఠ? 建立資料庫時發生錯誤：{error}"]
+                # 舊版資料庫補上爬取時間欄位；原有單字的爬取時間不明，記為 0，查詢時會在背景重新爬取
+                columns = [row[1] for row in conn.execute('''PRAGMA table_info(Word);''')]
+                if 'crawled_at' not in columns:
+                    conn.execute('''ALTER TABLE Word ADD COLUMN crawled_at REAL;''')
+                    conn.execute('''UPDATE Word SET crawled_at = 0;''')
+                # 補上手動修改標記；先前版本以 crawled_at 為 NULL 表示手動修改過
+                if 'edited' not in columns:
+                    conn.execute('''ALTER TABLE Word ADD COLUMN edited INTEGER NOT NULL DEFAULT 0;''')
+                    conn.execute('''UPDATE Word SET edited = 1, crawled_at = 0 WHERE crawled_at IS NULL;''')
+
+            version = conn.execute('''PRAGMA user_version;''').fetchone()[0]
+            if version < WordDatas.SCHEMA_VERSION:
+                WordDatas.migrate(db)
+
+        except (sqlite3.Error, ValueError, SyntaxError) as error:
+            return ["Error", f"ఠ_ఠ? 建立資料庫時發生錯誤：{error}"]
+
+
+
+    @staticmethod
+    def migrate(db: str, batch_size: int = 500) -> None:
+        """
+        將舊版以 Python repr 儲存的 description 轉為 JSON，並重建 Sense / Example / SenseSearch 資料表。
+
+        以 ast.literal_eval 解析舊資料，只接受字面值，不會執行任何程式碼。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param batch_size: 每個交易轉換的單字數量。
+        """
+        conn = db_connections.get(db)
+        last_id = 0
+        while True:
+            rows = conn.execute('''SELECT ID, english_word, description FROM Word WHERE ID > ? ORDER BY ID LIMIT ?;''',
+                                (last_id, batch_size)).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]['ID']
+
+            entries = [(row['ID'], row['english_word'], WordDatas.load_description(row['description'])) for row in rows]
+            with conn:
+                conn.executemany('''UPDATE Word SET description = ? WHERE ID = ?;''',
+                                 [(WordDatas.dump_description(details), word_id) for word_id, _, details in entries])
+                WordDatas._write_senses(conn, entries)
+
+        with conn:
+            conn.execute(f'''PRAGMA user_version = {WordDatas.SCHEMA_VERSION};''')
+
+
+
+    @staticmethod
+    def dump_description(details: Dict[str, Dict[str, str]]) -> str:
+        """
+        將單字內容轉為精簡的 JSON 字串。
+
+        :param details: {block1: {...}, phrase1: {...}} 形式的字典。
+        :return: JSON 字串。
+        """
+        return json.dumps(details, ensure_ascii=False, separators=(',', ':'))
+
 
-            finally:
-                conn.close()
+
+    @staticmethod
+    def load_description(description: str) -> Dict[str, Dict[str, str]]:
+        """
+        將 description 欄位還原為字典，取代直接 eval。
+
+        :param description: JSON 字串；尚未升級的舊資料為 Python repr 字串。
+        :return: {block1: {...}, phrase1: {...}} 形式的字典。
+        """
+        try:
+            return json.loads(description)
+        except json.JSONDecodeError:
+            # 舊版資料：僅解析字面值
+            return ast.literal_eval(description)
+
+
+
+    @staticmethod
+    def _write_senses(conn: sqlite3.Connection, entries: List[Tuple[int, str, Dict[str, Dict[str, str]]]]) -> None:
+        # 以新內容取代單字的 Sense / Example / SenseSearch 資料，需在交易中呼叫
+        def value(data, field):
+            text = data.get(field)
+            return None if text in (None, 'N/A') else text
+
+        senses, examples = [], []
+        for word_id, _, details in entries:
+            for position, (sense_key, data) in enumerate(details.items()):
+                if not isinstance(data, dict):
+                    continue
+                kind = 'phrase' if sense_key.startswith('phrase') else 'block'
+                senses.append((word_id, sense_key, position, kind, value(data, 'word_class'), value(data, 'phrase'),
+                               value(data, 'description'), value(data, 'word_translation')))
+                sentence, translation = value(data, 'example_sentence'), value(data, 'example_sentence_translation')
+                if sentence or translation:
+                    examples.append((word_id, sense_key, sentence, translation))
+
+        word_ids = [(word_id,) for word_id, _, _ in entries]
+        conn.executemany('''DELETE FROM SenseSearch WHERE rowid IN (SELECT rowid FROM Sense WHERE word_id = ?);''', word_ids)
+        conn.executemany('''DELETE FROM Sense WHERE word_id = ?;''', word_ids)
+        conn.executemany('''INSERT INTO Sense (word_id, sense_key, position, kind, word_class, phrase, description, word_translation)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?);''', senses)
+        conn.executemany('''INSERT INTO Example (word_id, sense_key, sentence, translation) VALUES (?, ?, ?, ?);''', examples)
+
+        # 依新的 Sense rowid 寫入全文檢索索引
+        if not entries:
+            return
+        words = {word_id: english_word for word_id, english_word, _ in entries}
+        example_map = {(word_id, sense_key): (sentence, translation) for word_id, sense_key, sentence, translation in examples}
+        rows = WordDatas._select_in(conn, '''SELECT rowid, word_id, sense_key, phrase, description, word_translation
+                                               FROM Sense WHERE word_id IN ({placeholders});''', list(words))
+        search_rows = []
+        for row in rows:
+            sentence, translation = example_map.get((row['word_id'], row['sense_key']), (None, None))
+            search_rows.append((row['rowid'], words[row['word_id']], row['phrase'], row['description'],
+                                WordDatas._split_cjk(row['word_translation']), sentence, WordDatas._split_cjk(translation)))
+        conn.executemany('''INSERT INTO SenseSearch (rowid, english_word, phrase, description, word_translation,
+                                                     example_sentence, example_sentence_translation)
+                            VALUES (?, ?, ?, ?, ?, ?, ?);''', search_rows)
+
+
+
+    @staticmethod
+    def _select_in(conn: sqlite3.Connection, query: str, values: List) -> List[sqlite3.Row]:
+        # 依 MAX_VARIABLES 分段執行含 IN ({placeholders}) 的查詢，避免超過 SQLite 3.32 之前 999 個參數的上限
+        rows = []
+        for start in range(0, len(values), WordDatas.MAX_VARIABLES):
+            part = values[start:start + WordDatas.MAX_VARIABLES]
+            rows.extend(conn.execute(query.format(placeholders=", ".join("?" * len(part))), part).fetchall())
+        return rows
+
+
+
+    @staticmethod
+    def _update_spelling(db: str, added: Iterable[str] = (), removed: Iterable[str] = ()) -> None:
+        # 同步更新該資料庫的拼字建議索引(未註冊時略過)
+        index = WordDatas.spelling_indexes.get(db)
+        if index is None:
+            return
+        for word in added:
+            index.add(word, SpellingIndex.DATABASE)
+        for word in removed:
+            index.remove(word, SpellingIndex.DATABASE)
+
+
+    @staticmethod
+    def _split_cjk(text: Optional[str]) -> Optional[str]:
+        # 中日韓文字前後加上空白，讓 unicode61 斷詞器逐字建立索引(str.translate 比 re.sub 快數倍)
+        if not text:
+            return text
+        if not _cjk_spacing:
+            _cjk_spacing.update({code: f' {chr(code)} ' for start, end in _CJK_RANGES for code in range(start, end + 1)})
+        return text.translate(_cjk_spacing)
+
+
+
+    @staticmethod
+    def search_text(db: str, query: str, limit: int = 20) -> List[Dict[str, Union[str, float]]]:
+        """
+        全文檢索單字、片語、描述、翻譯與例句，依相關度排序。
+
+        英文詞以前綴比對(例如 "run" 也會找到 "running")，中文詞需逐字連續出現。
+        所有符合的筆數都參與 bm25 排序，由 FTS5 的 ORDER BY rank LIMIT 只保留前 limit 筆。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param query: 查詢文字，可混合英文與中文。
+        :param limit: 最多回傳筆數。
+        :return: 結果字典的列表，包含 english_word、sense_key、kind、phrase、description、word_translation、score。
+        """
+        terms = []
+        for token in _SEARCH_TOKEN_RE.findall(query):
+            if _CJK_CHAR_RE.match(token):
+                terms.append('"' + " ".join(token) + '"')
+            else:
+                terms.append('"' + token.lower() + '"*')
+        if not terms:
+            return []
+
+        match = " ".join(terms)
+        conn = db_connections.get(db)
+        rows = conn.execute('''SELECT w.english_word, s.sense_key, s.kind, s.phrase, s.description, s.word_translation, ranked.score
+                              FROM (SELECT rowid, rank AS score
+                                    FROM SenseSearch
+                                    WHERE SenseSearch MATCH ? AND rank MATCH 'bm25(10.0, 5.0, 1.0, 3.0, 0.5, 0.5)'
+                                    ORDER BY rank
+                                    LIMIT ?) AS ranked
+                              JOIN Sense s ON s.rowid = ranked.rowid
+                              JOIN Word w ON w.ID = s.word_id
+                              ORDER BY ranked.score;''', (match, limit)).fetchall()
+        return [dict(row) for row in rows]
 
 
 
@@ -45,12 +365,9 @@ class WordDatas:
         :param english_word: 要查詢的英文單字名稱，型態為字串(str)。
         :return: 若存在則返回該單字的資料(sqlite3.Row)，否則返回 None。
         """
-        conn = sqlite3.connect(db)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        cur.execute('''SELECT * FROM Word WHERE english_word = ?;''', (word,))
-        result = cur.fetchone()
-        conn.close()
+        conn = db_connections.get(db)
+        with tracer.span('db_search'):
+            result = conn.execute('''SELECT * FROM Word WHERE english_word = ?;''', (word,)).fetchone()
 
         if result:
             return result
@@ -58,6 +375,65 @@ class WordDatas:
             return None
 
 
+    @staticmethod
+    def search_alias(db: str, query: str) -> Optional[sqlite3.Row]:
+        """
+        以變化形查詢字查詢對應的字首單字。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param query: 查詢字，型態為字串(str)。
+        :return: 若有記錄則返回字首單字的資料(sqlite3.Row)，否則返回 None。
+        """
+        conn = db_connections.get(db)
+        with tracer.span('db_search'):
+            return conn.execute('''SELECT w.* FROM WordAlias a JOIN Word w ON w.ID = a.word_id
+                                    WHERE a.query = ?;''', (query,)).fetchone()
+
+
+
+    @staticmethod
+    def search_many(db: str, words: Iterable[str]) -> Dict[str, sqlite3.Row]:
+        """
+        一次查詢多個單字(含變化形查詢字)，不計入查詢計時，供預先載入快取使用。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param words: 查詢字的可迭代物件。
+        :return: {查詢字: 字首單字的資料(sqlite3.Row)}，資料庫沒有的查詢字不包含在內。
+        """
+        conn = db_connections.get(db)
+        words = list(dict.fromkeys(words))
+        found = {}
+        for row in WordDatas._select_in(conn, '''SELECT a.query, w.* FROM WordAlias a JOIN Word w ON w.ID = a.word_id
+                                                  WHERE a.query IN ({placeholders});''', words):
+            found[row['query']] = row
+        for row in WordDatas._select_in(conn, '''SELECT english_word AS query, * FROM Word
+                                                  WHERE english_word IN ({placeholders});''', words):
+            found[row['query']] = row
+        return found
+
+
+
+    @staticmethod
+    def add_aliases(db: str, aliases: Iterable[Tuple[str, str]]) -> List[str]:
+        """
+        記錄變化形查詢字對應的字首單字，字首單字不存在時略過。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param aliases: (查詢字, 字首單字) 的可迭代物件。
+        :return: 狀態和訊息的列表，表示新增結果。
+        """
+        try:
+            conn = db_connections.get(db)
+            with conn:
+                conn.executemany('''INSERT OR REPLACE INTO WordAlias (query, word_id)
+                                    SELECT ?, ID FROM Word WHERE english_word = ?;''',
+                                 [(query, word) for query, word in aliases if query != word])
+            return ["Success", "٩(⚙ᴗ⚙)۶ 變化形已記錄！"]
+
+        except sqlite3.Error as error:
+            return ["Error", f"ఠ_ఠ? 記錄變化形時發生錯誤：{error}"]
+
+
     @staticmethod
     def select_all(db: str) -> Optional[sqlite3.Row]:
         """
@@ -66,18 +442,9 @@ class WordDatas:
         :param db: 資料庫檔案的路徑，型態為字串(str)。
         :return: 若存在則返回該單字的資料(sqlite3.Row)，否則返回 None。
         """
-        conn = sqlite3.connect(db)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        cur.execute('''SELECT * FROM Word ;''')
-        result = cur.fetchall()
-        conn.close()
-
-        # 擷取單字部分
-        words = []
-        for row in result:
-            words.append(dict(row)['english_word'])
-        words.sort()
+        conn = db_connections.get(db)
+        # 只取單字欄位，並由 UNIQUE 索引直接依序讀出
+        words = [row[0] for row in conn.execute('''SELECT english_word FROM Word ORDER BY english_word;''')]
 
         # 已字母開頭分類
         grouped_words = {}
@@ -93,6 +460,59 @@ class WordDatas:
 
 
 
+    @staticmethod
+    def select_page(db: str, after: Optional[str] = None, limit: int = 60) -> List[str]:
+        """
+        以 keyset 分頁依字母順序取出單字名稱。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param after: 上一頁的最後一個單字，None 表示從第一個單字開始。
+        :param limit: 最多取出的單字數量。
+        :return: 單字名稱的列表。
+        """
+        conn = db_connections.get(db)
+        if after is None:
+            rows = conn.execute('''SELECT english_word FROM Word ORDER BY english_word LIMIT ?;''', (limit,))
+        else:
+            rows = conn.execute('''SELECT english_word FROM Word WHERE english_word > ? ORDER BY english_word LIMIT ?;''',
+                                (after, limit))
+        return [row[0] for row in rows]
+
+
+
+    @staticmethod
+    def count_words(db: str) -> int:
+        """
+        計算單字總數。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :return: 單字數量。
+        """
+        return db_connections.get(db).execute('''SELECT COUNT(*) FROM Word;''').fetchone()[0]
+
+
+
+    @staticmethod
+    def iter_words(db: str, batch_size: int = 1000) -> Iterable[sqlite3.Row]:
+        """
+        依字母順序逐筆讀出整個 Word 資料表，以 keyset 分段查詢，不會一次載入全部資料。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param batch_size: 每次查詢的筆數。
+        :return: 單字資料(sqlite3.Row)的產生器。
+        """
+        conn = db_connections.get(db)
+        after = ''
+        while True:
+            rows = conn.execute('''SELECT english_word, description, crawled_at FROM Word
+                                    WHERE english_word > ? ORDER BY english_word LIMIT ?;''', (after, batch_size)).fetchall()
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after = rows[-1]['english_word']
+
+
+
     @staticmethod
     def insert_word(db: str, data: dict) -> List[str]:
         """
@@ -103,21 +523,77 @@ class WordDatas:
         :return: 狀態和訊息的列表，表示新增結果。
         """
         try:
-            conn = sqlite3.connect(db)
-            cur = conn.cursor()
+            conn = db_connections.get(db)
+            with tracer.span('db_insert'), conn:
+                entries = []
+                for word, details in data.items():
+                    description = WordDatas.dump_description(details)
+                    cur = conn.execute('''INSERT INTO Word (english_word, description, crawled_at) VALUES (?, ?, ?)''',(word, description, time.time()))
+                    entries.append((cur.lastrowid, word, details))
+                WordDatas._write_senses(conn, entries)
+            WordDatas._update_spelling(db, added=data)
+
+            return ["Success", "٩(⚙ᴗ⚙)۶ 單字已成功加入資料庫！"]
+
+        except sqlite3.Error as error:
+            return ["Error", f"ఠ_ఠ? 新增資料時發生錯誤：{error}"]
+
+
+
+    @staticmethod
+    def bulk_insert(db: str, items: Iterable[Tuple[str, dict]], chunk_size: int = 1000) -> List[str]:
+        """
+        批次新增單字，以 executemany 分段寫入，每段一個交易。
 
-            for word, details in data.items():
-                description = f"{details}"
-                cur.execute('''INSERT INTO Word (english_word, description) VALUES (?, ?)''',(word, description))
+        已存在的單字會以新內容覆蓋(upsert)，但使用者手動修改過(edited)的單字保持不變，也不計入匯入筆數。
+        items 可為產生器，資料會邊讀邊寫，不需整批載入記憶體。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param items: (單字, 區塊字典) 的可迭代物件。
+        :param chunk_size: 每個交易寫入的筆數。
+        :return: 狀態和訊息的列表，訊息包含筆數與每秒筆數。
+        """
+        start = time.perf_counter()
+        total = 0     # 已讀取的筆數
+        imported = 0  # 實際寫入的筆數(不含手動修改過而略過的單字)
+        chunk = []
+
+        def flush():
+            nonlocal imported
+            with conn:
+                cur = conn.executemany('''INSERT INTO Word (english_word, description, crawled_at) VALUES (?, ?, ?)
+                                          ON CONFLICT(english_word) DO UPDATE
+                                          SET description = excluded.description, crawled_at = excluded.crawled_at
+                                          WHERE Word.edited = 0;''',
+                                       [(word, WordDatas.dump_description(details), now) for word, details, now in chunk])
+                imported += cur.rowcount
+
+                # 只重建這次實際寫入(未被手動修改)的單字的 Sense 資料
+                latest = {word: details for word, details, _ in chunk}
+                rows = WordDatas._select_in(conn, '''SELECT ID, english_word FROM Word
+                                                       WHERE edited = 0 AND english_word IN ({placeholders});''', list(latest))
+                WordDatas._write_senses(conn, [(row['ID'], row['english_word'], latest[row['english_word']]) for row in rows])
+            WordDatas._update_spelling(db, added=latest)
 
-            conn.commit()
-            return ["Success", f"٩(⚙ᴗ⚙)۶ 單字已成功加入資料庫！"]
+        try:
+            conn = db_connections.get(db)
+            for word, details in items:
+                chunk.append((word, details, time.time()))
+                if len(chunk) >= chunk_size:
+                    flush()
+                    total += len(chunk)
+                    chunk.clear()
+            if chunk:
+                flush()
+                total += len(chunk)
 
         except sqlite3.Error as error:
-            return ["Error", f"ఠ_ఠ? 新增資料時發生錯誤：{error}"]
+            return ["Error", f"ఠ_ఠ? 批次新增第 {total + 1} 筆起的資料時發生錯誤：{error}"]
 
-        finally:
-            conn.close()
+        elapsed = time.perf_counter() - start
+        rate = total / elapsed if elapsed > 0 else 0.0
+        skipped = f"，略過 {total - imported} 筆手動修改過的單字" if imported < total else ""
+        return ["Success", f"٩(⚙ᴗ⚙)۶ 已匯入 {imported} 筆單字{skipped}，耗時 {elapsed:.2f} 秒({rate:.0f} 筆/秒)！"]
 
 
 
@@ -130,22 +606,23 @@ class WordDatas:
         :param english_word: 要刪除的英文單字名稱，型態為字串(str)。
         :return: 狀態和訊息的列表，表示刪除結果。
         """
-        if not WordDatas.search_data(db, word):
-            return ["Error", f"ఠ_ఠ? 找不到 {word}，無法刪除。"]
-
         try:
-            conn = sqlite3.connect(db)
-            cur = conn.cursor()
-            cur.execute('''DELETE FROM Word WHERE english_word = ?;''', (word,))
-            conn.commit()
+            conn = db_connections.get(db)
+            with conn:
+                # 全文檢索索引不受外鍵連帶刪除，需先行移除
+                conn.execute('''DELETE FROM SenseSearch WHERE rowid IN (
+                                    SELECT s.rowid FROM Sense s JOIN Word w ON w.ID = s.word_id WHERE w.english_word = ?);''', (word,))
+                cur = conn.execute('''DELETE FROM Word WHERE english_word = ?;''', (word,))
+
+            # 以影響筆數判斷單字是否存在，不需事先查詢
+            if cur.rowcount == 0:
+                return ["Error", f"ఠ_ఠ? 找不到 {word}，無法刪除。"]
+            WordDatas._update_spelling(db, removed=[word])
             return ["Success", f"٩(⚙ᴗ⚙)۶ {word} 已刪除！"]
 
         except sqlite3.Error as error:
             return ["Error", f"ఠ_ఠ? 刪除資料時發生錯誤：{error}"]
 
-        finally:
-            conn.close()
-
 
 
     @staticmethod
@@ -158,21 +635,49 @@ class WordDatas:
         :param updated_data: 包含更新資料的字典，未提供的欄位將保持不變。
         :return: 狀態和訊息的列表，表示更新結果。
         """
-        if not WordDatas.search_data(db, data['english_word']):
-            return ["Error", f"ఠ_ఠ? 找不到 {data['english_word']}，無法更新。"]
-
         try:
-            conn = sqlite3.connect(db)
-            cur = conn.cursor()
-            cur.execute('''UPDATE Word SET description = ? WHERE english_word = ?;''',(f"{data['description']}", data['english_word']))
-            conn.commit()
+            conn = db_connections.get(db)
+            with conn:
+                # 標記為使用者手動修改，避免背景更新覆蓋修改內容
+                cur = conn.execute('''UPDATE Word SET description = ?, edited = 1 WHERE english_word = ?;''',(WordDatas.dump_description(data['description']), data['english_word']))
+                if cur.rowcount:
+                    word_id = conn.execute('''SELECT ID FROM Word WHERE english_word = ?;''', (data['english_word'],)).fetchone()['ID']
+                    WordDatas._write_senses(conn, [(word_id, data['english_word'], data['description'])])
+
+            if cur.rowcount == 0:
+                return ["Error", f"ఠ_ఠ? 找不到 {data['english_word']}，無法更新。"]
             return ["Success", f"٩(⚙ᴗ⚙)۶ {data['english_word']} 已更新！"]
 
         except sqlite3.Error as error:
             return ["Error", f"ఠ_ఠ? 更新資料時發生錯誤：{error}"]
 
-        finally:
-            conn.close()
+
+
+    @staticmethod
+    def refresh_word(db: str, word: str, details: dict) -> List[str]:
+        """
+        以重新爬取的內容更新單字，已被使用者修改過(edited)的單字不會被覆蓋。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param word: 要更新的英文單字名稱，型態為字串(str)。
+        :param details: 重新爬取的單字內容字典。
+        :return: 狀態和訊息的列表，表示更新結果。
+        """
+        try:
+            conn = db_connections.get(db)
+            with conn:
+                cur = conn.execute('''UPDATE Word SET description = ?, crawled_at = ?
+                                      WHERE english_word = ? AND edited = 0;''', (WordDatas.dump_description(details), time.time(), word))
+                if cur.rowcount:
+                    word_id = conn.execute('''SELECT ID FROM Word WHERE english_word = ?;''', (word,)).fetchone()['ID']
+                    WordDatas._write_senses(conn, [(word_id, word, details)])
+
+            if cur.rowcount == 0:
+                return ["Error", f"ఠ_ఠ? {word} 不存在或已被手動修改，略過更新。"]
+            return ["Success", f"٩(⚙ᴗ⚙)۶ {word} 已重新整理！"]
+
+        except sqlite3.Error as error:
+            return ["Error", f"ఠ_ఠ? 更新資料時發生錯誤：{error}"]
 
 
 
@@ -180,28 +685,58 @@ class WordDatas:
 class ArticleData:
     """
     ArticleData 類別負責操作文章資料表的 CRUD 操作。
+
+    文章圖片存於 ArticleImage 資料表，以內容的 SHA-256 雜湊去除重複，Article 只保存雜湊值(picture_digest)；
+    圖片以 SQLite 增量 BLOB I/O 分段寫入與讀出，不必一次載入整張圖片。
+    查詢文章預設不讀取圖片，需要時指定 include_picture=True 或使用 read_image / iter_image。
     """
+    CHUNK_SIZE = 64 * 1024  # 圖片分段讀寫的大小
+    COLUMNS = '''ID, article_source, article_content, content_translation, picture_digest'''
+
     @staticmethod
     def initialize_database(db: str) -> None:
         """
-        初始化資料庫，建立文章資料表。
+        初始化資料庫，建立文章與文章圖片資料表，並將舊版存在 Article 內的圖片搬到 ArticleImage。
 
         :param db: 資料庫檔案的路徑，型態為字串(str)。
         """
-        conn = sqlite3.connect(db)
-        cur = conn.cursor()
         try:
-            cur.execute('''CREATE TABLE IF NOT EXISTS Article (
-                            ID INTEGER PRIMARY KEY AUTOINCREMENT,
-                            article_source TEXT NOT NULL UNIQUE,
-                            article_content TEXT NOT NULL,
-                            content_translation TEXT NOT NULL,
-                            content_picture BLOB);''')
-            conn.commit()
+            conn = db_connections.get(db)
+            with conn:
+                conn.execute('''CREATE TABLE IF NOT EXISTS Article (
+                                ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                                article_source TEXT NOT NULL UNIQUE,
+                                article_content TEXT NOT NULL,
+                                content_translation TEXT NOT NULL,
+                                content_picture BLOB,
+                                picture_digest TEXT REFERENCES ArticleImage(digest));''')
+                conn.execute('''CREATE TABLE IF NOT EXISTS ArticleImage (
+                                ID INTEGER PRIMARY KEY,
+                                digest TEXT NOT NULL UNIQUE,
+                                size INTEGER NOT NULL,
+                                data BLOB NOT NULL);''')
+
+                # 舊版資料庫補上圖片雜湊欄位，並把內嵌的圖片搬到 ArticleImage
+                columns = [row[1] for row in conn.execute('''PRAGMA table_info(Article);''')]
+                if 'picture_digest' not in columns:
+                    conn.execute('''ALTER TABLE Article ADD COLUMN picture_digest TEXT REFERENCES ArticleImage(digest);''')
+                conn.execute('''CREATE INDEX IF NOT EXISTS idx_article_picture ON Article(picture_digest);''')
+
+            # 以 ID 逐筆搬移，圖片以 blob 分段讀取，不會整張載入記憶體；每筆一個交易，中斷後可從剩下的文章繼續
+            last_id = 0
+            while True:
+                row = conn.execute('''SELECT ID FROM Article
+                                      WHERE content_picture IS NOT NULL AND ID > ? ORDER BY ID LIMIT 1;''', (last_id,)).fetchone()
+                if row is None:
+                    break
+                last_id = row['ID']
+                with conn:
+                    with conn.blobopen('Article', 'content_picture', last_id, readonly=True) as blob:
+                        digest = ArticleData._store_image(conn, blob)
+                    conn.execute('''UPDATE Article SET picture_digest = ?, content_picture = NULL WHERE ID = ?;''',
+                                 (digest, last_id))
         except sqlite3.Error as error:
             return ["Error", f"ఠ_ఠ? 初始資料庫時發生錯誤：{error}"]
-        finally:
-            conn.close()
 
 
 
@@ -215,54 +750,50 @@ class ArticleData:
                     - article_source (str): 文章來源
                     - article_content (str): 文章內容
                     - content_translation (str): 文章翻譯
-                    - content_picture (bytes): 文章圖片
+                    - content_picture (bytes | 檔案物件 | 路徑): 文章圖片，可省略
         :return: 狀態和訊息的列表，表示新增結果。
         """
         try:
-            conn = sqlite3.connect(db)
-            cur = conn.cursor()
-            cur.execute('''INSERT INTO Article (article_source, article_content, content_translation, content_picture)
-                           VALUES (?, ?, ?, ?)''',
-                        (data['article_source'], data['article_content'],
-                         data['content_translation'], data.get('content_picture')))
-            conn.commit()
+            conn = db_connections.get(db)
+            with conn:
+                digest = ArticleData._store_image(conn, data.get('content_picture'))
+                conn.execute('''INSERT INTO Article (article_source, article_content, content_translation, picture_digest)
+                                VALUES (?, ?, ?, ?)''',
+                             (data['article_source'], data['article_content'], data['content_translation'], digest))
             return ["Success", f"٩(⚙ᴗ⚙)۶ 文章 {data['article_source']} 已成功加入！"]
 
         except sqlite3.IntegrityError:
             return ["Error", f"ఠ_ఠ? 文章 {data['article_source']} 已存在，無法新增！"]
 
-        except sqlite3.Error as error:
+        except (sqlite3.Error, OSError) as error:
             return ["Error", f"ఠ_ఠ? 新增文章時發生錯誤：{error}"]
 
-        finally:
-            conn.close()
-
 
     @staticmethod
-    def search_article(db: str, article_source: str) -> Union[Dict[str, Union[str, bytes]], None]:
+    def search_article(db: str, article_source: str,
+                       include_picture: bool = False) -> Union[Dict[str, Union[str, bytes]], None]:
         """
         查詢文章資料。
 
         :param db: 資料庫檔案的路徑，型態為字串(str)。
         :param article_source: 要查詢的文章來源。
+        :param include_picture: 為 True 時一併讀出圖片(content_picture)，預設只返回圖片雜湊(picture_digest)。
         :return: 包含文章資料的字典，若無結果則返回 None。
         """
-        conn = sqlite3.connect(db)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
         try:
-            cur.execute('''SELECT * FROM Article WHERE article_source = ?;''', (article_source,))
-            row = cur.fetchone()
-            if row:
-                return dict(row)
-            return None
+            conn = db_connections.get(db)
+            row = conn.execute(f'''SELECT {ArticleData.COLUMNS} FROM Article WHERE article_source = ?;''',
+                               (article_source,)).fetchone()
+            if row is None:
+                return None
+            article = dict(row)
+            if include_picture:
+                article['content_picture'] = ArticleData.read_image(db, row['picture_digest'])
+            return article
 
         except sqlite3.Error as error:
             return ["Error", f"ఠ_ఠ? 查詢文章時發生錯誤：{error}"]
 
-        finally:
-            conn.close()
-
 
 
     @staticmethod
@@ -272,196 +803,2143 @@ class ArticleData:
 
         :param db: 資料庫檔案的路徑，型態為字串(str)。
         :param article_source: 要更新的文章來源。
-        :param updated_data: 包含更新內容的字典。
+        :param updated_data: 包含更新內容的字典；有 content_picture 時替換圖片(None 表示移除)，沒有時保留原圖片。
         :return: 狀態和訊息的列表，表示更新結果。
         """
-        if not ArticleData.search_article(db, article_source):
-            return ["Error", f"ఠ_ఠ? 找不到文章 {article_source}，無法更新！"]
-
         try:
-            conn = sqlite3.connect(db)
-            cur = conn.cursor()
-            cur.execute('''UPDATE Article
-                           SET article_content = ?, content_translation = ?, content_picture = ?
-                           WHERE article_source = ?;''',
-                        (updated_data['article_content'], updated_data['content_translation'],
-                         updated_data.get('content_picture'), article_source))
-            conn.commit()
+            conn = db_connections.get(db)
+            with conn:
+                row = conn.execute('''SELECT picture_digest FROM Article WHERE article_source = ?;''',
+                                   (article_source,)).fetchone()
+                if row is None:
+                    return ["Error", f"ఠ_ఠ? 找不到文章 {article_source}，無法更新！"]
+
+                digest = row['picture_digest']
+                if 'content_picture' in updated_data:
+                    digest = ArticleData._store_image(conn, updated_data['content_picture'])
+                conn.execute('''UPDATE Article
+                                SET article_content = ?, content_translation = ?, picture_digest = ?
+                                WHERE article_source = ?;''',
+                             (updated_data['article_content'], updated_data['content_translation'],
+                              digest, article_source))
+                if digest != row['picture_digest']:
+                    ArticleData._release_image(conn, row['picture_digest'])
             return ["Success", f"٩(⚙ᴗ⚙)۶ 文章 {article_source} 已更新！"]
-        except sqlite3.Error as error:
+        except (sqlite3.Error, OSError) as error:
             return ["Error", f"更新文章時發生錯誤：{error}"]
-        finally:
-            conn.close()
 
 
 
     @staticmethod
     def delete_article(db: str, article_source: str) -> List[str]:
         """
-        刪除文章資料。
+        刪除文章資料，沒有其他文章使用的圖片一併刪除。
 
         :param db: 資料庫檔案的路徑，型態為字串(str)。
         :param article_source: 要刪除的文章來源。
         :return: 狀態和訊息的列表，表示刪除結果。
         """
-        if not ArticleData.search_article(db, article_source):
-            return ["Error", f"ఠ_ఠ? 找不到文章 {article_source}，無法刪除！"]
-
         try:
-            conn = sqlite3.connect(db)
-            cur = conn.cursor()
-            cur.execute('''DELETE FROM Article WHERE article_source = ?;''', (article_source,))
-            conn.commit()
+            conn = db_connections.get(db)
+            with conn:
+                row = conn.execute('''SELECT picture_digest FROM Article WHERE article_source = ?;''',
+                                   (article_source,)).fetchone()
+                if row is None:
+                    return ["Error", f"ఠ_ఠ? 找不到文章 {article_source}，無法刪除！"]
+                conn.execute('''DELETE FROM Article WHERE article_source = ?;''', (article_source,))
+                ArticleData._release_image(conn, row['picture_digest'])
             return ["Success", f"٩(⚙ᴗ⚙)۶ 文章 {article_source} 已刪除！"]
 
         except sqlite3.Error as error:
             return ["Error", f"ఠ_ఠ? 刪除文章時發生錯誤：{error}"]
 
-        finally:
-            conn.close()
-
-
-class DataCrawl:
-    """
-    網頁爬蟲
-    """
-    def __init__(self, search_key):
-        self.url = f"https://dictionary.cambridge.org/zht/詞典/英語-漢語-繁體/{search_key}"
-        self.search_key = search_key
-        self.word = {}
 
 
-    def bubble_sort_phrases(dictionary: dict, parent_key: str):
+    @staticmethod
+    def iter_image(db: str, digest: Optional[str], chunk_size: Optional[int] = None) -> Iterable[bytes]:
         """
-        使用氣泡排序將指定字典中，以 `phrase` 開頭的鍵移到所有其他鍵的後方。
+        分段讀出圖片，適合直接寫入檔案或網路連線。
 
-        :param dictionary: 原始包含數據的字典。
-        :param parent_key: 要排序的子字典的主鍵名稱。
-        :return: 經過排序的字典。
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param digest: 圖片雜湊(picture_digest)，None 時不產生任何資料。
+        :param chunk_size: 每段的位元組數，預設為 ArticleData.CHUNK_SIZE。
+        :return: bytes 的產生器。
         """
-        # 提取目標子字典中的所有鍵
-        keys = list(dictionary[parent_key].keys())
+        if digest is None:
+            return
+        conn = db_connections.get(db)
+        row = conn.execute('''SELECT ID FROM ArticleImage WHERE digest = ?;''', (digest,)).fetchone()
+        if row is None:
+            return
+        with conn.blobopen('ArticleImage', 'data', row['ID'], readonly=True) as blob:
+            while True:
+                chunk = blob.read(chunk_size or ArticleData.CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
 
-        # 氣泡排序：將以 'phrase' 開頭的鍵移動到末尾
-        for i in range(len(keys)):
-            for j in range(len(keys) - i - 1):
-                if keys[j].startswith('phrase') and not keys[j + 1].startswith('phrase'):
-                    keys[j], keys[j + 1] = keys[j + 1], keys[j]
 
-        # 按排序後的鍵順序重建子字典
-        sorted_sub_dict = {key: dictionary[parent_key][key] for key in keys}
+    @staticmethod
+    def read_image(db: str, digest: Optional[str]) -> Optional[bytes]:
+        """
+        讀出整張圖片。
 
-        # 更新主字典中的子字典
-        dictionary[parent_key] = sorted_sub_dict
-        return dictionary
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param digest: 圖片雜湊(picture_digest)。
+        :return: 圖片內容，沒有圖片時返回 None。
+        """
+        chunks = list(ArticleData.iter_image(db, digest))
+        return b''.join(chunks) if chunks else None
 
 
+    @staticmethod
+    def _store_image(conn: sqlite3.Connection, source) -> Optional[str]:
+        # 寫入圖片並返回雜湊，內容相同的圖片只存一份；source 可為 bytes、可 seek 的檔案物件或檔案路徑
+        if source is None:
+            return None
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            digest, size = hashlib.sha256(source).hexdigest(), len(source)
+            if conn.execute('''SELECT 1 FROM ArticleImage WHERE digest = ?;''', (digest,)).fetchone() is None:
+                conn.execute('''INSERT INTO ArticleImage (digest, size, data) VALUES (?, ?, ?);''', (digest, size, source))
+            return digest
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                return ArticleData._store_image(conn, f)
+
+        # 檔案物件：先分段計算雜湊與大小，再以 zeroblob 預留空間並分段寫入
+        start = source.tell()
+        hasher, size = hashlib.sha256(), 0
+        for chunk in iter(lambda: source.read(ArticleData.CHUNK_SIZE), b''):
+            hasher.update(chunk)
+            size += len(chunk)
+        digest = hasher.hexdigest()
+        if conn.execute('''SELECT 1 FROM ArticleImage WHERE digest = ?;''', (digest,)).fetchone() is None:
+            rowid = conn.execute('''INSERT INTO ArticleImage (digest, size, data) VALUES (?, ?, zeroblob(?));''',
+                                 (digest, size, size)).lastrowid
+            source.seek(start)
+            with conn.blobopen('ArticleImage', 'data', rowid) as blob:
+                for chunk in iter(lambda: source.read(ArticleData.CHUNK_SIZE), b''):
+                    blob.write(chunk)
+        return digest
 
-    def crawl(self):
-        headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Connection': 'keep-alive'
-                }  # 反爬蟲機制
-        response = requests.get(self.url, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        # # ----------------------持續追加 JSON 測試----------------------------
-        # output_path = os.path.join(os.getcwd(), 'soup.json')
-        # with open(output_path, 'w', encoding='utf-8') as f:
-        #     # 使用 prettify() 轉換為可讀的 HTML 字串
-        #     soup_data = {"html": soup.prettify()}
-        #     f.write(json.dumps(soup_data, ensure_ascii=False, indent=4))
-        # # ------------------------------------------------------------------
-
-        # 區塊
-        blocks = {}
-
-        # 2. 爬取每個區塊的資料
-        if soup.find_all('div', class_='pr entry-body__el'):
-            # 抓取單字
-            headword = soup.find('span', class_='hw dhw').text if soup.find('span', class_='hw dhw') else None
-            # 初始化區塊索引
-            block_index = 1
-            phrase_index = 1
 
-            for block in soup.find_all('div', class_='pr entry-body__el'):
-            # 預抓詞類
-                word_class = block.find('span', class_='pos dpos')
+    @staticmethod
+    def _release_image(conn: sqlite3.Connection, digest: Optional[str]) -> None:
+        # 刪除沒有任何文章使用的圖片
+        if digest is not None:
+            conn.execute('''DELETE FROM ArticleImage WHERE digest = ?
+                            AND NOT EXISTS (SELECT 1 FROM Article WHERE picture_digest = ?);''', (digest, digest))
 
-                for sub_block in block.find_all('div', class_='def-block ddef_block'):
-                    block_data = {}
-                    phrase_block = {}
 
-                    # 片語
-                    parent_block = sub_block.find_parent('div', class_=['pr phrase-block dphrase-block lmb-25', "pr phrase-block dphrase-block"])
-                    if parent_block:
 
-                        # 片語
-                        phrase_title = parent_block.find('span', class_='phrase-title dphrase-title')
-                        phrase_block['phrase'] = phrase_title.text if phrase_title else 'N/A'
 
-                        # 片語描述
-                        description = sub_block.find('div', class_='def ddef_d db')
-                        phrase_block['description'] = description.text if description else 'N/A'
+class ThumbnailCache:
+    """
+    文章圖片縮圖快取(LRU)，同一張圖片以同一尺寸顯示時不再重新解碼。
 
-                        # 片語翻譯
-                        # word_translation = sub_block.find('span', class_='dtrans')
-                        # phrase_block['word_translation'] = word_translation.text if word_translation else 'N/A'
+    以 (圖片雜湊, 尺寸) 為鍵；圖片內容相同即共用縮圖，圖片替換後雜湊不同，舊縮圖自然不再被使用。
+    解碼器可替換，例如視窗程式可傳入產生 tk.PhotoImage 的函式。
+    """
+    def __init__(self, db: str, decoder: Optional[Callable[[bytes, Tuple[int, int]], object]] = None,
+                 capacity: int = 64):
+        """
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param decoder: 接收 (圖片內容, (寬, 高)) 並返回縮圖的函式，預設為 ThumbnailCache.default_decoder。
+        :param capacity: 最多保留的縮圖數量。
+        """
+        self.db = db
+        self.decoder = decoder or ThumbnailCache.default_decoder
+        self.capacity = capacity
+        self._entries = OrderedDict()  # (雜湊, 尺寸) -> 縮圖
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
 
-                        # 片語例句
-                        example_sentence = sub_block.find('span', class_='eg deg')
-                        phrase_block['example_sentence'] = example_sentence.text if example_sentence else 'N/A'
 
-                        # 片語例句翻譯
-                        example_sentence_translation = sub_block.find('span', class_='trans dtrans dtrans-se hdb break-cj')
-                        phrase_block['example_sentence_translation'] = example_sentence_translation.text if example_sentence_translation else 'N/A'
+    @staticmethod
+    def default_decoder(data: bytes, size: Tuple[int, int]) -> bytes:
+        """
+        預設解碼器：有安裝 Pillow 時縮小並輸出 PNG，否則原樣返回圖片內容。
 
-                        blocks[f'phrase{phrase_index}'] = phrase_block
-                        phrase_index += 1
+        :param data: 圖片內容。
+        :param size: 縮圖的最大 (寬, 高)。
+        :return: 縮圖內容(bytes)。
+        """
+        if find_spec('PIL') is None:
+            return data
+        import io
+        from PIL import Image
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail(size)
+            output = io.BytesIO()
+            image.save(output, format='PNG')
+        return output.getvalue()
+
+
+    def get(self, digest: Optional[str], size: Tuple[int, int] = (320, 240)):
+        """
+        取得縮圖。
 
-                    else:
-                        # 詞類
-                        block_data['word_class'] = word_class.text if word_class else 'N/A'
+        :param digest: 圖片雜湊(search_article 結果中的 picture_digest)。
+        :param size: 縮圖的最大 (寬, 高)。
+        :return: 解碼器產生的縮圖，沒有圖片時返回 None。
+        """
+        if digest is None:
+            return None
+        key = (digest, tuple(size))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        data = ArticleData.read_image(self.db, digest)
+        if data is None:
+            return None
+        thumbnail = self.decoder(data, tuple(size))
+        with self._lock:
+            self._entries[key] = thumbnail
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return thumbnail
 
-                        # 描述
-                        description = sub_block.find('div', class_='def ddef_d db')
-                        block_data['description'] = description.text if description else 'N/A'
 
-                        # 單字翻譯
-                        word_translation = sub_block.find('span', class_='dtrans')
-                        block_data['word_translation'] = word_translation.text if word_translation else 'N/A'
+    def clear(self) -> None:
+        """
+        清空縮圖快取。
+        """
+        with self._lock:
+            self._entries.clear()
 
-                        # 例句
-                        example_sentence = sub_block.find('span', class_='eg deg')
-                        block_data['example_sentence'] = example_sentence.text if example_sentence else 'N/A'
 
-                        # 例句翻譯
-                        example_sentence_translation = sub_block.find('span', class_='trans dtrans dtrans-se hdb break-cj')
-                        block_data['example_sentence_translation'] = example_sentence_translation.text if example_sentence_translation else 'N/A'
 
-                        # 將資料加入到 blocks 字典
-                        blocks[f'block{block_index}'] = block_data
-                        block_index += 1
 
-            self.word[headword] = blocks
+class HistoryData:
+    """
+    HistoryData 類別負責操作查詢紀錄資料表：每個單字一列，記錄查詢次數、第一次與最後一次查詢時間。
+    """
+    @staticmethod
+    def initialize_database(db: str) -> Optional[List[str]]:
+        """
+        初始化資料庫，建立查詢紀錄資料表。
 
-            # 調用方法進行排序
-            DataCrawl.bubble_sort_phrases(self.word, headword)
-            # ----------------------持續追加 JSON 測試----------------------------
-            output_path = os.path.join(os.getcwd(), 'output.json')
-            with open(output_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps({headword: blocks}, ensure_ascii=False, indent=4) + '\n')
-            # ------------------------------------------------------------------
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :return: 成功時返回 None，失敗時返回狀態和訊息的列表。
+        """
+        try:
+            conn = db_connections.get(db)
+            with conn:
+                conn.execute('''CREATE TABLE IF NOT EXISTS History (
+                                english_word TEXT PRIMARY KEY,
+                                hits INTEGER NOT NULL DEFAULT 1,
+                                first_at REAL NOT NULL,
+                                last_at REAL NOT NULL
+                              ) WITHOUT ROWID;''')
+                conn.execute('''CREATE INDEX IF NOT EXISTS idx_history_last_at ON History(last_at);''')
+                conn.execute('''CREATE INDEX IF NOT EXISTS idx_history_hits ON History(hits);''')
+        except sqlite3.Error as error:
+            return ["Error", f"ఠ_ఠ? 初始資料庫時發生錯誤：{error}"]
 
-            return self.word
 
-        else:
-            return ["Error", f"ఠ_ఠ? 沒有你要找的單字 ： '{self.search_key}'"]
 
+    @staticmethod
+    def record(db: str, word: str, looked_up_at: Optional[float] = None) -> List[str]:
+        """
+        記錄一次查詢，已存在的單字累加次數並更新最後查詢時間。
 
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param word: 查詢的英文單字，型態為字串(str)。
+        :param looked_up_at: 查詢時間(epoch 秒)，預設為現在。
+        :return: 狀態和訊息的列表，表示記錄結果。
+        """
+        looked_up_at = looked_up_at or time.time()
+        try:
+            conn = db_connections.get(db)
+            with conn:
+                conn.execute('''INSERT INTO History (english_word, hits, first_at, last_at) VALUES (?, 1, ?, ?)
+                                ON CONFLICT(english_word) DO UPDATE SET hits = hits + 1, last_at = excluded.last_at;''',
+                             (word, looked_up_at, looked_up_at))
+            return ["Success", f"٩(⚙ᴗ⚙)۶ 已記錄 {word}！"]
 
+        except sqlite3.Error as error:
+            return ["Error", f"ఠ_ఠ? 記錄查詢時發生錯誤：{error}"]
 
 
 
+    @staticmethod
+    def recent(db: str, limit: int = 15) -> List[str]:
+        """
+        取出最近查詢的單字。
 
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param limit: 最多取出的單字數量。
+        :return: 單字列表，由新到舊排序。
+        """
+        rows = db_connections.get(db).execute('''SELECT english_word FROM History ORDER BY last_at DESC LIMIT ?;''',
+                                              (limit,)).fetchall()
+        return [row['english_word'] for row in rows]
+
+
+    @staticmethod
+    def most_frequent(db: str, limit: int = 20) -> List[Tuple[str, int]]:
+        """
+        取出查詢次數最多的單字，次數相同時較近查詢的在前。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param limit: 最多取出的單字數量。
+        :return: (單字, 查詢次數) 的列表。
+        """
+        rows = db_connections.get(db).execute('''SELECT english_word, hits FROM History
+                                                  ORDER BY hits DESC, last_at DESC LIMIT ?;''', (limit,)).fetchall()
+        return [(row['english_word'], row['hits']) for row in rows]
+
+
+    @staticmethod
+    def hits(db: str, word: str) -> int:
+        """
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param word: 英文單字，型態為字串(str)。
+        :return: 單字的查詢次數，沒有紀錄時為 0。
+        """
+        row = db_connections.get(db).execute('''SELECT hits FROM History WHERE english_word = ?;''', (word,)).fetchone()
+        return row['hits'] if row else 0
+
+
+    @staticmethod
+    def delete(db: str, word: Optional[str] = None) -> List[str]:
+        """
+        刪除單字的查詢紀錄，未指定單字時清空全部。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param word: 要刪除的英文單字，型態為字串(str)。
+        :return: 狀態和訊息的列表，表示刪除結果。
+        """
+        try:
+            conn = db_connections.get(db)
+            with conn:
+                if word is None:
+                    conn.execute('''DELETE FROM History;''')
+                else:
+                    conn.execute('''DELETE FROM History WHERE english_word = ?;''', (word,))
+            return ["Success", "٩(⚙ᴗ⚙)۶ 查詢紀錄已刪除！"]
+
+        except sqlite3.Error as error:
+            return ["Error", f"ఠ_ఠ? 刪除查詢紀錄時發生錯誤：{error}"]
+
+
+
+
+class RecentWords:
+    """
+    記憶體中的最近查詢清單(LRU)，順序與畫面上的歷史清單相同(由舊到新)。
+
+    touch() 回傳清單需要的最小變動，介面只需刪除一列並在尾端新增一列，不必整個重建。
+    """
+    def __init__(self, capacity: int = 15):
+        """
+        :param capacity: 最多保留的單字數量。
+        """
+        self.capacity = capacity
+        self._words = OrderedDict()  # 單字 -> None，由舊到新
+
+
+    def load(self, words: Iterable[str]) -> None:
+        """
+        以單字列表(由舊到新)取代目前內容，例如啟動時載入 HistoryData.recent() 的結果。
+
+        :param words: 單字的可迭代物件。
+        """
+        self._words.clear()
+        for word in words:
+            self._words[word] = None
+            self._words.move_to_end(word)
+        while len(self._words) > self.capacity:
+            self._words.popitem(last=False)
+
+
+    def touch(self, word: str) -> Tuple[Optional[int], bool]:
+        """
+        將單字移到最新的位置。
+
+        :param word: 查詢的英文單字，型態為字串(str)。
+        :return: (要從清單刪除的位置, 是否要在尾端新增單字)；單字原本就在清單中時刪除其舊位置，
+                 最舊的單字被擠出時刪除位置 0，單字原本就是最新的一筆時返回 (None, False)。
+        """
+        if word in self._words:
+            if next(reversed(self._words)) == word:
+                return None, False
+            position = list(self._words).index(word)  # 最多 capacity 個元素
+            self._words.move_to_end(word)
+            return position, True
+
+        self._words[word] = None
+        if len(self._words) > self.capacity:
+            self._words.popitem(last=False)
+            return 0, True
+        return None, True
+
+
+    def __iter__(self):
+        return iter(self._words)
+
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+
+
+
+class SpellingIndex:
+    """
+    拼字建議索引(SymSpell 刪除字索引)。
+
+    每個單字預先產生刪除最多 max_distance 個字母的所有字形(只取前 prefix_length 個字母)，
+    查詢時只需產生輸入字的刪除字形並查表，再以編輯距離(含相鄰字母互換)驗證候選字，
+    不必與每個單字逐一比較。
+
+    單字有兩種來源：資料庫(Word 資料表)與選用的單字清單；有載入單字清單時，
+    不在索引中且有相近單字的查詢字會被視為拼錯，不必連網即可回應建議。
+    註冊於 WordDatas.spelling_indexes 後，insert_word、bulk_insert 與 delete_word 會同步更新索引。
+
+    記憶體成本與刪除字形數量成正比：10 萬個單字在 max_distance=2 時約 180 萬個字形、220MB，建立約 4 秒；
+    max_distance=1 時約 60 萬個字形、70MB，建立約 1.3 秒。
+    """
+    DATABASE = 1   # 來源：資料庫
+    WORD_LIST = 2  # 來源：單字清單
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        """
+        :param max_distance: 建議的最大編輯距離。
+        :param prefix_length: 產生刪除字形時只取單字的前幾個字母，降低索引大小。
+        """
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.has_word_list = False
+        self._words = {}    # 單字 -> 來源旗標
+        self._deletes = {}  # 刪除字形 -> 單字(只有一個時直接存字串以節省記憶體)或單字集合
+        self._lock = threading.Lock()
+
+
+    def add(self, word: str, source: int = DATABASE) -> None:
+        """
+        加入單字。
+
+        :param word: 英文單字，型態為字串(str)。
+        :param source: 來源，SpellingIndex.DATABASE 或 SpellingIndex.WORD_LIST。
+        """
+        word = word.lower()
+        with self._lock:
+            flags = self._words.get(word, 0)
+            self._words[word] = flags | source
+            if flags:
+                return
+            for variant in self._variants(word):
+                words = self._deletes.get(variant)
+                if words is None:
+                    self._deletes[variant] = word
+                elif isinstance(words, str):
+                    self._deletes[variant] = {words, word}
+                else:
+                    words.add(word)
+
+
+    def remove(self, word: str, source: int = DATABASE) -> None:
+        """
+        移除單字的來源，所有來源都移除後才從索引刪除。
+
+        :param word: 英文單字，型態為字串(str)。
+        :param source: 來源，SpellingIndex.DATABASE 或 SpellingIndex.WORD_LIST。
+        """
+        word = word.lower()
+        with self._lock:
+            flags = self._words.get(word, 0) & ~source
+            if flags:
+                self._words[word] = flags
+                return
+            if self._words.pop(word, None) is None:
+                return
+            for variant in self._variants(word):
+                words = self._deletes.get(variant)
+                if words == word:
+                    del self._deletes[variant]
+                elif isinstance(words, set):
+                    words.discard(word)
+                    if len(words) == 1:
+                        self._deletes[variant] = words.pop()
+
+
+    def load_database(self, db: str) -> int:
+        """
+        載入資料庫中的所有單字。
+
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :return: 載入的單字數量。
+        """
+        rows = db_connections.get(db).execute('''SELECT english_word FROM Word;''').fetchall()
+        for row in rows:
+            self.add(row[0], SpellingIndex.DATABASE)
+        return len(rows)
+
+
+    def load_word_list(self, path: str) -> int:
+        """
+        載入單字清單(每行一個單字，例如 /usr/share/dict/words)，只收錄純英文字母的單字。
+
+        :param path: 單字清單路徑。
+        :return: 載入的單字數量。
+        """
+        count = 0
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                word = line.strip()
+                if word.isascii() and word.isalpha():
+                    self.add(word, SpellingIndex.WORD_LIST)
+                    count += 1
+        self.has_word_list = True
+        return count
+
+
+    def __contains__(self, word: str) -> bool:
+        return word.lower() in self._words
+
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+
+    def suggest(self, word: str, limit: int = 5) -> List[Tuple[str, int]]:
+        """
+        列出拼字相近的單字。
+
+        :param word: 查詢字。
+        :param limit: 最多返回的數量。
+        :return: (單字, 編輯距離) 的列表，依距離、是否已收錄於資料庫、字母順序排序。
+        """
+        word = word.lower()
+        # 短字允許的距離較小，否則幾乎所有短字都會成為候選
+        max_distance = min(self.max_distance, 1 if len(word) <= 4 else self.max_distance)
+        with self._lock:
+            candidates = set()
+            for variant in self._variants(word, max_distance):
+                words = self._deletes.get(variant, ())
+                for candidate in (words,) if isinstance(words, str) else words:
+                    if abs(len(candidate) - len(word)) <= max_distance:
+                        candidates.add(candidate)
+            sources = {candidate: self._words[candidate] for candidate in candidates}
+
+        suggestions = []
+        for candidate, flags in sources.items():
+            distance = SpellingIndex.distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                suggestions.append((distance, not flags & SpellingIndex.DATABASE, candidate))
+        suggestions.sort()
+        return [(candidate, distance) for distance, _, candidate in suggestions[:limit]]
+
+
+    def check(self, word: str, limit: int = 5) -> List[str]:
+        """
+        判斷查詢字是否可能拼錯。
+
+        只有載入單字清單時才能判斷：查詢字不在索引中、但有相近的單字時視為拼錯。
+
+        :param word: 查詢字。
+        :param limit: 最多返回的建議數量。
+        :return: 拼錯時返回建議的單字，否則返回空列表。
+        """
+        if not self.has_word_list or word in self:
+            return []
+        return [candidate for candidate, _ in self.suggest(word, limit)]
+
+
+    @staticmethod
+    def distance(source: str, target: str, max_distance: int) -> int:
+        """
+        計算編輯距離(Optimal String Alignment：插入、刪除、替換與相鄰字母互換)，
+        超過 max_distance 時提早結束並返回 max_distance + 1。
+
+        :param source: 字串一。
+        :param target: 字串二。
+        :param max_distance: 最大距離。
+        :return: 編輯距離。
+        """
+        if source == target:
+            return 0
+        previous_previous = None
+        previous = list(range(len(target) + 1))
+        for i in range(1, len(source) + 1):
+            current = [i] + [0] * len(target)
+            for j in range(1, len(target) + 1):
+                cost = source[i - 1] != target[j - 1]
+                current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+                if (cost and i > 1 and j > 1 and source[i - 1] == target[j - 2]
+                        and source[i - 2] == target[j - 1]):
+                    current[j] = min(current[j], previous_previous[j - 2] + 1)
+            if min(current) > max_distance:
+                return max_distance + 1
+            previous_previous, previous = previous, current
+        return previous[-1]
+
+
+    def _variants(self, word: str, max_distance: Optional[int] = None) -> set:
+        # 單字前綴本身與刪除 1..max_distance 個字母的所有字形
+        prefix = word[:self.prefix_length]
+        variants = {prefix}
+        frontier = {prefix}
+        for _ in range(self.max_distance if max_distance is None else max_distance):
+            frontier = {item[:index] + item[index + 1:] for item in frontier for index in range(len(item))}
+            variants |= frontier
+        return variants
+
+
+
+
+class DataCrawl:
+    """
+    網頁爬蟲
+    """
+    BASE_URL = "https://dictionary.cambridge.org/zht/詞典/英語-漢語-繁體/"
+    HEADERS = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                'Accept-Language': 'en-US,en;q=0.9',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'Connection': 'keep-alive'
+            }  # 反爬蟲機制
+    PHRASE_CLASSES = ['pr phrase-block dphrase-block lmb-25', "pr phrase-block dphrase-block"]
+    OK_STATUS = {200, 304, 404}  # 其他狀態(429、5xx 等)表示上游出錯，不能當成查無單字
+    parser = _DEFAULT_PARSER  # BeautifulSoup 解析器，可改為 'html.parser' 或 'lxml'
+    crawl_log = None          # 爬蟲輸出紀錄(CrawlLog)，None 表示不記錄
+
+    def __init__(self, search_key, base_url: Optional[str] = None, session=None, timeout: float = 10,
+                 parser: Optional[str] = None, snapshot_store: Optional['SnapshotStore'] = None, replay: bool = False):
+        """
+        :param search_key: 要查詢的單字。
+        :param base_url: 字典網址前綴，測試時可指向本機伺服器。
+        :param session: 共用的 requests.Session，未提供時每次查詢建立新連線。
+        :param timeout: 連線與讀取的逾時秒數。
+        :param parser: BeautifulSoup 解析器名稱，未提供時使用 DataCrawl.parser。
+        :param snapshot_store: 離線快照存放區，提供時會保存每次下載的頁面。
+        :param replay: 為 True 時只從離線快照解析，不連網。
+        """
+        self.url = f"{base_url or DataCrawl.BASE_URL}{search_key}"
+        self.search_key = search_key
+        self.session = session
+        self.timeout = timeout
+        self.parser = parser or DataCrawl.parser
+        self.snapshots = snapshot_store
+        self.replay = replay
+        self._snapshot = None
+        self.word = {}
+
+
+    @staticmethod
+    def order_phrases(dictionary: dict, parent_key: str):
+        """
+        將指定字典中以 `phrase` 開頭的鍵移到所有其他鍵的後方。
+
+        穩定分割：兩組各自保持原本順序，只走訪一次(線性時間)。
+        parse() 已分開收集解釋與片語，此方法用於整理其他來源(例如舊資料)的字典。
+
+        :param dictionary: 原始包含數據的字典。
+        :param parent_key: 要排序的子字典的主鍵名稱。
+        :return: 經過排序的字典。
+        """
+        senses = {}
+        phrases = {}
+        for key, value in dictionary[parent_key].items():
+            (phrases if key.startswith('phrase') else senses)[key] = value
+
+        # 解釋在前、片語在後
+        senses.update(phrases)
+        dictionary[parent_key] = senses
+        return dictionary
+
+    bubble_sort_phrases = order_phrases  # 舊名稱，保留相容
+
+
+
+    def fetch(self):
+        """
+        下載字典頁面，有離線快照時附上 If-None-Match / If-Modified-Since 條件標頭。
+
+        :return: requests.Response 物件。
+        """
+        headers = DataCrawl.HEADERS
+        if self.snapshots is not None:
+            self._snapshot = self.snapshots.load(self.search_key)
+            headers = {**headers, **SnapshotStore.conditional_headers(self._snapshot)}
+
+        if self.session is not None:
+            client = self.session
+        else:
+            import requests
+            client = requests
+        with tracer.span('fetch'):
+            return client.get(self.url, headers=headers, timeout=self.timeout)
+
+
+
+    def read(self, response) -> str:
+        """
+        取出頁面內容並更新離線快照，伺服器回應 304 時改用快照內容。
+
+        :param response: fetch() 回傳的 requests.Response 物件。
+        :return: 頁面 HTML 字串。
+        :raises requests.HTTPError: 伺服器回應 OK_STATUS 以外的狀態，或沒有快照卻回應 304。
+        """
+        status = response.status_code
+        if status not in DataCrawl.OK_STATUS or (status == 304 and self._snapshot is None):
+            from requests import HTTPError
+            raise HTTPError(f"ఠ_ఠ? 爬取 '{self.search_key}' 時伺服器回應 {status}", response=response)
+        if self.snapshots is None:
+            return response.text
+        if status == 304:
+            return self._snapshot['body']
+        if status == 200:
+            self.snapshots.save(self.search_key, self.url, response.text,
+                                response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return response.text
+
+
+
+    def crawl(self):
+        if self.replay:
+            # 重播模式：只讀取離線快照，不連網
+            snapshot = self.snapshots.load(self.search_key) if self.snapshots is not None else None
+            if snapshot is None:
+                return ["Error", f"ఠ_ఠ? 離線快照中沒有你要找的單字 ： '{self.search_key}'"]
+            return self.parse(snapshot['body'])
+
+        return self.log(self.parse(self.read(self.fetch())))
+
+
+
+    def log(self, result):
+        """
+        將成功的爬取結果寫入 DataCrawl.crawl_log(未設定時略過)。
+
+        :param result: parse() 的結果。
+        :return: 原本的結果。
+        """
+        if DataCrawl.crawl_log is not None and isinstance(result, dict):
+            with tracer.span('crawl_log'):
+                for word, details in result.items():
+                    DataCrawl.crawl_log.write(word, details, query=self.search_key)
+        return result
+
+
+
+    def parse(self, html: str):
+        """
+        解析字典頁面。
+
+        只建立詞條區塊(pr entry-body__el)的節點樹，並在一次走訪中分出單字解釋與片語。
+
+        :param html: 頁面 HTML 字串。
+        :return: {單字: 區塊字典}，查無單字時返回狀態和訊息的列表。
+        """
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        with tracer.span('parse'):
+            soup = BeautifulSoup(html, self.parser, parse_only=SoupStrainer('div', class_='pr entry-body__el'))
+            entries = soup.find_all('div', class_='pr entry-body__el')
+
+        if not entries:
+            return ["Error", f"ఠ_ఠ? 沒有你要找的單字 ： '{self.search_key}'"]
+
+        with tracer.span('extract'):
+            # 抓取單字
+            headword = soup.find('span', class_='hw dhw')
+            headword = headword.text if headword else None
+
+            # 解釋與片語分開收集，各自維持頁面上的順序，最後直接串接，不需再排序
+            senses = []
+            phrases = []
+
+            for entry in entries:
+                # 預抓詞類
+                word_class = entry.find('span', class_='pos dpos')
+                word_class = word_class.text if word_class else 'N/A'
+
+                # 先記錄屬於片語的解釋區塊，取代逐一向上尋找 find_parent
+                phrase_titles = {}
+                for phrase_block in entry.find_all('div', class_=DataCrawl.PHRASE_CLASSES):
+                    phrase_title = phrase_block.find('span', class_='phrase-title dphrase-title')
+                    phrase_title = phrase_title.text if phrase_title else 'N/A'
+                    for sub_block in phrase_block.find_all('div', class_='def-block ddef_block'):
+                        phrase_titles[id(sub_block)] = phrase_title
+
+                for sub_block in entry.find_all('div', class_='def-block ddef_block'):
+                    description = DataCrawl._text(sub_block, 'div', 'def ddef_d db')
+                    example_sentence = DataCrawl._text(sub_block, 'span', 'eg deg')
+                    example_sentence_translation = DataCrawl._text(sub_block, 'span', 'trans dtrans dtrans-se hdb break-cj')
+
+                    if id(sub_block) in phrase_titles:
+                        # 片語
+                        phrases.append({
+                            'phrase': phrase_titles[id(sub_block)],
+                            'description': description,
+                            'example_sentence': example_sentence,
+                            'example_sentence_translation': example_sentence_translation,
+                        })
+
+                    else:
+                        # 詞類、描述、單字翻譯、例句、例句翻譯
+                        senses.append({
+                            'word_class': word_class,
+                            'description': description,
+                            'word_translation': DataCrawl._text(sub_block, 'span', 'dtrans'),
+                            'example_sentence': example_sentence,
+                            'example_sentence_translation': example_sentence_translation,
+                        })
+
+            # 區塊：block1..N 在前、phrase1..M 在後
+            blocks = {f'block{index}': sense for index, sense in enumerate(senses, 1)}
+            blocks.update((f'phrase{index}', phrase) for index, phrase in enumerate(phrases, 1))
+            self.word[headword] = blocks
+
+        return self.word
+
+
+
+    @staticmethod
+    def _text(tag, name: str, class_name: str) -> str:
+        # 取出子節點文字，找不到時回傳 'N/A'
+        found = tag.find(name, class_=class_name)
+        return found.text if found else 'N/A'
+
+
+
+
+class LookupCoordinator:
+    """
+    包在爬蟲外層的查詢協調器。
+
+    - single-flight：同一個單字同時只有一個執行緒向上游爬取，其餘執行緒等待並共用結果。
+    - negative cache：查無單字的結果保留 negative_ttl 秒，期間內重複查詢(例如拼錯字)不再連網。
+    連線錯誤與 429、5xx 等 HTTP 錯誤狀態會拋出例外，不會被記住，下次查詢會重新爬取。
+    """
+    def __init__(self, crawl: Optional[Callable[[str], Union[Dict[str, dict], List[str]]]] = None,
+                 negative_ttl: float = 300.0, negative_capacity: int = 4096):
+        """
+        :param crawl: 實際爬取的函式，接收單字並返回與 DataCrawl.crawl 相同格式的結果；預設為 DataCrawl(word).crawl()。
+        :param negative_ttl: 查無單字的結果保留秒數。
+        :param negative_capacity: negative cache 最多保留的單字數量。
+        """
+        self.crawl_func = crawl or (lambda word: DataCrawl(word).crawl())
+        self.negative_ttl = negative_ttl
+        self.negative_capacity = negative_capacity
+        self._negative = OrderedDict()  # 單字 -> (到期時間, 錯誤列表)
+        self._flights = {}              # 單字 -> {'event', 'result', 'error'}
+        self._lock = threading.Lock()
+
+        # 統計
+        self.upstream = 0       # 實際向上游爬取的次數
+        self.coalesced = 0      # 併入進行中查詢的次數
+        self.negative_hits = 0  # 由 negative cache 直接回應的次數
+
+
+    def crawl(self, word: str, crawl: Optional[Callable[[str], Union[Dict[str, dict], List[str]]]] = None
+              ) -> Union[Dict[str, dict], List[str]]:
+        """
+        爬取單字，回傳格式與 DataCrawl.crawl 相同。
+
+        :param word: 要查詢的英文單字，型態為字串(str)。
+        :param crawl: 這次改用的爬取函式(例如需要計算下載量的預取)，只在實際向上游爬取時呼叫。
+        :return: {單字: 區塊字典}，查無單字時返回狀態和訊息的列表。
+        """
+        with self._lock:
+            entry = self._negative.get(word)
+            if entry is not None:
+                if entry[0] >= time.monotonic():
+                    self.negative_hits += 1
+                    return entry[1]
+                del self._negative[word]
+
+            flight = self._flights.get(word)
+            leader = flight is None
+            if leader:
+                flight = {'event': threading.Event(), 'result': None, 'error': None}
+                self._flights[word] = flight
+                self.upstream += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight['event'].wait()
+            if flight['error'] is not None:
+                raise flight['error']
+            return flight['result']
+
+        try:
+            flight['result'] = (crawl or self.crawl_func)(word)
+            return flight['result']
+        except Exception as error:
+            flight['error'] = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[word]
+                if isinstance(flight['result'], list):
+                    self._negative[word] = (time.monotonic() + self.negative_ttl, flight['result'])
+                    while len(self._negative) > self.negative_capacity:
+                        self._negative.popitem(last=False)
+            flight['event'].set()
+
+
+    def forget(self, word: Optional[str] = None) -> None:
+        """
+        移除 negative cache 中的單字，未指定單字時清空全部。
+
+        :param word: 要移除的單字，型態為字串(str)。
+        """
+        with self._lock:
+            if word is None:
+                self._negative.clear()
+            else:
+                self._negative.pop(word, None)
+
+
+    def stats(self) -> Dict[str, int]:
+        """
+        取得協調器統計。
+
+        :return: 包含 upstream、coalesced、negative_hits、saved(省下的上游請求數)與 negative_size 的字典。
+        """
+        with self._lock:
+            return {
+                'upstream': self.upstream,
+                'coalesced': self.coalesced,
+                'negative_hits': self.negative_hits,
+                'saved': self.coalesced + self.negative_hits,
+                'negative_size': len(self._negative),
+            }
+
+
+
+
+class WordCache:
+    """
+    單字查詢快取，依序為記憶體 LRU(含 TTL) → SQLite Word 資料表 → 網路爬蟲。
+
+    資料庫中超過 stale_after 秒的單字仍會直接回傳，同時於背景重新爬取更新；
+    被使用者手動修改過的單字(edited)不會被重新爬取。
+    網路爬取經由 LookupCoordinator，同時查詢同一個單字只爬一次，查無單字的結果會暫時記住。
+    設定拼字建議索引(spelling)後，可能拼錯的字先回應相近的單字，確認後可再以 force=True 連網查詢。
+    """
+    def __init__(self, db: str, capacity: int = 256, ttl: float = 600.0,
+                 stale_after: float = 30 * 24 * 3600, revalidate: bool = True, session=None,
+                 negative_ttl: float = 300.0, spelling: Optional[SpellingIndex] = None):
+        """
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param capacity: 記憶體快取最多保留的單字數量。
+        :param ttl: 記憶體快取的存活秒數。
+        :param stale_after: 資料庫內容視為過期的秒數。
+        :param revalidate: 是否在背景重新爬取過期的單字。
+        :param session: 共用的 requests.Session，讓連續的爬取重複使用連線。
+        :param negative_ttl: 查無單字的結果保留秒數，期間內不再連網。
+        :param spelling: 拼字建議索引，提供時查無單字的訊息附上建議，並在連網前提示可能拼錯的字。
+        """
+        self.db = db
+        self.session = session
+        self.spelling = spelling
+        self.coordinator = LookupCoordinator(self._crawl_and_store, negative_ttl=negative_ttl)
+        self.capacity = capacity
+        self.ttl = ttl
+        self.stale_after = stale_after
+        self.revalidate = revalidate
+        self._entries = OrderedDict()  # 查詢字 -> (到期時間, 單字資料)
+        self._lock = threading.Lock()
+        self._revalidating = set()
+        self.pinned = frozenset()      # 常用單字：不因 TTL 過期，也不會被 LRU 擠出
+
+        # 命中統計
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+
+    def lookup(self, word: str, offline: bool = False, force: bool = False,
+               on_insert: Optional[Callable[[str], None]] = None) -> Union[Dict[str, dict], List[str]]:
+        """
+        查詢單字，回傳格式與 DataCrawl.crawl 相同。
+
+        可能拼錯的字(不在單字清單、但有相近的單字)返回 ["Suggest", 訊息]，不連網；
+        單字清單未收錄的正確拼法(英式拼法、變化形、新字)可再以 force=True 查詢。
+
+        :param word: 要查詢的英文單字，型態為字串(str)。
+        :param offline: 為 True 時只查記憶體與資料庫，不連網。
+        :param force: 為 True 時略過拼字檢查，直接連網查詢。
+        :param on_insert: 這次查詢實際將新單字存入資料庫時，以字首單字呼叫(例如更新單字列表)。
+        :return: {單字: 區塊字典}，查無單字或可能拼錯時返回狀態和訊息的列表。
+        """
+        with tracer.trace('lookup', word):
+            # 1. 記憶體
+            data = self._get_memory(word)
+            if data is not None:
+                return data
+
+            # 2. 資料庫(變化形經由先前爬取時記錄的對應找到字首單字)
+            row = WordDatas.search_data(self.db, word) or WordDatas.search_alias(self.db, word)
+            if row is not None:
+                with self._lock:
+                    self.db_hits += 1
+                data = {row['english_word']: WordDatas.load_description(row['description'])}
+                self._put_memory(word, data)
+
+                if self.revalidate and not row['edited'] and time.time() - (row['crawled_at'] or 0) > self.stale_after:
+                    self._start_revalidation(word, row['english_word'])
+                return data
+
+            # 3. 網路爬蟲
+            with self._lock:
+                self.misses += 1
+            if offline:
+                return self._not_found(word, ["Error", f"ఠ_ఠ? 本機資料庫中沒有你要找的單字 ： '{word}'"])
+            if self.spelling is not None and not force:
+                with tracer.span('spelling'):
+                    suggestions = self.spelling.check(word)
+                if suggestions:
+                    return ["Suggest", f"ఠ_ఠ? '{word}' 可能拼錯了，你是不是要找：{'、'.join(suggestions)}？"]
+            if on_insert is None:
+                data = self.coordinator.crawl(word)
+            else:
+                data = self.coordinator.crawl(word, lambda query: self._crawl_and_store(query, on_insert=on_insert))
+            if isinstance(data, list):
+                return self._not_found(word, data)
+            self._put_memory(word, data)
+            return data
+
+
+    def invalidate(self, word: Optional[str] = None) -> None:
+        """
+        移除記憶體快取中的單字，未指定單字時清空全部。
+
+        :param word: 要移除的單字，型態為字串(str)。
+        """
+        self.coordinator.forget(word)
+        with self._lock:
+            if word is None:
+                self._entries.clear()
+                return
+            # 同時移除以變化形查詢、但字首為該單字的項目
+            for key in [key for key, (_, data) in self._entries.items() if key == word or word in data]:
+                del self._entries[key]
+
+
+    def warm(self, word: str, session=None, on_response: Optional[Callable] = None
+             ) -> Optional[Union[Dict[str, dict], List[str]]]:
+        """
+        預先爬取單字並存入資料庫，供背景預取使用。
+
+        與 lookup 共用 LookupCoordinator：同一個單字正在查詢時不重複爬取，查無單字的結果也會暫時記住；
+        結果不放入記憶體快取，避免推測的單字擠掉使用者查過的單字。
+
+        :param word: 要預取的英文單字，型態為字串(str)。
+        :param session: 這次爬取使用的 requests.Session，未提供時使用快取的 Session。
+        :param on_response: 實際向上游送出請求時，以 requests.Response 呼叫(例如計算頻寬)。
+        :return: 記憶體或資料庫已有時返回 None，否則返回與 DataCrawl.crawl 相同格式的結果。
+        """
+        with self._lock:
+            if word in self._entries:
+                return None
+        if WordDatas.search_data(self.db, word) or WordDatas.search_alias(self.db, word):
+            return None
+        return self.coordinator.crawl(word, lambda query: self._crawl_and_store(query, session, on_response))
+
+
+    def pin(self, words: Iterable[str], preload: bool = False) -> int:
+        """
+        設定常駐記憶體的單字(例如 HistoryData.most_frequent 的結果)，取代先前的設定。
+
+        常駐單字載入後不會因 TTL 過期或被 LRU 擠出，修改或刪除時仍會經由 invalidate() 移除。
+
+        :param words: 單字的可迭代物件。
+        :param preload: 為 True 時一次從資料庫載入記憶體，不連網，也不計入命中統計與查詢計時。
+        :return: 從資料庫載入的單字數量。
+        """
+        words = frozenset(words)
+        with self._lock:
+            self.pinned = words
+        if not preload:
+            return 0
+        rows = WordDatas.search_many(self.db, words)
+        for query, row in rows.items():
+            self._put_memory(query, {row['english_word']: WordDatas.load_description(row['description'])})
+        return len(rows)
+
+
+    def stats(self) -> Dict[str, int]:
+        """
+        取得快取命中統計。
+
+        :return: 包含 hits、db_hits、misses、revalidations、size 與 pinned 的字典。
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'db_hits': self.db_hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'size': len(self._entries),
+                'pinned': len(self.pinned),
+            }
+
+
+    def _not_found(self, word: str, error: List[str]) -> List[str]:
+        # 查無單字時在訊息後附上拼字建議
+        if self.spelling is None:
+            return error
+        with tracer.span('spelling'):
+            suggestions = [candidate for candidate, _ in self.spelling.suggest(word)]
+        if not suggestions:
+            return error
+        return [error[0], f"{error[1]}，你是不是要找：{'、'.join(suggestions)}？"]
+
+
+    def _crawl_and_store(self, word: str, session=None, on_response: Optional[Callable] = None,
+                         on_insert: Optional[Callable[[str], None]] = None) -> Union[Dict[str, dict], List[str]]:
+        # 由 LookupCoordinator 呼叫，同一個單字同時只會有一個執行緒執行
+        crawler = DataCrawl(word, session=session or self.session)
+        if on_response is None:
+            data = crawler.crawl()
+        else:
+            response = crawler.fetch()
+            on_response(response)
+            data = crawler.log(crawler.parse(crawler.read(response)))
+        if isinstance(data, list):
+            return data
+
+        # 查詢字可能是變化形，以爬到的字首存入資料庫，並記錄對應讓下次查詢不必連網
+        headword = list(data)[0]
+        if headword == word or WordDatas.search_data(self.db, headword) is None:
+            result = WordDatas.insert_word(self.db, data)
+            if result[0] == "Success" and on_insert is not None:
+                on_insert(headword)
+        if headword != word:
+            WordDatas.add_aliases(self.db, [(word, headword)])
+        return data
+
+
+    def _get_memory(self, word: str) -> Optional[Dict[str, dict]]:
+        with self._lock:
+            entry = self._entries.get(word)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at < time.monotonic() and word not in self.pinned:
+                del self._entries[word]
+                return None
+            self._entries.move_to_end(word)
+            self.hits += 1
+            return data
+
+
+    def _put_memory(self, word: str, data: Dict[str, dict]) -> None:
+        with self._lock:
+            self._entries[word] = (time.monotonic() + self.ttl, data)
+            self._entries.move_to_end(word)
+            # 最舊的是常駐單字時移到尾端，改擠出下一個；全部都常駐時允許超出容量
+            skipped = 0
+            while len(self._entries) > self.capacity and skipped < len(self._entries):
+                oldest = next(iter(self._entries))
+                if oldest in self.pinned:
+                    self._entries.move_to_end(oldest)
+                    skipped += 1
+                else:
+                    self._entries.popitem(last=False)
+
+
+    def _start_revalidation(self, word: str, headword: str) -> None:
+        with self._lock:
+            if headword in self._revalidating:
+                return
+            self._revalidating.add(headword)
+            self.revalidations += 1
+        threading.Thread(target=self._revalidate, args=(word, headword), daemon=True).start()
+
+
+    def _revalidate(self, word: str, headword: str) -> None:
+        try:
+            # 經由協調器爬取：與同時進行的查詢或預取共用同一次請求，查無單字的結果也會暫時記住
+            data = self.coordinator.crawl(headword, lambda query: DataCrawl(query, session=self.session).crawl())
+            if isinstance(data, dict) and headword in data:
+                result = WordDatas.refresh_word(self.db, headword, data[headword])
+                if result[0] == "Success":
+                    self._put_memory(word, {headword: data[headword]})
+        except Exception:
+            # 背景更新失敗時保留舊資料，下次查詢再重試
+            pass
+        finally:
+            with self._lock:
+                self._revalidating.discard(headword)
+
+
+
+
+class SnapshotStore:
+    """
+    爬取頁面的離線快照存放區。
+
+    頁面內容以 SHA-256 定址、gzip 壓縮後存於 objects/，相同內容只存一份；
+    index.db 記錄每個單字對應的內容雜湊、ETag 與 Last-Modified。
+    """
+    def __init__(self, directory: str):
+        """
+        :param directory: 存放區目錄，不存在時建立。
+        """
+        self.directory = directory
+        self.index = os.path.join(directory, 'index.db')
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+
+        conn = db_connections.get(self.index)
+        with conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS Snapshot (
+                            word TEXT PRIMARY KEY,
+                            digest TEXT NOT NULL,
+                            url TEXT NOT NULL,
+                            etag TEXT,
+                            last_modified TEXT,
+                            fetched_at REAL NOT NULL);''')
+
+
+    def save(self, word: str, url: str, body: str, etag: Optional[str] = None,
+             last_modified: Optional[str] = None) -> str:
+        """
+        保存頁面內容。
+
+        :param word: 查詢的單字。
+        :param url: 頁面網址。
+        :param body: 頁面 HTML 字串。
+        :param etag: 伺服器回應的 ETag。
+        :param last_modified: 伺服器回應的 Last-Modified。
+        :return: 內容的 SHA-256 雜湊。
+        """
+        data = body.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 先寫入暫存檔再改名，避免中斷時留下不完整的檔案
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+
+        conn = db_connections.get(self.index)
+        with conn:
+            conn.execute('''INSERT OR REPLACE INTO Snapshot (word, digest, url, etag, last_modified, fetched_at)
+                            VALUES (?, ?, ?, ?, ?, ?);''', (word, digest, url, etag, last_modified, time.time()))
+        return digest
+
+
+    def load(self, word: str) -> Optional[Dict[str, Union[str, float, None]]]:
+        """
+        讀取單字的快照。
+
+        :param word: 查詢的單字。
+        :return: 包含 body、url、etag、last_modified、fetched_at 的字典，沒有快照時返回 None。
+        """
+        row = db_connections.get(self.index).execute('''SELECT * FROM Snapshot WHERE word = ?;''', (word,)).fetchone()
+        if row is None:
+            return None
+        try:
+            with gzip.open(self._object_path(row['digest']), 'rb') as f:
+                body = f.read().decode('utf-8')
+        except FileNotFoundError:
+            return None
+        snapshot = dict(row)
+        snapshot['body'] = body
+        return snapshot
+
+
+    def words(self) -> List[str]:
+        """
+        列出所有有快照的單字。
+
+        :return: 單字列表。
+        """
+        rows = db_connections.get(self.index).execute('''SELECT word FROM Snapshot ORDER BY word;''').fetchall()
+        return [row['word'] for row in rows]
+
+
+    def replay(self, parser: Optional[str] = None) -> Iterable[Tuple[str, Union[Dict[str, dict], List[str]]]]:
+        """
+        不連網重新解析所有快照，供解析器修改後重新擷取整個語料庫。
+
+        :param parser: BeautifulSoup 解析器名稱。
+        :return: (查詢字, 解析結果) 的產生器。
+        """
+        for word in self.words():
+            yield word, DataCrawl(word, parser=parser, snapshot_store=self, replay=True).crawl()
+
+
+    @staticmethod
+    def conditional_headers(snapshot: Optional[dict]) -> Dict[str, str]:
+        """
+        依快照產生條件式請求標頭。
+
+        :param snapshot: load() 回傳的快照，可為 None。
+        :return: If-None-Match / If-Modified-Since 標頭字典。
+        """
+        headers = {}
+        if snapshot:
+            if snapshot.get('etag'):
+                headers['If-None-Match'] = snapshot['etag']
+            if snapshot.get('last_modified'):
+                headers['If-Modified-Since'] = snapshot['last_modified']
+        return headers
+
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, 'objects', digest[:2], f"{digest[2:]}.html.gz")
+
+
+
+class CrawlLog:
+    """
+    爬蟲輸出紀錄：每次成功爬取寫入一行精簡 JSON(JSONL)。
+
+    寫入由背景執行緒緩衝處理，查詢流程只需放入佇列；檔案超過 max_bytes 時輪替為
+    path.1(.gz)、path.2(.gz)…，最多保留 backups 份。
+    將 DataCrawl.crawl_log 設為 CrawlLog 物件即啟用，設為 None(預設)則不寫入。
+    """
+    def __init__(self, path: str = 'crawl_log.jsonl', max_bytes: int = 10 * 1024 * 1024, backups: int = 5,
+                 compress: bool = True, flush_interval: float = 1.0):
+        """
+        :param path: 紀錄檔路徑，所在目錄不存在時建立。
+        :param max_bytes: 單一檔案的大小上限(位元組)，0 表示不輪替。
+        :param backups: 保留的輪替檔數量。
+        :param compress: 輪替後的檔案是否以 gzip 壓縮。
+        :param flush_interval: 閒置多少秒後將緩衝寫入磁碟。
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.written = 0
+        self.rotations = 0
+
+
+    def write(self, word: str, details: Dict[str, dict], query: Optional[str] = None) -> None:
+        """
+        記錄一筆爬取結果，序列化與寫檔都在背景執行緒進行。
+
+        :param word: 單字(字首)。
+        :param details: 區塊字典。
+        :param query: 使用者查詢的字，與單字不同時(例如變化形)一併記錄。
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="crawl-log", daemon=True)
+                self._thread.start()
+        self._queue.put((time.time(), query, word, details))
+
+
+    def close(self) -> None:
+        """
+        寫完佇列中的紀錄並關閉檔案。
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+
+    @staticmethod
+    def files(path: str) -> List[str]:
+        """
+        列出紀錄檔與其輪替檔，由舊到新排序。
+
+        :param path: 紀錄檔路徑。
+        :return: 存在的檔案路徑列表。
+        """
+        rotated = []
+        index = 1
+        while True:
+            candidates = [f"{path}.{index}.gz", f"{path}.{index}"]
+            existing = [candidate for candidate in candidates if os.path.exists(candidate)]
+            if not existing:
+                break
+            rotated.append(existing[0])
+            index += 1
+        rotated.reverse()
+        if os.path.exists(path):
+            rotated.append(path)
+        return rotated
+
+
+    @staticmethod
+    def read(path: str, include_rotated: bool = True) -> Iterable[Tuple[str, Dict[str, dict]]]:
+        """
+        串流讀回紀錄，逐筆產生 (單字, 區塊字典)，可直接交給 WordDatas.bulk_insert 重新匯入。
+
+        :param path: 紀錄檔路徑，可為 .gz 壓縮檔。
+        :param include_rotated: 是否一併由舊到新讀取輪替檔。
+        :return: (單字, 區塊字典) 的產生器。
+        """
+        for file_path in CrawlLog.files(path) if include_rotated else [path]:
+            opener = gzip.open if file_path.endswith('.gz') else open
+            with opener(file_path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        yield record['word'], record['description']
+
+
+    def _run(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        f = open(self.path, 'a', encoding='utf-8')
+        size = f.tell()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    f.flush()
+                    continue
+                if item is None:
+                    break
+
+                crawled_at, query, word, details = item
+                record = {'word': word, 'crawled_at': round(crawled_at, 3), 'description': details}
+                if query and query != word:
+                    record['query'] = query
+                line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+                f.write(line)
+                size += len(line.encode('utf-8'))
+                self.written += 1
+
+                if self.max_bytes and size >= self.max_bytes:
+                    f.close()
+                    self._rotate()
+                    f = open(self.path, 'a', encoding='utf-8')
+                    size = 0
+        finally:
+            f.close()
+
+
+    def _rotate(self) -> None:
+        # path.(N-1) → path.N …，path → path.1，超過 backups 的舊檔刪除
+        suffix = '.gz' if self.compress else ''
+        oldest = f"{self.path}.{self.backups}{suffix}"
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}{suffix}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}{suffix}")
+
+        if self.backups <= 0:
+            os.remove(self.path)
+        elif self.compress:
+            with open(self.path, 'rb') as src, gzip.open(f"{self.path}.1.gz", 'wb') as dst:
+                while True:
+                    chunk = src.read(1 << 20)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+            os.remove(self.path)
+        else:
+            os.replace(self.path, f"{self.path}.1")
+        self.rotations += 1
+
+
+
+
+class Prefetcher:
+    """
+    低優先權的背景預取：從查詢結果取出使用者接著可能會查的單字(片語中的單字、例句中的單字)，
+    事先爬取並存入資料庫與記憶體快取，之後查詢時不必等待網路。
+
+    - 預算：每 budget_window 秒最多 max_requests 次請求、max_bytes 位元組，用完即停止預取。
+    - 讓路：pause() 與 resume() 之間(使用者查詢進行中)不送出新的預取請求。
+    - 經由 WordCache.warm 爬取：與使用者查詢共用 single-flight 與 negative cache，結果只存入資料庫。
+    - 資料庫已有的單字與查無的單字不會重複爬取。
+    """
+    STOPWORDS = frozenset('''
+        about above after again against also always another because been before being below between both
+        cannot could does doing down during each every from further have having here into itself just more
+        most much must never only other over same should some such than that their theirs them then there
+        these they this those through under until upon very want were what when where which while with
+        within without would your yours something someone somebody anything anyone everything people thing
+    '''.split())
+    WORD_PATTERN = re.compile(r"[a-z]+(?:-[a-z]+)*")
+
+    def __init__(self, cache: 'WordCache', max_requests: int = 30, max_bytes: int = 5 * 1024 * 1024,
+                 budget_window: float = 3600.0, per_lookup: int = 5, delay: float = 1.0,
+                 max_queue: int = 100, session=None):
+        """
+        :param cache: 查詢快取，預取結果經由 cache.warm 存入其資料庫。
+        :param max_requests: 每個預算週期最多的請求數。
+        :param max_bytes: 每個預算週期最多下載的位元組數。
+        :param budget_window: 預算週期秒數，週期結束後重新計算。
+        :param per_lookup: 每次查詢最多排入的候選單字數量。
+        :param delay: 兩次預取之間的間隔秒數，避免占用頻寬。
+        :param max_queue: 佇列上限，超過時捨棄新的候選單字。
+        :param session: 預取使用的 requests.Session，未提供時使用快取的 Session 或自行建立。
+        """
+        self.cache = cache
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.budget_window = budget_window
+        self.per_lookup = per_lookup
+        self.delay = delay
+        self.max_queue = max_queue
+        self.session = session or cache.session
+        self._queue = queue.PriorityQueue()  # (優先順序, 序號, 單字)
+        self._queued = set()
+        self._seen = set()                   # 本週期已處理過的單字
+        self._sequence = 0
+        self._paused = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = None
+        self._window_start = time.monotonic()
+
+        # 統計
+        self.requests = 0   # 本週期的請求數
+        self.bytes = 0      # 本週期下載的位元組數
+        self.fetched = 0
+        self.skipped = 0
+        self.failed = 0
+
+
+    @staticmethod
+    def candidates(data: Dict[str, dict], limit: int = 5) -> List[str]:
+        """
+        從查詢結果取出候選單字：先取片語中的單字，再取例句中的單字，依出現順序且不重複。
+
+        頁面中的相關詞條連結目前不在 parse() 的結果裡，因此不列入。
+
+        :param data: {單字: 區塊字典}。
+        :param limit: 最多返回的單字數量。
+        :return: 候選單字的列表。
+        """
+        headwords = {headword.lower() for headword in data if headword}  # parse() 找不到字首時鍵為 None
+        phrase_texts, example_texts = [], []
+        for details in data.values():
+            for key, block in details.items():
+                if not isinstance(block, dict):
+                    continue
+                if key.startswith('phrase'):
+                    phrase_texts.append(block.get('phrase', ''))
+                example_texts.append(block.get('example_sentence', ''))
+
+        words = []
+        for text in phrase_texts + example_texts:
+            for word in Prefetcher.WORD_PATTERN.findall(text.lower()):
+                # 太短的多為功能詞；以字首開頭的多為同一個單字的變化形
+                if len(word) < 4 or word in Prefetcher.STOPWORDS or word in words \
+                        or any(word.startswith(headword) for headword in headwords):
+                    continue
+                words.append(word)
+                if len(words) >= limit:
+                    return words
+        return words
+
+
+    def submit(self, data: Dict[str, dict], priority: int = 0) -> int:
+        """
+        將查詢結果中的候選單字排入預取佇列。
+
+        :param data: {單字: 區塊字典}。
+        :param priority: 優先順序，數字越小越先處理。
+        :return: 實際排入的單字數量。
+        """
+        added = 0
+        with self._condition:
+            if self._closed:
+                return 0
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+                self._thread.start()
+            for word in Prefetcher.candidates(data, self.per_lookup):
+                if word in self._queued or word in self._seen or len(self._queued) >= self.max_queue:
+                    continue
+                self._sequence += 1
+                self._queue.put((priority, self._sequence, word))
+                self._queued.add(word)
+                added += 1
+        return added
+
+
+    def pause(self) -> None:
+        """
+        使用者查詢開始時呼叫，暫停送出新的預取請求；可巢狀呼叫。
+        """
+        with self._condition:
+            self._paused += 1
+
+
+    def resume(self) -> None:
+        """
+        使用者查詢結束時呼叫，與 pause() 成對使用。
+        """
+        with self._condition:
+            self._paused = max(self._paused - 1, 0)
+            self._condition.notify_all()
+
+
+    def close(self, timeout: float = 1.0) -> None:
+        """
+        停止預取並丟棄佇列中的單字。
+
+        :param timeout: 等待進行中請求結束的秒數，逾時則留給背景執行緒(daemon)自行結束。
+        """
+        with self._condition:
+            self._closed = True
+            thread, self._thread = self._thread, None
+            self._condition.notify_all()
+        if thread is not None:
+            self._queue.put((float('-inf'), 0, None))
+            thread.join(timeout)
+
+
+    def stats(self) -> Dict[str, int]:
+        """
+        取得預取統計。
+
+        :return: 包含 queued、requests、bytes(本週期)、fetched、skipped、failed 與 paused 的字典。
+        """
+        with self._condition:
+            return {
+                'queued': len(self._queued),
+                'requests': self.requests,
+                'bytes': self.bytes,
+                'fetched': self.fetched,
+                'skipped': self.skipped,
+                'failed': self.failed,
+                'paused': self._paused > 0,
+            }
+
+
+    def _run(self) -> None:
+        while True:
+            _, _, word = self._queue.get()
+            with self._condition:
+                if word is None or self._closed:
+                    return
+                self._queued.discard(word)
+                # 使用者查詢進行中時等待
+                while self._paused and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                if not self._within_budget():
+                    self.skipped += 1
+                    continue
+                self._seen.add(word)
+
+            try:
+                self._prefetch(word)
+            except Exception:
+                # 預取失敗不影響使用者查詢
+                with self._condition:
+                    self.failed += 1
+            time.sleep(self.delay)
+
+
+    def _within_budget(self) -> bool:
+        # 呼叫端須持有 self._condition
+        if time.monotonic() - self._window_start >= self.budget_window:
+            self._window_start = time.monotonic()
+            self.requests = self.bytes = 0
+            self._seen.clear()
+        return self.requests < self.max_requests and self.bytes < self.max_bytes
+
+
+    def _prefetch(self, word: str) -> None:
+        if self.session is None:
+            import requests
+            self.session = requests.Session()
+
+        data = self.cache.warm(word, self.session, self._count_response)
+        with self._condition:
+            if data is None:
+                self.skipped += 1
+            elif isinstance(data, dict):
+                self.fetched += 1
+
+
+    def _count_response(self, response) -> None:
+        # 只有實際送出的請求才計入預算；併入進行中查詢或命中 negative cache 時不會呼叫
+        with self._condition:
+            self.requests += 1
+            # 以傳輸大小計算頻寬，沒有 Content-Length 時改用解壓後的大小
+            self.bytes += int(response.headers.get('Content-Length') or len(response.content))
+
+
+
+class RateLimiter:
+    """
+    依主機限制請求頻率，同一主機的兩次請求至少間隔 1 / rate 秒。
+    """
+    def __init__(self, rate: float):
+        """
+        :param rate: 每秒最多請求數，0 表示不限制。
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = {}  # 主機 -> 下一個可用時間
+        self._lock = threading.Lock()
+
+
+    def wait(self, host: str) -> None:
+        """
+        等待直到可以對指定主機發出請求。
+
+        :param host: 主機名稱。
+        """
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+
+class BatchCrawler:
+    """
+    批次爬蟲，以執行緒池與共用的 keep-alive Session 同時爬取多個單字。
+    """
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+    IDLE = object()  # 輸入暫時沒有新單字：words 產生此值時先輸出已完成的結果，再繼續讀取
+
+    def __init__(self, db: Optional[str] = None, max_workers: int = 8, rate_limit: float = 5.0,
+                 retries: int = 3, backoff: float = 0.5, timeout: float = 10,
+                 base_url: Optional[str] = None, chunk_size: int = 50,
+                 snapshot_store: Optional['SnapshotStore'] = None):
+        """
+        :param db: 資料庫檔案的路徑，提供時爬取結果會邊完成邊寫入資料庫。
+        :param max_workers: 同時進行的請求數上限。
+        :param rate_limit: 每個主機每秒最多請求數，0 表示不限制。
+        :param retries: 連線失敗或伺服器忙碌時的重試次數。
+        :param backoff: 重試等待的基準秒數，每次重試加倍。
+        :param timeout: 單次請求的逾時秒數。
+        :param base_url: 字典網址前綴，測試時可指向本機伺服器。
+        :param chunk_size: 每累積多少筆成功結果寫入資料庫一次。
+        :param snapshot_store: 離線快照存放區，提供時保存頁面並以條件式請求更新。
+        """
+        self.db = db
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.base_url = base_url or DataCrawl.BASE_URL
+        self.chunk_size = chunk_size
+        self.snapshot_store = snapshot_store
+        self.limiter = RateLimiter(rate_limit)
+
+        # 連線池大小與同時請求數一致，讓每個執行緒都能重複使用連線
+        import requests
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(DataCrawl.HEADERS)
+
+        self.pending_rows = []
+
+        # 統計
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+
+
+    def crawl(self, words: Iterable[str]) -> Iterable[Tuple[str, Union[Dict[str, dict], List[str]]]]:
+        """
+        同時爬取多個單字，依完成順序產生 (查詢字, 結果)。
+
+        結果格式與 DataCrawl.crawl 相同；失敗時為狀態和訊息的列表。
+        輸入來源較慢時(例如標準輸入)，words 可在等待期間產生 BatchCrawler.IDLE，讓已完成的結果先輸出。
+
+        :param words: 單字的可迭代物件，可為產生器。
+        :return: (查詢字, 結果) 的產生器。
+        """
+        # 尚未寫入資料庫的結果；沒有資料庫時不保留，避免大量單字的結果全部留在記憶體
+        self.pending_rows = pending_rows = []
+        aliases = []  # (查詢字, 字首單字)，隨 pending_rows 一起寫入
+        words = iter(words)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = {}
+            exhausted = False
+            try:
+                while True:
+                    # 補滿工作佇列，避免一次送出全部單字
+                    idle = False
+                    while not exhausted and len(in_flight) < self.max_workers * 2:
+                        word = next(words, None)
+                        if word is None:
+                            exhausted = True
+                        elif word is BatchCrawler.IDLE:
+                            idle = True
+                            break
+                        else:
+                            in_flight[executor.submit(self.crawl_one, word)] = word
+                    if not in_flight:
+                        if exhausted:
+                            break
+                        continue
+
+                    # 輸入閒置時不等待新的完成，輸出目前已完成的結果後就回去讀取輸入
+                    done, _ = wait(in_flight, timeout=0 if idle else None, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        word = in_flight.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as error:
+                            # 單一單字的非預期錯誤(例如解析失敗)只影響該單字
+                            result = ["Error", f"ఠ_ఠ? 爬取 '{word}' 時發生錯誤：{error}"]
+                        if isinstance(result, dict):
+                            self.succeeded += 1
+                            if self.db:
+                                pending_rows.extend(result.items())
+                                aliases.append((word, next(iter(result))))
+                                if len(pending_rows) >= self.chunk_size:
+                                    WordDatas.bulk_insert(self.db, pending_rows)
+                                    WordDatas.add_aliases(self.db, aliases)
+                                    pending_rows.clear()
+                                    aliases.clear()
+                        else:
+                            self.failed += 1
+                        yield word, result
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                if self.db and pending_rows:
+                    WordDatas.bulk_insert(self.db, pending_rows)
+                    WordDatas.add_aliases(self.db, aliases)
+
+
+    def crawl_one(self, word: str) -> Union[Dict[str, dict], List[str]]:
+        """
+        爬取單一單字，連線錯誤與 429/5xx 狀態會依指數退避重試。
+
+        :param word: 要查詢的單字。
+        :return: {單字: 區塊字典}，失敗時返回狀態和訊息的列表。
+        """
+        from requests import RequestException
+
+        crawler = DataCrawl(word, base_url=self.base_url, session=self.session, timeout=self.timeout,
+                            snapshot_store=self.snapshot_store)
+        host = urlparse(crawler.url).netloc
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.retried += 1
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+            self.limiter.wait(host)
+            try:
+                response = crawler.fetch()
+            except RequestException as error:
+                message = f"ఠ_ఠ? 爬取 '{word}' 時發生錯誤：{error}"
+                continue
+            if response.status_code in BatchCrawler.RETRY_STATUS:
+                message = f"ఠ_ఠ? 爬取 '{word}' 時伺服器回應 {response.status_code}"
+                continue
+            try:
+                html = crawler.read(response)
+            except RequestException as error:
+                # 其他錯誤狀態(例如 403)重試也無效
+                return ["Error", str(error)]
+            return crawler.log(crawler.parse(html))
+
+        return ["Error", message]
+
+
+
+
+class ArticleAnalyzer:
+    """
+    文章單字分析：將文章斷詞，一次比對 Word 資料表，回報已收錄與未收錄的單字，未收錄的可交給 BatchCrawler 批次爬取。
+
+    比對方式：
+        - 預設將所有 english_word 載入記憶體集合並快取，資料表有新增或刪除時(筆數或最大 ID 改變)自動重新載入
+        - cache_vocabulary=False 時改將不重複的單字寫入暫存資料表，以一次 JOIN 查詢比對
+    變化形(複數、過去式、進行式等)會以簡單的字尾規則還原後再比對一次。
+    """
+    TOKEN_PATTERN = re.compile(r"[a-z]+(?:['’-][a-z]+)*")
+    SUFFIXES = (('ies', 'y'), ('ied', 'y'), ('ing', ''), ('ing', 'e'), ('es', ''), ('ed', ''), ('ed', 'e'),
+                ('s', ''), ('er', ''), ('est', ''), ('ly', ''))
+    NEGATIONS = {"can't": 'can', "won't": 'will', "shan't": 'shall', "ain't": ''}  # 去掉 n't 後不是原形的否定縮寫
+
+    def __init__(self, db: str, cache_vocabulary: bool = True):
+        """
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param cache_vocabulary: 是否將單字表快取在記憶體。
+        """
+        self.db = db
+        self.cache_vocabulary = cache_vocabulary
+        self._vocabulary = None  # 已收錄單字的集合
+        self._version = None     # (筆數, 最大 ID)，用於判斷快取是否過期
+        self._lock = threading.Lock()
+
+
+    @staticmethod
+    def tokenize(text: str) -> Dict[str, int]:
+        """
+        斷詞並計算每個單字出現的次數。
+
+        :param text: 文章內容。
+        :return: {單字(小寫): 出現次數}，依第一次出現的順序排列。
+        """
+        counts = {}
+        for token in ArticleAnalyzer.TOKEN_PATTERN.findall(text.lower()):
+            # 所有格與縮寫：it's → it、they're → they；否定縮寫還原為助動詞：don't → do、can't → can、won't → will
+            token = token.replace('’', "'")
+            if "'" in token:
+                head, _, rest = token.partition("'")
+                if (rest == 't' or rest.startswith("t'")) and head.endswith('n'):
+                    token = ArticleAnalyzer.NEGATIONS.get(head + "'t", head[:-1])
+                else:
+                    token = head
+            if len(token) > 1:
+                counts[token] = counts.get(token, 0) + 1
+        return counts
+
+
+    def vocabulary(self) -> frozenset:
+        """
+        取得已收錄單字的集合，資料表有變動時重新載入。
+
+        :return: english_word 的集合。
+        """
+        conn = db_connections.get(self.db)
+        version = tuple(conn.execute('''SELECT COUNT(*), MAX(ID) FROM Word;''').fetchone())
+        with self._lock:
+            if self._vocabulary is None or version != self._version:
+                rows = conn.execute('''SELECT english_word FROM Word;''')
+                self._vocabulary = frozenset(row[0] for row in rows)
+                self._version = version
+            return self._vocabulary
+
+
+    def resolve(self, words: Iterable[str]) -> frozenset:
+        """
+        找出已收錄的單字。
+
+        :param words: 不重複的單字。
+        :return: 其中已收錄於 Word 資料表的單字集合。
+        """
+        if self.cache_vocabulary:
+            return self.vocabulary().intersection(words)
+
+        conn = db_connections.get(self.db)
+        with conn:
+            conn.execute('''CREATE TEMP TABLE IF NOT EXISTS ArticleToken (word TEXT PRIMARY KEY) WITHOUT ROWID;''')
+            conn.execute('''DELETE FROM temp.ArticleToken;''')
+            conn.executemany('''INSERT OR IGNORE INTO temp.ArticleToken (word) VALUES (?);''', ((word,) for word in words))
+            rows = conn.execute('''SELECT t.word FROM temp.ArticleToken t JOIN Word w ON w.english_word = t.word;''').fetchall()
+            conn.execute('''DELETE FROM temp.ArticleToken;''')
+        return frozenset(row[0] for row in rows)
+
+
+    def analyze(self, text: str) -> Dict[str, Union[int, Dict[str, int], Dict[str, str]]]:
+        """
+        分析文章中的單字。
+
+        :param text: 文章內容。
+        :return: 包含以下 key 的字典：
+                 - tokens (int): 單字總數
+                 - distinct (int): 不重複單字數
+                 - known (dict): 已收錄的 {單字: 出現次數}
+                 - forms (dict): 以變化形比對到的 {文章中的單字: 收錄的單字}
+                 - unknown (dict): 未收錄的 {單字: 出現次數}，依出現次數由多到少排序
+        """
+        counts = ArticleAnalyzer.tokenize(text)
+        known_words = self.resolve(counts)
+
+        # 未收錄的單字再以還原後的字形比對一次
+        missing = [word for word in counts if word not in known_words]
+        candidates = {word: ArticleAnalyzer.base_forms(word) for word in missing}
+        base_known = self.resolve({base for bases in candidates.values() for base in bases})
+
+        known, forms, unknown = {}, {}, {}
+        for word, count in counts.items():
+            if word in known_words:
+                known[word] = count
+                continue
+            base = next((base for base in candidates[word] if base in base_known), None)
+            if base is None:
+                unknown[word] = count
+            else:
+                forms[word] = base
+                known[base] = known.get(base, 0) + count
+
+        return {
+            'tokens': sum(counts.values()),
+            'distinct': len(counts),
+            'known': known,
+            'forms': forms,
+            'unknown': dict(sorted(unknown.items(), key=lambda item: -item[1])),
+        }
+
+
+    def analyze_article(self, article_source: str) -> Optional[Dict[str, Union[int, Dict[str, int], Dict[str, str]]]]:
+        """
+        分析已存入資料庫的文章。
+
+        :param article_source: 文章來源。
+        :return: 與 analyze() 相同的字典，找不到文章時返回 None。
+        """
+        row = db_connections.get(self.db).execute('''SELECT article_content FROM Article WHERE article_source = ?;''',
+                                                  (article_source,)).fetchone()
+        return self.analyze(row['article_content']) if row is not None else None
+
+
+    def crawl_unknown(self, result: Dict[str, dict], min_count: int = 1, limit: Optional[int] = None,
+                      **options) -> Iterable[Tuple[str, Union[Dict[str, dict], List[str]]]]:
+        """
+        將未收錄的單字交給 BatchCrawler 批次爬取並寫入資料庫，出現次數多的先爬。
+
+        :param result: analyze() 的結果。
+        :param min_count: 出現次數少於此值的單字不爬取。
+        :param limit: 最多爬取的單字數量。
+        :param options: 傳給 BatchCrawler 的參數，例如 max_workers、rate_limit。
+        :return: BatchCrawler.crawl 的 (查詢字, 結果) 產生器。
+        """
+        words = [word for word, count in result['unknown'].items() if count >= min_count][:limit]
+        return BatchCrawler(db=self.db, **options).crawl(words)
+
+
+    @staticmethod
+    def base_forms(word: str) -> List[str]:
+        """
+        以字尾規則產生可能的原形，例如 studies → study、running → run。
+
+        :param word: 單字(小寫)。
+        :return: 可能的原形列表，可能包含不存在的字。
+        """
+        forms = []
+        for suffix, replacement in ArticleAnalyzer.SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+                stem = word[:-len(suffix)]
+                forms.append(stem + replacement)
+                # 重複字尾子音：running → run、stopped → stop
+                if not replacement and len(stem) >= 3 and stem[-1] == stem[-2]:
+                    forms.append(stem[:-1])
+        return forms
+
+
+
+
+class BackgroundTasks:
+    """
+    背景工作執行器：在執行緒池執行爬蟲與資料庫工作，完成後由 UI 執行緒呼叫 poll() 執行回呼。
+
+    同一個 channel 只保留最新提交的工作；較早提交或已取消的工作完成時，結果會被丟棄，
+    例如使用者已改查其他單字時，舊查詢的結果不會再顯示。
+    """
+    def __init__(self, max_workers: int = 4):
+        """
+        :param max_workers: 背景執行緒數量。
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='background')
+        self._results = queue.SimpleQueue()
+        self._generations = {}  # channel -> 最新工作的序號
+        self._futures = {}      # channel -> 最新工作的 Future
+        self._lock = threading.Lock()
+
+
+    def submit(self, func: Callable, *args, on_done: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, channel: Optional[str] = None) -> None:
+        """
+        提交背景工作。
+
+        :param func: 要在背景執行的函式。
+        :param args: 函式參數。
+        :param on_done: 成功時以回傳值呼叫，於 poll() 所在的執行緒執行。
+        :param on_error: 發生例外時以例外物件呼叫，於 poll() 所在的執行緒執行。
+        :param channel: 工作通道名稱，同通道的新工作會取代舊工作。
+        """
+        with self._lock:
+            generation = self._generations.get(channel, 0) + 1
+            if channel is not None:
+                self._generations[channel] = generation
+                previous = self._futures.pop(channel, None)
+                if previous is not None:
+                    previous.cancel()  # 尚未開始執行的舊工作直接取消
+
+            future = self._executor.submit(func, *args)
+            if channel is not None:
+                self._futures[channel] = future
+        future.add_done_callback(lambda done: self._results.put((channel, generation, done, on_done, on_error)))
+
+
+    def cancel(self, channel: str) -> None:
+        """
+        取消通道中的工作；已在執行的工作會跑完，但結果會被丟棄。
+
+        :param channel: 工作通道名稱。
+        """
+        with self._lock:
+            self._generations[channel] = self._generations.get(channel, 0) + 1
+            future = self._futures.pop(channel, None)
+        if future is not None:
+            future.cancel()
+
+
+    def pending(self, channel: str) -> bool:
+        """
+        檢查通道是否有尚未完成的工作。
+
+        :param channel: 工作通道名稱。
+        :return: 有未完成工作時為 True。
+        """
+        with self._lock:
+            future = self._futures.get(channel)
+        return future is not None and not future.done()
+
+
+    def poll(self) -> int:
+        """
+        執行已完成工作的回呼，應由 UI 執行緒定期呼叫(例如 root.after)。
+
+        :return: 執行的回呼數量。
+        """
+        handled = 0
+        while True:
+            try:
+                channel, generation, future, on_done, on_error = self._results.get_nowait()
+            except queue.Empty:
+                return handled
+
+            with self._lock:
+                stale = channel is not None and self._generations.get(channel) != generation
+                if not stale and channel is not None and self._futures.get(channel) is future:
+                    del self._futures[channel]
+            if stale or future.cancelled():
+                continue
+
+            error = future.exception()
+            if error is not None:
+                if on_error is not None:
+                    on_error(error)
+            elif on_done is not None:
+                on_done(future.result())
+            handled += 1
+
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        停止接受新工作並放棄尚未開始的工作。
+
+        :param wait: 為 True 時等待執行中的工作結束，例如關閉資料庫連線之前。
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
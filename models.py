@@ -0,0 +1,163 @@
+"""
+單字資料模型。
+
+爬蟲與資料庫之間仍以 {單字: {"block1": {...}, "phrase1": {...}}} 的字典格式交換(與 Word.description 的 JSON 相同)，
+介面與其他需要逐項處理的地方改用以下具型別、使用 __slots__ 的資料類別：
+    Word     單字，包含依序排列的 senses(解釋)與 phrases(片語)
+    Sense    單字解釋(block*)
+    Phrase   片語(phrase*)
+    Example  例句與例句翻譯
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from lib import WordDatas
+
+
+@dataclass(slots=True)
+class Example:
+    """例句與例句翻譯。"""
+    sentence: str = 'N/A'
+    translation: str = 'N/A'
+
+
+
+@dataclass(slots=True)
+class Sense:
+    """單字解釋，對應區塊字典中的 block* 項目。"""
+    key: str
+    word_class: str = 'N/A'
+    description: str = 'N/A'
+    word_translation: str = 'N/A'
+    example: Example = field(default_factory=Example)
+
+    @staticmethod
+    def from_dict(key: str, data: Dict[str, str]) -> 'Sense':
+        """
+        :param key: 區塊名稱，例如 block1。
+        :param data: 區塊內容字典。
+        :return: Sense 物件。
+        """
+        return Sense(key, data.get('word_class', 'N/A'), data.get('description', 'N/A'), data.get('word_translation', 'N/A'),
+                     Example(data.get('example_sentence', 'N/A'), data.get('example_sentence_translation', 'N/A')))
+
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        :return: 區塊內容字典。
+        """
+        return {
+            'word_class': self.word_class,
+            'description': self.description,
+            'word_translation': self.word_translation,
+            'example_sentence': self.example.sentence,
+            'example_sentence_translation': self.example.translation,
+        }
+
+
+
+@dataclass(slots=True)
+class Phrase:
+    """片語，對應區塊字典中的 phrase* 項目。"""
+    key: str
+    phrase: str = 'N/A'
+    description: str = 'N/A'
+    example: Example = field(default_factory=Example)
+
+    @staticmethod
+    def from_dict(key: str, data: Dict[str, str]) -> 'Phrase':
+        """
+        :param key: 區塊名稱，例如 phrase1。
+        :param data: 區塊內容字典。
+        :return: Phrase 物件。
+        """
+        return Phrase(key, data.get('phrase', 'N/A'), data.get('description', 'N/A'),
+                      Example(data.get('example_sentence', 'N/A'), data.get('example_sentence_translation', 'N/A')))
+
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        :return: 區塊內容字典。
+        """
+        return {
+            'phrase': self.phrase,
+            'description': self.description,
+            'example_sentence': self.example.sentence,
+            'example_sentence_translation': self.example.translation,
+        }
+
+
+
+@dataclass(slots=True)
+class Word:
+    """單字與其解釋、片語。"""
+    english_word: str
+    senses: List[Sense] = field(default_factory=list)
+    phrases: List[Phrase] = field(default_factory=list)
+    crawled_at: Optional[float] = None
+
+    @staticmethod
+    def from_details(english_word: str, details: Dict[str, Dict[str, str]], crawled_at: Optional[float] = None) -> 'Word':
+        """
+        由區塊字典建立，只走訪一次，依鍵的前綴分到 senses 或 phrases。
+
+        :param english_word: 單字。
+        :param details: 區塊字典。
+        :param crawled_at: 爬取時間。
+        :return: Word 物件。
+        """
+        word = Word(english_word, crawled_at=crawled_at)
+        for key, data in details.items():
+            if not isinstance(data, dict):
+                continue
+            if key.startswith('phrase'):
+                word.phrases.append(Phrase.from_dict(key, data))
+            else:
+                word.senses.append(Sense.from_dict(key, data))
+        return word
+
+
+    @staticmethod
+    def from_data(data: Dict[str, Dict[str, Dict[str, str]]]) -> 'Word':
+        """
+        由 DataCrawl.crawl / WordCache.lookup 的結果建立(取第一個單字)。
+
+        :param data: {單字: 區塊字典}。
+        :return: Word 物件。
+        """
+        english_word, details = next(iter(data.items()))
+        return Word.from_details(english_word, details)
+
+
+    @staticmethod
+    def from_row(row) -> 'Word':
+        """
+        由 Word 資料表的一列建立。
+
+        :param row: 含 english_word、description(可含 crawled_at)欄位的 sqlite3.Row。
+        :return: Word 物件。
+        """
+        crawled_at = row['crawled_at'] if 'crawled_at' in row.keys() else None
+        return Word.from_details(row['english_word'], WordDatas.load_description(row['description']), crawled_at)
+
+
+    def to_details(self) -> Dict[str, Dict[str, str]]:
+        """
+        :return: 區塊字典，解釋在前、片語在後。
+        """
+        details = {sense.key: sense.to_dict() for sense in self.senses}
+        details.update((phrase.key, phrase.to_dict()) for phrase in self.phrases)
+        return details
+
+
+    def to_data(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """
+        :return: {單字: 區塊字典}，可直接交給 WordDatas.insert_word / bulk_insert。
+        """
+        return {self.english_word: self.to_details()}
+
+
+    def to_row(self) -> Tuple[str, str, Optional[float]]:
+        """
+        :return: (english_word, description JSON, crawled_at)，與 Word 資料表欄位順序相同。
+        """
+        return self.english_word, WordDatas.dump_description(self.to_details()), self.crawled_at
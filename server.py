@@ -0,0 +1,394 @@
+"""
+本機單字查詢 HTTP/JSON 服務(asyncio)。
+
+多個工具共用同一份記憶體快取、同一個資料庫與同一組上游連線：
+    - 資料庫已有的單字直接回傳，沒有時才爬取並存入資料庫
+    - 同一個單字同時被多個請求查詢時，只會向上游爬取一次
+    - 回應附 ETag，客戶端帶 If-None-Match 時回應 304
+    - 支援 HTTP/1.1 keep-alive，客戶端可重複使用連線
+    - 啟用拼字建議(--spelling / --word-list)時，查無單字的回應附上相近的單字(suggestions)；
+      單字清單沒有收錄、可能拼錯的字回應 404 與 "suggest": true，可加 force=1 仍連網查詢
+
+端點：
+    GET /lookup?word=apple[&offline=1][&force=1]   查詢單字，force=1 略過拼字檢查
+    GET /metrics                          延遲直方圖、快取命中、合併請求與省下的上游請求統計
+    GET /trace[?enable=1|0]               查詢流程各階段的 p50/p95/p99 與最近的查詢紀錄，可於執行中啟用或停用計時
+
+使用方式：
+    python server.py --port 8765 --db word_traslation.db
+    curl 'http://127.0.0.1:8765/lookup?word=apple'
+"""
+import argparse, asyncio, hashlib, json, sys, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+from lib import WordCache, CrawlLog, DataCrawl, Prefetcher, db_connections
+from service import WordService
+from tracing import tracer
+
+
+class LatencyHistogram:
+    """
+    累積式延遲直方圖(毫秒)，格式與 Prometheus histogram 相同：每個桶記錄小於等於上限的次數。
+    """
+    BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self.counts = [0] * (len(LatencyHistogram.BUCKETS) + 1)  # 最後一格為 +Inf
+        self.count = 0
+        self.total = 0.0
+
+
+    def observe(self, milliseconds: float) -> None:
+        """
+        記錄一次延遲。
+
+        :param milliseconds: 延遲毫秒數。
+        """
+        self.count += 1
+        self.total += milliseconds
+        for index, bound in enumerate(LatencyHistogram.BUCKETS):
+            if milliseconds <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        :return: 包含累積桶(le)、次數與總和的字典。
+        """
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(LatencyHistogram.BUCKETS + ('+Inf',), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {'buckets': buckets, 'count': self.count, 'sum_ms': round(self.total, 3)}
+
+
+
+
+class BadRequest(Exception):
+    """
+    無法解析的請求(格式錯誤的 Content-Length、過長的請求列或標頭)，回應錯誤後關閉連線。
+    """
+    def __init__(self, status: int, message: str):
+        """
+        :param status: 回應的狀態碼，400 或 431。
+        :param message: 錯誤訊息。
+        """
+        super().__init__(message)
+        self.status = status
+
+
+
+
+class LookupServer:
+    """
+    LookupServer 類別以 asyncio 處理 HTTP 連線，查詢工作交給執行緒池執行。
+    """
+    REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+
+    def __init__(self, service: WordService, max_workers: int = 8, response_cache: int = 1024):
+        """
+        :param service: 單字服務，所有請求共用其快取與資料庫。
+        :param max_workers: 同時執行查詢(資料庫與爬蟲)的執行緒數。
+        :param response_cache: 最多保留的已編碼回應數量。
+        """
+        self.service = service
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lookup")
+        self.response_cache = response_cache
+        self._responses = OrderedDict()  # (單字, 是否離線, 是否略過拼字檢查) -> (到期時間, 狀態碼, 內容, ETag)
+        self._in_flight = {}             # (單字, 是否離線, 是否略過拼字檢查) -> 進行中的查詢 Future
+
+        # 統計
+        self.started_at = time.time()
+        self.requests = 0
+        self.coalesced = 0
+        self.response_hits = 0
+        self.not_modified = 0
+        self.latency = {}  # 端點 -> LatencyHistogram
+
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        處理一條連線上的所有請求(keep-alive)。
+        """
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except BadRequest as error:
+                    # 請求邊界已無法確定，回應錯誤後關閉連線
+                    self.requests += 1
+                    writer.write(self._response(error.status, self._json({'error': f"ఠ_ఠ? {error}"}), {}, False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+
+                start = time.perf_counter()
+                path = urlsplit(target).path
+                try:
+                    status, body, extra = await self.dispatch(method, target, headers)
+                except Exception as error:
+                    status, body, extra = 500, self._json({'error': f"ఠ_ఠ? 伺服器錯誤：{error}"}), {}
+                self.requests += 1
+                self.latency.setdefault(path if path in ('/lookup', '/metrics', '/trace') else 'other', LatencyHistogram()) \
+                    .observe((time.perf_counter() - start) * 1000)
+
+                keep_alive = version == "HTTP/1.1" and headers.get('connection', '').lower() != 'close'
+                writer.write(self._response(status, body, extra, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+    async def dispatch(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, bytes, Dict[str, str]]:
+        """
+        依路徑分派請求。
+
+        :return: (狀態碼, 回應內容, 額外標頭)。
+        """
+        if method != "GET":
+            return 405, self._json({'error': "ఠ_ఠ? 只支援 GET"}), {'Allow': "GET"}
+
+        url = urlsplit(target)
+        if url.path == '/metrics':
+            return 200, self._json(self.metrics()), {}
+        if url.path == '/trace':
+            return 200, self._json(self.trace(parse_qs(url.query))), {}
+        if url.path != '/lookup':
+            return 404, self._json({'error': f"ఠ_ఠ? 沒有這個路徑：{url.path}"}), {}
+
+        query = parse_qs(url.query)
+        word = query.get('word', [''])[0].strip().lower()
+        if not word:
+            return 400, self._json({'error': "ఠ_ఠ? 請提供 word 參數"}), {}
+        offline = query.get('offline', ['0'])[0] in ('1', 'true')
+        force = query.get('force', ['0'])[0] in ('1', 'true')
+
+        status, body, etag = await self.lookup(word, offline, force)
+        if headers.get('if-none-match') == etag:
+            self.not_modified += 1
+            return 304, b"", {'ETag': etag}
+        return status, body, {'ETag': etag}
+
+
+    async def lookup(self, word: str, offline: bool = False, force: bool = False) -> Tuple[int, bytes, str]:
+        """
+        查詢單字並編碼回應；同一個單字的同時請求共用同一次查詢。
+
+        :return: (狀態碼, 回應內容, ETag)。
+        """
+        key = (word, offline, force)
+        cached = self._get_response(key)
+        if cached is not None:
+            self.response_hits += 1
+            return cached
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, self._lookup_and_encode, word, offline, force)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # shield：單一客戶端斷線不會取消其他請求共用的查詢
+        status, body, etag = await asyncio.shield(future)
+        if status == 200:
+            self._put_response(key, (status, body, etag))
+        return status, body, etag
+
+
+    def metrics(self) -> Dict[str, object]:
+        """
+        :return: 服務統計字典。
+        """
+        return {
+            'uptime_s': round(time.time() - self.started_at, 1),
+            'requests': self.requests,
+            'in_flight': len(self._in_flight),
+            'coalesced': self.coalesced,
+            'response_cache_hits': self.response_hits,
+            'not_modified': self.not_modified,
+            'cache': self.service.cache.stats(),
+            'upstream': self.service.cache.coordinator.stats(),
+            'prefetch': self.service.prefetcher.stats() if self.service.prefetcher is not None else None,
+            'latency_ms': {path: histogram.snapshot() for path, histogram in self.latency.items()},
+        }
+
+
+    @staticmethod
+    def trace(query: Dict[str, List[str]]) -> Dict[str, object]:
+        """
+        :param query: 查詢參數，enable=1 啟用計時、enable=0 停用。
+        :return: 計時狀態、各階段統計與最近 20 筆查詢紀錄。
+        """
+        enable = query.get('enable', [''])[0]
+        if enable in ('1', 'true'):
+            tracer.enable()
+        elif enable in ('0', 'false'):
+            tracer.disable()
+        return {'enabled': tracer.enabled, 'summary': tracer.summary(), 'recent': tracer.traces()[-20:]}
+
+
+    def _lookup_and_encode(self, word: str, offline: bool, force: bool = False) -> Tuple[int, bytes, str]:
+        # 在執行緒池執行：查詢並在背景執行緒完成 JSON 編碼
+        data = self.service.lookup(word, offline=offline, force=force)
+        if isinstance(data, list):
+            status, body = 404, self._json({'query': word, 'error': data[1], 'suggestions': self.service.suggest(word),
+                                            'suggest': data[0] == "Suggest"})
+        else:
+            status, body = 200, self._json({'query': word, 'words': data})
+        return status, body, '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+    def _get_response(self, key) -> Optional[Tuple[int, bytes, str]]:
+        entry = self._responses.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._responses[key]
+            return None
+        self._responses.move_to_end(key)
+        return response
+
+
+    def _put_response(self, key, response: Tuple[int, bytes, str]) -> None:
+        # 與記憶體快取相同的存活時間
+        self._responses[key] = (time.monotonic() + self.service.cache.ttl, response)
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.response_cache:
+            self._responses.popitem(last=False)
+
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str]]]:
+        # 讀取請求列與標頭，連線結束時返回 None，無法解析時拋出 BadRequest
+        line = await LookupServer._read_line(reader)
+        if not line:
+            return None
+        parts = line.decode('latin-1').split()
+        if len(parts) != 3:
+            raise BadRequest(400, "請求列格式錯誤")
+        headers = {}
+        while True:
+            line = await LookupServer._read_line(reader)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        # GET 通常沒有內容，有的話讀掉以免影響下一個請求
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            raise BadRequest(400, f"Content-Length 格式錯誤：{headers['content-length']}")
+        if length < 0:
+            raise BadRequest(400, f"Content-Length 格式錯誤：{length}")
+        if length:
+            await reader.readexactly(length)
+        method, target, version = parts
+        return method, target, version, headers
+
+
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader) -> bytes:
+        # 超過 StreamReader 上限(預設 64KB)的一行，readline 會拋出 ValueError 或 LimitOverrunError
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise BadRequest(431, "請求列或標頭過長")
+
+
+    @staticmethod
+    def _json(data) -> bytes:
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+    @staticmethod
+    def _response(status: int, body: bytes, extra: Dict[str, str], keep_alive: bool) -> bytes:
+        lines = [f"HTTP/1.1 {status} {LookupServer.REASONS.get(status, '')}",
+                 "Content-Type: application/json; charset=utf-8",
+                 f"Content-Length: {len(body)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{name}: {value}" for name, value in extra.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body
+
+
+
+
+async def serve(host: str, port: int, lookup_server: LookupServer) -> None:
+    server = await asyncio.start_server(lookup_server.handle, host, port)
+    print(f"٩(⚙ᴗ⚙)۶ 查詢服務已啟動：http://{host}:{port}/lookup?word=", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="本機單字查詢 HTTP/JSON 服務")
+    parser.add_argument('--host', default="127.0.0.1", help="監聽位址")
+    parser.add_argument('--port', type=int, default=8765, help="監聽埠號")
+    parser.add_argument('--db', default="word_traslation.db", help="資料庫路徑")
+    parser.add_argument('--workers', type=int, default=8, help="同時執行查詢的執行緒數")
+    parser.add_argument('--cache-size', type=int, default=4096, help="記憶體快取最多保留的單字數量")
+    parser.add_argument('--crawl-log', help="將爬取結果另外寫入此 JSONL 紀錄檔(可輪替壓縮)")
+    parser.add_argument('--prefetch', type=int, default=0, metavar='N',
+                        help="查詢後於背景預取相關單字，每小時最多 N 次請求，0 表示不預取")
+    parser.add_argument('--spelling', action='store_true',
+                        help="啟用拼字建議，查無單字時回應相近的單字(索引常駐記憶體，10 萬字約 220MB)")
+    parser.add_argument('--spelling-distance', type=int, default=2, choices=(1, 2),
+                        help="拼字建議的最大編輯距離，1 可將索引記憶體降為約三分之一")
+    parser.add_argument('--word-list', help="拼字建議使用的單字清單(每行一個單字)，可能拼錯的字不連網即回應建議(force=1 仍連網查詢)")
+    parser.add_argument('--trace', action='store_true', help="啟動時即啟用查詢流程計時(亦可經由 /trace?enable=1 切換)")
+    args = parser.parse_args(argv)
+    if args.trace:
+        tracer.enable()
+
+    # 所有爬取共用一個 keep-alive Session，連線池大小與執行緒數一致
+    import requests
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=args.workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    cache = WordCache(args.db, capacity=args.cache_size, session=session)
+    prefetcher = Prefetcher(cache, max_requests=args.prefetch) if args.prefetch > 0 else None
+    service = WordService(args.db, cache, prefetcher)
+    result = service.init()
+    if result is not None:
+        print(result[1], file=sys.stderr)
+        return 1
+    if args.spelling or args.word_list:
+        service.enable_spelling(args.word_list, args.spelling_distance)
+
+    if args.crawl_log:
+        DataCrawl.crawl_log = CrawlLog(args.crawl_log)
+
+    lookup_server = LookupServer(service, max_workers=args.workers)
+    try:
+        asyncio.run(serve(args.host, args.port, lookup_server))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        lookup_server.executor.shutdown(wait=False, cancel_futures=True)
+        if prefetcher is not None:
+            prefetcher.close()
+        db_connections.close_all()
+        if DataCrawl.crawl_log is not None:
+            DataCrawl.crawl_log.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
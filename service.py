@@ -0,0 +1,260 @@
+"""
+單字服務層：查詢、儲存、列出、修改與刪除單字，以及查詢紀錄。
+
+不依賴 Tk 與顯示環境，批次工作與其他介面可直接匯入；app.py 只負責把這些操作包裝成視窗。
+
+使用方式：
+    from service import WordService
+
+    service = WordService("word_traslation.db")
+    service.init()
+    data = service.lookup("apple")
+
+    # 啟用背景預取：查詢後預先爬取片語與例句中的單字
+    from lib import Prefetcher
+    service.prefetcher = Prefetcher(service.cache, max_requests=30)
+"""
+import sqlite3
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from lib import WordDatas, HistoryData, WordCache, Prefetcher, SpellingIndex
+from models import Word
+
+
+class WordService:
+    """
+    WordService 類別整合查詢快取(WordCache)與資料表操作(WordDatas)。
+
+    修改與刪除會同步清除快取，呼叫端不需自行維護快取一致性。
+    """
+    def __init__(self, db: str = "word_traslation.db", cache: Optional[WordCache] = None,
+                 prefetcher: Optional[Prefetcher] = None):
+        """
+        :param db: 資料庫檔案的路徑，型態為字串(str)。
+        :param cache: 查詢快取，未提供時建立預設的 WordCache。
+        :param prefetcher: 背景預取器，提供時連網查詢期間暫停預取，查詢後預取結果中的相關單字。
+        """
+        self.db = db
+        self.cache = cache if cache is not None else WordCache(db)
+        self.prefetcher = prefetcher
+
+
+    def init(self) -> Optional[List[str]]:
+        """
+        建立資料表並執行必要的結構遷移。
+
+        :return: 成功時返回 None，失敗時返回狀態和訊息的列表。
+        """
+        return WordDatas.init_db(self.db) or HistoryData.initialize_database(self.db)
+
+
+
+    def lookup(self, word: str, offline: bool = False, force: bool = False,
+               on_insert: Optional[Callable[[str], None]] = None) -> Union[Dict[str, dict], List[str]]:
+        """
+        查詢單字(記憶體 → 資料庫 → 網路)，查到的新單字會存入資料庫。
+
+        :param word: 要查詢的英文單字，型態為字串(str)。
+        :param offline: 為 True 時只查本機快取與資料庫，不連網。
+        :param force: 為 True 時略過拼字檢查(見 WordCache.lookup)。
+        :param on_insert: 新單字存入資料庫時以字首單字呼叫，於查詢的執行緒執行。
+        :return: {單字: 區塊字典}，查無單字或可能拼錯時返回狀態和訊息的列表。
+        """
+        if self.prefetcher is None or offline:
+            return self.cache.lookup(word, offline=offline, force=force, on_insert=on_insert)
+
+        # 使用者查詢優先，查詢期間預取讓出頻寬
+        self.prefetcher.pause()
+        try:
+            data = self.cache.lookup(word, force=force, on_insert=on_insert)
+        finally:
+            self.prefetcher.resume()
+        if isinstance(data, dict):
+            # 越常查的單字，其相關單字越優先預取
+            self.prefetcher.submit(data, priority=-HistoryData.hits(self.db, word))
+        return data
+
+
+    def lookup_word(self, word: str, offline: bool = False, force: bool = False,
+                    on_insert: Optional[Callable[[str], None]] = None) -> Union[Word, List[str]]:
+        """
+        與 lookup 相同，但返回 Word 物件。
+
+        :param word: 要查詢的英文單字，型態為字串(str)。
+        :param offline: 為 True 時只查本機快取與資料庫，不連網。
+        :param force: 為 True 時略過拼字檢查。
+        :param on_insert: 新單字存入資料庫時以字首單字呼叫。
+        :return: Word 物件，查無單字或可能拼錯時返回狀態和訊息的列表。
+        """
+        data = self.lookup(word, offline=offline, force=force, on_insert=on_insert)
+        return data if isinstance(data, list) else Word.from_data(data)
+
+
+    def store(self, data: Dict[str, dict]) -> List[str]:
+        """
+        儲存爬取結果，已存在的單字以新內容覆蓋(使用者修改過的單字除外)。
+
+        :param data: {單字: 區塊字典}。
+        :return: 狀態和訊息的列表，表示儲存結果。
+        """
+        result = WordDatas.bulk_insert(self.db, data.items())
+        for word in data:
+            self.cache.invalidate(word)
+        return result
+
+
+    def get(self, word: str) -> Optional[sqlite3.Row]:
+        """
+        只從資料庫取出單字，不連網。
+
+        :param word: 要查詢的英文單字，型態為字串(str)。
+        :return: 若存在則返回該單字的資料(sqlite3.Row)，否則返回 None。
+        """
+        return WordDatas.search_data(self.db, word)
+
+
+    def get_word(self, word: str) -> Optional[Word]:
+        """
+        只從資料庫取出單字，不連網。
+
+        :param word: 要查詢的英文單字，型態為字串(str)。
+        :return: 若存在則返回 Word 物件，否則返回 None。
+        """
+        row = WordDatas.search_data(self.db, word)
+        return Word.from_row(row) if row is not None else None
+
+
+
+    def list_words(self, after: Optional[str] = None, limit: int = 60) -> List[str]:
+        """
+        依字母順序分頁列出單字。
+
+        :param after: 上一頁的最後一個單字，None 表示從第一個單字開始。
+        :param limit: 最多取出的單字數量。
+        :return: 單字名稱的列表。
+        """
+        return WordDatas.select_page(self.db, after=after, limit=limit)
+
+
+    def export(self) -> Iterable[Dict[str, Union[str, dict, float, None]]]:
+        """
+        依字母順序匯出所有單字。
+
+        :return: 包含 english_word、description(已解碼)與 crawled_at 的字典產生器。
+        """
+        for row in WordDatas.iter_words(self.db):
+            yield {'english_word': row['english_word'],
+                   'description': WordDatas.load_description(row['description']),
+                   'crawled_at': row['crawled_at']}
+
+
+    def count(self) -> int:
+        """
+        :return: 資料庫中的單字數量。
+        """
+        return WordDatas.count_words(self.db)
+
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Union[str, float]]]:
+        """
+        全文檢索單字、片語、翻譯與例句。
+
+        :param query: 搜尋文字，可混合英文與中文。
+        :param limit: 最多返回的筆數。
+        :return: 依相關程度排序的結果列表。
+        """
+        return WordDatas.search_text(self.db, query, limit)
+
+
+
+    def update(self, data: dict) -> List[str]:
+        """
+        修改單字內容，修改後的單字不會再被背景更新覆蓋。
+
+        :param data: 包含 english_word 與 description 的字典。
+        :return: 狀態和訊息的列表，表示更新結果。
+        """
+        result = WordDatas.update_word(self.db, data)
+        self.cache.invalidate(data['english_word'])
+        return result
+
+
+    def delete(self, word: str) -> List[str]:
+        """
+        刪除單字。
+
+        :param word: 要刪除的英文單字名稱，型態為字串(str)。
+        :return: 狀態和訊息的列表，表示刪除結果。
+        """
+        result = WordDatas.delete_word(self.db, word)
+        self.cache.invalidate(word)
+        return result
+
+
+
+    def record_history(self, word: str) -> List[str]:
+        """
+        記錄一次使用者查詢(次數與時間)。
+
+        :param word: 查詢的英文單字，型態為字串(str)。
+        :return: 狀態和訊息的列表，表示記錄結果。
+        """
+        return HistoryData.record(self.db, word)
+
+
+    def recent_history(self, limit: int = 15) -> List[str]:
+        """
+        :param limit: 最多取出的單字數量。
+        :return: 最近查詢的單字，由新到舊排序。
+        """
+        return HistoryData.recent(self.db, limit)
+
+
+    def most_frequent(self, limit: int = 20) -> List[Tuple[str, int]]:
+        """
+        :param limit: 最多取出的單字數量。
+        :return: 查詢次數最多的 (單字, 查詢次數) 列表。
+        """
+        return HistoryData.most_frequent(self.db, limit)
+
+
+    def enable_spelling(self, word_list: Optional[str] = None, max_distance: int = 2) -> SpellingIndex:
+        """
+        建立拼字建議索引(資料庫中的單字，加上選用的單字清單)，之後新增與刪除單字時自動更新。
+
+        啟用後查無單字的訊息會附上建議；有單字清單時，可能拼錯的字先回應建議(["Suggest", 訊息])，lookup(force=True) 仍可連網查詢。
+
+        :param word_list: 單字清單路徑(每行一個單字)，例如 /usr/share/dict/words。
+        :param max_distance: 建議的最大編輯距離。
+        :return: 建立好的 SpellingIndex。
+        """
+        index = SpellingIndex(max_distance=max_distance)
+        # 先註冊再載入，載入期間新增的單字也會進入索引
+        WordDatas.spelling_indexes[self.db] = index
+        index.load_database(self.db)
+        if word_list:
+            index.load_word_list(word_list)
+        self.cache.spelling = index
+        return index
+
+
+    def suggest(self, word: str, limit: int = 5) -> List[str]:
+        """
+        列出拼字相近的單字，尚未啟用拼字建議時返回空列表。
+
+        :param word: 查詢字。
+        :param limit: 最多返回的數量。
+        :return: 依相近程度排序的單字列表。
+        """
+        if self.cache.spelling is None:
+            return []
+        return [candidate for candidate, _ in self.cache.spelling.suggest(word, limit)]
+
+
+    def pin_frequent(self, limit: int = 50) -> int:
+        """
+        將最常查詢的單字設為快取常駐，並從資料庫預先載入記憶體，不連網。
+
+        :param limit: 常駐的單字數量。
+        :return: 成功載入的單字數量。
+        """
+        return self.cache.pin((word for word, _ in HistoryData.most_frequent(self.db, limit)), preload=True)
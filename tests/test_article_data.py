@@ -0,0 +1,43 @@
+"""
+ArticleData 的舊版圖片搬移測試。
+
+使用方式：
+    python -m pytest tests
+"""
+import os, sys, tempfile, unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib import ArticleData, db_connections
+
+
+class ArticlePictureMigrationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db = os.path.join(tempfile.mkdtemp(), "articles.db")
+
+
+    def tearDown(self):
+        db_connections.close(self.db)
+
+
+    def test_inline_pictures_move_to_article_image(self):
+        # 圖片內嵌在 Article、沒有 picture_digest 欄位的舊版資料表
+        conn = db_connections.get(self.db)
+        pictures = [os.urandom(ArticleData.CHUNK_SIZE * 2 + 1), b'small', b'small', None]
+        with conn:
+            conn.execute('''CREATE TABLE Article (ID INTEGER PRIMARY KEY AUTOINCREMENT, article_source TEXT NOT NULL UNIQUE,
+                            article_content TEXT NOT NULL, content_translation TEXT NOT NULL, content_picture BLOB);''')
+            conn.executemany('''INSERT INTO Article (article_source, article_content, content_translation, content_picture)
+                                VALUES (?, '', '', ?);''', [(f"source{index}", picture) for index, picture in enumerate(pictures)])
+
+        ArticleData.initialize_database(self.db)
+        self.assertEqual(conn.execute('''SELECT COUNT(*) FROM Article WHERE content_picture IS NOT NULL;''').fetchone()[0], 0)
+        self.assertEqual(conn.execute('''SELECT COUNT(*) FROM ArticleImage;''').fetchone()[0], 2)
+        for index, picture in enumerate(pictures):
+            digest = conn.execute('''SELECT picture_digest FROM Article WHERE article_source = ?;''',
+                                  (f"source{index}",)).fetchone()[0]
+            self.assertEqual(ArticleData.read_image(self.db, digest), picture)
+
+
+if __name__ == "__main__":
+    unittest.main()
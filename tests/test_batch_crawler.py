@@ -0,0 +1,44 @@
+"""
+BatchCrawler 的結果暫存測試。
+
+使用方式：
+    python -m pytest tests
+"""
+import os, sys, tempfile, unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib import BatchCrawler, WordDatas, db_connections
+
+
+def fake_crawl_one(word):
+    return {word: {'block1': {'description': f'{word} description'}}}
+
+
+class BatchCrawlerPendingRowsTest(unittest.TestCase):
+
+    def test_no_db_keeps_no_rows(self):
+        crawler = BatchCrawler(max_workers=2, rate_limit=0)
+        crawler.crawl_one = fake_crawl_one
+        words = [f"word{index}" for index in range(200)]
+        for word, result in crawler.crawl(words):
+            self.assertIn(word, result)
+            self.assertEqual(crawler.pending_rows, [])
+        self.assertEqual(crawler.succeeded, len(words))
+
+
+    def test_db_flushes_rows(self):
+        workdir = tempfile.mkdtemp()
+        db = os.path.join(workdir, "words.db")
+        WordDatas.init_db(db)
+        try:
+            crawler = BatchCrawler(db=db, max_workers=2, rate_limit=0, chunk_size=10)
+            crawler.crawl_one = fake_crawl_one
+            for _ in crawler.crawl(f"word{index}" for index in range(25)):
+                self.assertLess(len(crawler.pending_rows), 10)
+            self.assertEqual(sum(len(words) for words in WordDatas.select_all(db).values()), 25)
+        finally:
+            db_connections.close(db)
+
+
+if __name__ == "__main__":
+    unittest.main()
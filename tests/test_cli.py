@@ -0,0 +1,53 @@
+"""
+命令列工具的錯誤處理測試。
+
+使用方式：
+    python -m pytest tests
+"""
+import os, sys, unittest
+from unittest import mock
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from requests import ConnectionError as RequestsConnectionError
+from lib import BatchCrawler
+import cli
+
+
+class FakeService:
+    """資料庫只有 apple，查詢 broken 時連線失敗。"""
+    db = None
+
+    def lookup(self, word, offline=False, force=False):
+        if word == 'apple':
+            return {'apple': {'block1': {'description': 'fruit'}}}
+        if word == 'broken' and not offline:
+            raise RequestsConnectionError("connection reset")
+        return ["Error", f"沒有 {word}"]
+
+
+def fake_crawl_one(self, word):
+    if word == 'broken':
+        raise ValueError("unexpected page")
+    return {word: {'block1': {'description': word}}}
+
+
+class CliErrorTest(unittest.TestCase):
+
+    def test_lookup_continues_after_request_error(self):
+        records = list(cli.lookup_words(FakeService(), ['broken', 'apple']))
+        self.assertEqual([record['query'] for record in records], ['broken', 'apple'])
+        self.assertIn('error', records[0])
+        self.assertEqual(records[1]['english_word'], 'apple')
+
+
+    def test_batch_continues_after_crawl_error(self):
+        with mock.patch.object(BatchCrawler, 'crawl_one', fake_crawl_one):
+            records = list(cli.batch_lookup(FakeService(), ['apple', 'broken', 'pear'], rate_limit=0))
+        by_query = {record['query']: record for record in records}
+        self.assertEqual(set(by_query), {'apple', 'broken', 'pear'})
+        self.assertIn('error', by_query['broken'])
+        self.assertEqual(by_query['pear']['english_word'], 'pear')
+
+
+if __name__ == "__main__":
+    unittest.main()
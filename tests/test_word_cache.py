@@ -0,0 +1,146 @@
+"""
+WordCache 的資料庫查詢與 Word 資料表升級測試。
+
+使用方式：
+    python -m pytest tests
+"""
+import os, sys, tempfile, unittest
+from unittest import mock
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib import DataCrawl, WordCache, WordDatas, db_connections
+from tracing import tracer
+
+
+RUN = {'run': {'block1': {'description': 'to move quickly'}}}
+
+
+class WordCacheAliasTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db = os.path.join(tempfile.mkdtemp(), "words.db")
+        WordDatas.init_db(self.db)
+
+
+    def tearDown(self):
+        db_connections.close(self.db)
+
+
+    def test_inflected_query_uses_database_after_restart(self):
+        with mock.patch.object(DataCrawl, 'crawl', return_value=RUN) as crawl:
+            self.assertEqual(WordCache(self.db).lookup('running'), RUN)
+            self.assertEqual(crawl.call_count, 1)
+
+            # 新的快取沒有記憶體內容，變化形應由資料庫的對應找到字首單字
+            cache = WordCache(self.db)
+            self.assertEqual(cache.lookup('running'), RUN)
+            self.assertEqual(crawl.call_count, 1)
+            self.assertEqual(cache.stats()['db_hits'], 1)
+
+
+    def test_on_insert_reports_new_rows_only(self):
+        inserted = []
+        with mock.patch.object(DataCrawl, 'crawl', return_value=RUN):
+            WordCache(self.db).lookup('run', on_insert=inserted.append)
+            WordCache(self.db).lookup('runs', on_insert=inserted.append)  # 字首已存在，不再新增
+        with mock.patch.object(DataCrawl, 'crawl', return_value={None: {}}):
+            WordCache(self.db).lookup('xyz', on_insert=inserted.append)   # 找不到字首
+        self.assertEqual(inserted, ['run'])
+
+
+    def test_alias_removed_with_word(self):
+        WordDatas.insert_word(self.db, RUN)
+        WordDatas.add_aliases(self.db, [('running', 'run'), ('ran', 'missing')])
+        self.assertEqual(WordDatas.search_alias(self.db, 'running')['english_word'], 'run')
+        self.assertIsNone(WordDatas.search_alias(self.db, 'ran'))
+
+        WordDatas.delete_word(self.db, 'run')
+        self.assertIsNone(WordDatas.search_alias(self.db, 'running'))
+
+
+    def test_revalidation_uses_coordinator(self):
+        WordDatas.insert_word(self.db, RUN)
+        cache = WordCache(self.db, revalidate=False)
+        with mock.patch.object(DataCrawl, 'crawl', return_value=RUN):
+            cache._revalidate('run', 'run')
+        self.assertEqual(cache.coordinator.stats()['upstream'], 1)
+        self.assertEqual(cache.lookup('run', offline=True), RUN)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+
+
+    def test_preload_skips_stats_and_tracing(self):
+        WordDatas.insert_word(self.db, RUN)
+        WordDatas.add_aliases(self.db, [('running', 'run')])
+        cache = WordCache(self.db)
+        tracer.enable()
+        try:
+            traces = len(tracer.traces())
+            self.assertEqual(cache.pin(['run', 'running', 'missing'], preload=True), 2)
+            self.assertEqual(len(tracer.traces()), traces)
+        finally:
+            tracer.disable()
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['db_hits'], stats['misses'], stats['size']), (0, 0, 0, 2))
+        self.assertEqual(cache.lookup('running', offline=True), RUN)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+
+
+class WordMigrationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db = os.path.join(tempfile.mkdtemp(), "words.db")
+
+
+    def tearDown(self):
+        db_connections.close(self.db)
+
+
+    def test_old_rows_are_revalidated_and_upserted(self):
+        # 沒有 crawled_at / edited 欄位的舊版資料表
+        conn = db_connections.get(self.db)
+        with conn:
+            conn.execute('''CREATE TABLE Word (ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                            english_word TEXT NOT NULL UNIQUE, description TEXT NOT NULL);''')
+            conn.execute('''INSERT INTO Word (english_word, description) VALUES ('run', '{}');''')
+        WordDatas.init_db(self.db)
+        row = WordDatas.search_data(self.db, 'run')
+        self.assertEqual((row['crawled_at'], row['edited']), (0, 0))
+
+        cache = WordCache(self.db)
+        with mock.patch.object(WordCache, '_start_revalidation') as revalidate:
+            cache.lookup('run', offline=True)
+        revalidate.assert_called_once_with('run', 'run')
+
+        result = WordDatas.bulk_insert(self.db, RUN.items())
+        self.assertIn("已匯入 1 筆", result[1])
+        self.assertEqual(WordDatas.load_description(WordDatas.search_data(self.db, 'run')['description']), RUN['run'])
+
+
+    def test_edited_rows_are_skipped(self):
+        WordDatas.init_db(self.db)
+        WordDatas.insert_word(self.db, RUN)
+        WordDatas.update_word(self.db, {'english_word': 'run', 'description': {'block1': {'description': 'edited'}}})
+
+        result = WordDatas.bulk_insert(self.db, RUN.items())
+        self.assertIn("已匯入 0 筆單字，略過 1 筆", result[1])
+        self.assertEqual(WordDatas.refresh_word(self.db, 'run', RUN['run'])[0], "Error")
+        row = WordDatas.search_data(self.db, 'run')
+        self.assertEqual(WordDatas.load_description(row['description']), {'block1': {'description': 'edited'}})
+
+
+
+    def test_bulk_insert_splits_parameters(self):
+        WordDatas.init_db(self.db)
+        items = [(f"word{index}", {'block1': {'description': f'meaning {index}'}}) for index in range(10)]
+        with mock.patch.object(WordDatas, 'MAX_VARIABLES', 3):
+            result = WordDatas.bulk_insert(self.db, items, chunk_size=7)
+        self.assertIn("已匯入 10 筆", result[1])
+        conn = db_connections.get(self.db)
+        self.assertEqual(conn.execute('''SELECT COUNT(*) FROM Sense;''').fetchone()[0], 10)
+        self.assertEqual(conn.execute('''SELECT COUNT(*) FROM SenseSearch;''').fetchone()[0], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
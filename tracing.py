@@ -0,0 +1,222 @@
+"""
+查詢流程的分段計時(tracing)。
+
+每次查詢為一筆 trace，查詢過程中的各個階段(網路請求、解析、資料庫、畫面繪製…)為 span；
+最近的 trace 保存在環狀緩衝區，可計算各階段的 p50/p95/p99 並匯出為 JSONL。
+
+停用時(預設) span() 只檢查一個旗標並返回共用的空物件，幾乎沒有額外成本；可於執行中隨時啟用或停用。
+設定環境變數 LOOKUP_TRACE=1 時啟動即啟用。
+
+使用方式：
+    from tracing import tracer
+
+    tracer.enable()
+    with tracer.trace('lookup', word):
+        with tracer.span('fetch'):
+            ...
+    print(tracer.report())
+    tracer.export('trace.jsonl')   # 或 tracer.export('-') 輸出至標準輸出
+"""
+import json, math, os, sys, threading, time
+from collections import deque
+from typing import Dict, List, Optional
+
+
+class _NullSpan:
+    """停用時使用的空 span。"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer._finish_span(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _Trace:
+    __slots__ = ('tracer', 'record', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str, key: Optional[str]):
+        self.tracer = tracer
+        self.record = {'name': name, 'key': key, 'started_at': time.time(), 'duration_ms': 0.0, 'spans': []}
+
+    def __enter__(self):
+        self.tracer._local.record = self.record
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.record['duration_ms'] = round((time.perf_counter() - self.start) * 1000, 3)
+        if exc_type is not None:
+            self.record['error'] = exc_type.__name__
+        self.tracer._local.record = None
+        self.tracer._traces.append(self.record)
+        return False
+
+
+
+
+class Tracer:
+    """
+    分段計時器，最近 capacity 筆 trace 保存在環狀緩衝區(deque)。
+
+    span 會記錄在同一個執行緒中進行中的 trace 底下；沒有進行中的 trace 時(例如在 UI 執行緒繪製畫面)，
+    span 自成一筆 trace。
+    """
+    def __init__(self, capacity: int = 1000, enabled: bool = False):
+        """
+        :param capacity: 環狀緩衝區保留的 trace 數量。
+        :param enabled: 是否啟用。
+        """
+        self.enabled = enabled
+        self._traces = deque(maxlen=capacity)
+        self._local = threading.local()
+
+
+    def enable(self) -> None:
+        """啟用計時。"""
+        self.enabled = True
+
+
+    def disable(self) -> None:
+        """停用計時，已記錄的 trace 保留。"""
+        self.enabled = False
+
+
+    def trace(self, name: str, key: Optional[str] = None):
+        """
+        開始一筆 trace(例如一次查詢)，以 with 使用。
+
+        已在 trace 中時視為一個 span，不另開新的 trace。
+
+        :param name: trace 名稱，例如 lookup。
+        :param key: 附註，例如查詢的單字。
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        if getattr(self._local, 'record', None) is not None:
+            return _Span(self, name)
+        return _Trace(self, name, key)
+
+
+    def span(self, name: str):
+        """
+        計時一個階段，以 with 使用。
+
+        :param name: 階段名稱，例如 fetch、parse、db_search。
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+
+    def traces(self) -> List[dict]:
+        """
+        :return: 環狀緩衝區中的 trace，由舊到新。
+        """
+        return list(self._traces)
+
+
+    def clear(self) -> None:
+        """清空環狀緩衝區。"""
+        self._traces.clear()
+
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        計算每個 trace 與階段名稱的延遲分佈；同一筆 trace 中重複的階段先加總。
+
+        :return: {名稱: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}。
+        """
+        durations = {}
+        for record in self.traces():
+            durations.setdefault(record['name'], []).append(record['duration_ms'])
+            per_trace = {}
+            for name, milliseconds in record['spans']:
+                per_trace[name] = per_trace.get(name, 0.0) + milliseconds
+            for name, milliseconds in per_trace.items():
+                durations.setdefault(name, []).append(milliseconds)
+
+        summary = {}
+        for name, values in durations.items():
+            values.sort()
+            summary[name] = {
+                'count': len(values),
+                'mean_ms': round(sum(values) / len(values), 3),
+                'p50_ms': Tracer._percentile(values, 50),
+                'p95_ms': Tracer._percentile(values, 95),
+                'p99_ms': Tracer._percentile(values, 99),
+                'max_ms': values[-1],
+            }
+        return summary
+
+
+    def report(self) -> str:
+        """
+        :return: summary() 的文字表格。
+        """
+        lines = [f"{'階段':<16}{'次數':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'最大':>10}  (ms)"]
+        for name, stats in sorted(self.summary().items(), key=lambda item: -item[1]['p95_ms']):
+            lines.append(f"{name:<16}{stats['count']:>8}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+                         f"{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+        return "\n".join(lines)
+
+
+    def export(self, path: str = '-') -> int:
+        """
+        將環狀緩衝區中的 trace 以 JSONL 格式附加到檔案。
+
+        :param path: 檔案路徑，"-" 表示標準輸出。
+        :return: 匯出的 trace 數量。
+        """
+        traces = self.traces()
+        out = sys.stdout if path == '-' else open(path, 'a', encoding='utf-8')
+        try:
+            for record in traces:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return len(traces)
+
+
+    def _finish_span(self, name: str, seconds: float) -> None:
+        milliseconds = round(seconds * 1000, 3)
+        record = getattr(self._local, 'record', None)
+        if record is not None:
+            record['spans'].append((name, milliseconds))
+        else:
+            self._traces.append({'name': name, 'key': None, 'started_at': time.time() - seconds,
+                                 'duration_ms': milliseconds, 'spans': []})
+
+
+    @staticmethod
+    def _percentile(values: List[float], percent: float) -> float:
+        # 最近序位法，values 須已排序
+        index = max(math.ceil(percent / 100 * len(values)) - 1, 0)
+        return values[min(index, len(values) - 1)]
+
+
+
+
+tracer = Tracer(enabled=os.environ.get('LOOKUP_TRACE') == '1')  # 全域計時器，各模組共用